@@ -172,3 +172,9 @@ OBJECTIVE_FILE = 'objective_file'
 SIMULATION = 'simulation'
 RESIDUAL = 'residual'
 NOISE_VALUE = 'noiseValue'
+
+# PARALLELIZATION
+
+PARALLEL_BACKEND_THREAD = 'thread'
+PARALLEL_BACKEND_PROCESS = 'process'
+PARALLEL_BACKENDS = [PARALLEL_BACKEND_THREAD, PARALLEL_BACKEND_PROCESS]
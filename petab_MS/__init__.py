@@ -5,10 +5,20 @@ Attributes:
         Name of environment variable to set number of threads or processes
         PEtab should use for operations that can be performed in parallel.
         By default, all operations are performed sequentially.
+    ENV_PARALLEL_BACKEND:
+        Name of environment variable to select whether parallel operations
+        use threads (``thread``, default) or processes (``process``).
+    ENV_CACHE_DIR:
+        Name of environment variable to set the directory of the on-disk
+        cache of parsed tables, see :py:mod:`petab.cache`. By default,
+        tables are not cached.
 """
 
 ENV_NUM_THREADS = "PETAB_NUM_THREADS"
+ENV_PARALLEL_BACKEND = "PETAB_PARALLEL_BACKEND"
+ENV_CACHE_DIR = "PETAB_CACHE_DIR"
 
+from .cache import *  # noqa: F403, F401, E402
 from .calculate import *  # noqa: F403, F401, E402
 from .composite_problem import *  # noqa: F403, F401, E402
 from .conditions import *  # noqa: F403, F401, E402
@@ -18,6 +28,7 @@ from .measurements import *  # noqa: F403, F401, E402
 from .observables import *  # noqa: F403, F401, E402
 from .parameter_mapping import *  # noqa: F403, F401, E402
 from .parameters import *  # noqa: F403, F401, E402
+from .priors import *  # noqa: F403, F401, E402
 from .problem import *  # noqa: F403, F401, E402
 from .sampling import *  # noqa: F403, F401, E402
 from .sbml import *  # noqa: F403, F401, E402
@@ -0,0 +1,230 @@
+"""On-disk cache of parsed PEtab tables"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Iterator, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from . import ENV_CACHE_DIR
+
+# Increment if the cache layout changes, to invalidate existing entries
+_CACHE_FORMAT_VERSION = 2
+
+# Cache directory set by `table_cache`, takes precedence over the
+#  environment variable
+_cache_dir = None
+
+
+def get_cache_dir() -> Optional[str]:
+    """Get the directory of the currently enabled table cache.
+
+    Returns:
+        The directory set via :py:func:`table_cache`, otherwise the value of
+        the environment variable with the name of
+        :py:data:`petab.ENV_CACHE_DIR`, or ``None`` if caching is disabled.
+    """
+    if _cache_dir is not None:
+        return _cache_dir
+    return os.environ.get(ENV_CACHE_DIR) or None
+
+
+@contextlib.contextmanager
+def table_cache(cache_dir: Optional[str]) -> Iterator[None]:
+    """Enable the table cache in the given directory within a context.
+
+    Arguments:
+        cache_dir: Cache directory, created if necessary. If ``None``, the
+            current setting is kept.
+    """
+    global _cache_dir
+    previous = _cache_dir
+    if cache_dir is not None:
+        _cache_dir = cache_dir
+    try:
+        yield
+    finally:
+        _cache_dir = previous
+
+
+def get_table_cache_key(file_name: str, **kwargs) -> str:
+    """Get the cache key of a table file.
+
+    Arguments:
+        file_name: Table file name
+        kwargs: Options used to parse the table
+
+    Returns:
+        Hash of the absolute file path, its size, modification time and
+        content, and the parsing options.
+    """
+    stat = os.stat(file_name)
+    key = json.dumps([_CACHE_FORMAT_VERSION, os.path.abspath(file_name),
+                      stat.st_size, stat.st_mtime_ns,
+                      get_file_hash(file_name), sorted(kwargs.items())],
+                     default=str)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_file_hash(file_name: str) -> str:
+    """Get a hash of the content of a file.
+
+    Arguments:
+        file_name: File name
+
+    Returns:
+        SHA-256 hash of the file content.
+    """
+    content_hash = hashlib.sha256()
+    with open(file_name, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            content_hash.update(block)
+    return content_hash.hexdigest()
+
+
+def get_table_hash(
+        table: Union[pd.DataFrame, Mapping[str, Any], None]) -> str:
+    """Get a hash of the content of a table.
+
+    Arguments:
+        table: Table, or mapping of names to tables, series or arrays as for
+            measurement dicts, or ``None``.
+
+    Returns:
+        SHA-256 hash of the index, columns, data types, shapes and values.
+    """
+    content_hash = hashlib.sha256()
+    if table is None:
+        return content_hash.hexdigest()
+
+    tables = table.items() if isinstance(table, Mapping) \
+        else [(None, table)]
+    for name, value in tables:
+        if isinstance(value, pd.DataFrame):
+            content_hash.update(json.dumps(
+                [name, list(value.index.names), list(value.columns),
+                 list(value.dtypes)], default=str).encode())
+            values = pd.util.hash_pandas_object(value, index=True).values
+        elif isinstance(value, pd.Series):
+            content_hash.update(json.dumps(
+                [name, value.index.names, value.name, value.dtype],
+                default=str).encode())
+            values = pd.util.hash_pandas_object(value, index=True).values
+        else:
+            value = np.asarray(value)
+            content_hash.update(json.dumps(
+                [name, value.dtype, value.shape], default=str).encode())
+            values = pd.util.hash_pandas_object(
+                pd.Series(value.ravel()), index=False).values \
+                if value.dtype.hasobject else np.ascontiguousarray(value)
+        content_hash.update(values.tobytes())
+    return content_hash.hexdigest()
+
+
+def read_table(file_name: str,
+               usecols: Optional[List[str]] = None,
+               chunksize: Optional[int] = None,
+               cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """Read a tab-separated table, using the table cache if enabled.
+
+    Arguments:
+        file_name: Table file name
+        usecols: Columns to read. Defaults to all columns.
+        chunksize: Parse the file in chunks of this many rows.
+        cache_dir: Cache directory. Defaults to :py:func:`get_cache_dir`.
+
+    Returns:
+        The table, as parsed by :py:func:`pandas.read_csv`.
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return _parse_table(file_name, usecols=usecols, chunksize=chunksize)
+
+    entry_dir = os.path.join(
+        cache_dir, get_table_cache_key(file_name, usecols=usecols))
+    if os.path.isdir(entry_dir):
+        return _load_entry(entry_dir)
+
+    df = _parse_table(file_name, usecols=usecols, chunksize=chunksize)
+    # tables without rows are cheap to parse, and their index differs
+    if len(df):
+        _store_entry(df, cache_dir, entry_dir)
+    return df
+
+
+def _parse_table(file_name: str,
+                 usecols: Optional[List[str]] = None,
+                 chunksize: Optional[int] = None) -> pd.DataFrame:
+    df = pd.read_csv(file_name, sep='\t', usecols=usecols,
+                     float_precision='round_trip', chunksize=chunksize)
+    if chunksize is not None:
+        df = pd.concat(df, ignore_index=True)
+    return df
+
+
+def _load_entry(entry_dir: str) -> pd.DataFrame:
+    """Load a cached table.
+
+    Numeric columns are memory-mapped copy-on-write, i.e. they can be
+    modified without affecting the cache. Object columns are read from
+    JSON, never unpickled.
+    """
+    with open(os.path.join(entry_dir, 'columns.json')) as f:
+        columns = json.load(f)
+
+    data = {}
+    for i, (column, is_object) in enumerate(columns):
+        if is_object:
+            with open(os.path.join(entry_dir, f'{i}.json')) as f:
+                values = json.load(f)
+            data[column] = np.empty(len(values), dtype=object)
+            data[column][:] = values
+        else:
+            data[column] = np.load(os.path.join(entry_dir, f'{i}.npy'),
+                                   mmap_mode='c', allow_pickle=False)
+    # without copying, which would consolidate the columns into
+    #  in-memory blocks
+    return pd.DataFrame(data, columns=[column for column, _ in columns],
+                        copy=False)
+
+
+def _store_entry(df: pd.DataFrame, cache_dir: str, entry_dir: str) -> None:
+    """Store a table as one ``.npy`` file per column.
+
+    Object columns are stored as ``.json`` files instead. Tables with
+    values that cannot be stored like this are not cached.
+
+    The entry is written to a temporary directory first and then renamed,
+    so concurrent readers never see incomplete entries.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp')
+    columns = []
+    try:
+        for i, column in enumerate(df.columns):
+            values = df[column].values
+            is_object = values.dtype == object
+            if is_object:
+                with open(os.path.join(tmp_dir, f'{i}.json'), 'w') as f:
+                    json.dump(values.tolist(), f)
+            else:
+                np.save(os.path.join(tmp_dir, f'{i}.npy'), values,
+                        allow_pickle=False)
+            columns.append((column, bool(is_object)))
+        with open(os.path.join(tmp_dir, 'columns.json'), 'w') as f:
+            json.dump(columns, f)
+    except (TypeError, ValueError):
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return
+
+    try:
+        os.rename(tmp_dir, entry_dir)
+    except OSError:
+        # stored concurrently by another process
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -2,8 +2,8 @@
 
 import numpy as np
 import pandas as pd
-from functools import reduce
-from typing import List, Union
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Union
 import sympy
 import numbers
 
@@ -78,45 +78,245 @@ def calculate_residuals_for_table(
     residual_df = measurement_df.copy(deep=True).rename(
         columns={MEASUREMENT: RESIDUAL})
 
-    # matching columns
-    compared_cols = set(MEASUREMENT_DF_COLS)
-    compared_cols -= {MEASUREMENT}
-    compared_cols &= set(measurement_df.columns)
-    compared_cols &= set(simulation_df.columns)
-
-    # compute noise formulas for observables
-    noise_formulas = get_symbolic_noise_formulas(observable_df)
-
-    # iterate over measurements, find corresponding simulations
-    for irow, row in measurement_df.iterrows():
-        measurement = row[MEASUREMENT]
-        # look up in simulation df
-        masks = [(simulation_df[col] == row[col]) | petab_MS.is_empty(row[col])
-                 for col in compared_cols]
-        mask = reduce(lambda x, y: x & y, masks)
-        simulation = simulation_df.loc[mask][SIMULATION].iloc[0]
-        if scale:
-            # apply scaling
-            observable = observable_df.loc[row[OBSERVABLE_ID]]
-            trafo = observable.get(OBSERVABLE_TRANSFORMATION, LIN)
-            simulation = petab_MS.scale(simulation, trafo)
-            measurement = petab_MS.scale(measurement, trafo)
+    # align simulations to measurements once, instead of per row
+    simulation_indices = SimulationMatcher(simulation_df).match(
+        measurement_df)
+    simulations = np.asarray(
+        simulation_df[SIMULATION].values[simulation_indices], dtype=float)
+    measurements = np.asarray(measurement_df[MEASUREMENT].values, dtype=float)
 
-        # non-normalized residual is just the difference
-        residual = simulation - measurement
+    if scale:
+        # apply scaling
+        trafos = _get_observable_transformations(
+            measurement_df, observable_df)
+        simulations = _scale_array(simulations, trafos)
+        measurements = _scale_array(measurements, trafos)
 
-        noise_value = 1
-        if normalize:
-            # look up noise standard deviation
-            noise_value = evaluate_noise_formula(
-                row, noise_formulas, parameter_df, simulation)
-        residual /= noise_value
+    # non-normalized residual is just the difference
+    residuals = simulations - measurements
+
+    if normalize:
+        # compute noise formulas for observables
+        noise_formulas = get_compiled_noise_formulas(observable_df)
+        # look up noise standard deviation
+        residuals /= evaluate_noise_formulas(
+            measurement_df, noise_formulas, parameter_df, simulations)
 
-        # fill in value
-        residual_df.loc[irow, RESIDUAL] = residual
+    residual_df[RESIDUAL] = residuals
     return residual_df
 
 
+class SimulationMatcher:
+    """Hash index on a simulation table for matching measurements.
+
+    A measurement matches a simulation if they agree on all of observable ID,
+    simulation and preequilibration condition ID, time, observable and noise
+    parameter overrides that are present in the simulation table. Empty fields
+    in the measurement table, and columns missing in it, are wildcards that
+    match anything. Of several matching simulations, the first one is used.
+
+    The simulation table is indexed once per pattern of wildcard fields,
+    so matching is a dictionary lookup per measurement. The resulting
+    alignment arrays can be cached and reused for simulation tables with the
+    same layout.
+
+    Attributes:
+        simulation_df: The indexed simulation table.
+        compared_cols: The columns that are matched on, in
+            `MEASUREMENT_DF_COLS` order.
+    """
+
+    def __init__(self, simulation_df: pd.DataFrame):
+        """Constructor.
+
+        Arguments:
+            simulation_df: The simulation table to index.
+        """
+        self.simulation_df = simulation_df
+        self.compared_cols = [col for col in MEASUREMENT_DF_COLS
+                              if col != MEASUREMENT
+                              and col in simulation_df.columns]
+        # key columns -> (key -> position of first simulation, keys that
+        #  match multiple simulations)
+        self._indices = {}
+
+    def _get_index(self, key_cols: tuple):
+        """Get the index on the given columns, building it if necessary."""
+        if key_cols in self._indices:
+            return self._indices[key_cols]
+
+        simulation_keys = zip(
+            *(self.simulation_df[col].values for col in key_cols)) \
+            if key_cols else ((), ) * len(self.simulation_df)
+        if SIMULATION in self.simulation_df:
+            simulations = self.simulation_df[SIMULATION].values
+        else:
+            simulations = np.arange(len(self.simulation_df))
+
+        index = {}
+        ambiguous = set()
+        for position, key in enumerate(simulation_keys):
+            first = index.setdefault(key, position)
+            # repeated simulations with equal values are not ambiguous
+            if first != position \
+                    and simulations[first] != simulations[position] \
+                    and not (pd.isnull(simulations[first])
+                             and pd.isnull(simulations[position])):
+                ambiguous.add(key)
+
+        self._indices[key_cols] = index, ambiguous
+        return index, ambiguous
+
+    def _iter_patterns(self, measurement_df: pd.DataFrame):
+        """Iterate over measurement row positions by wildcard pattern.
+
+        Yields:
+            The non-wildcard columns, the corresponding measurement keys and
+            the measurement row positions.
+        """
+        present_cols = [col for col in self.compared_cols
+                        if col in measurement_df.columns]
+        if not present_cols:
+            yield (), [()] * len(measurement_df), \
+                np.arange(len(measurement_df))
+            return
+
+        empty = pd.DataFrame({
+            col: petab_MS.is_empty_array(measurement_df[col])
+            for col in present_cols})
+        for pattern, rows in empty.groupby(present_cols).indices.items():
+            if not isinstance(pattern, tuple):
+                pattern = (pattern, )
+            key_cols = tuple(col for col, is_empty
+                             in zip(present_cols, pattern) if not is_empty)
+            measurement_keys = zip(
+                *(measurement_df[col].values[rows] for col in key_cols)) \
+                if key_cols else [()] * len(rows)
+            yield key_cols, measurement_keys, rows
+
+    def match(
+            self,
+            measurement_df: pd.DataFrame,
+            raise_unmatched: bool = True) -> np.ndarray:
+        """Find the simulation table row for each measurement table row.
+
+        Arguments:
+            measurement_df: The measurement table.
+            raise_unmatched: Whether to raise if there is no simulation for
+                some measurements.
+
+        Returns:
+            simulation_indices: Row positions in the simulation table, one per
+                row of `measurement_df`. -1 for unmatched measurements.
+
+        Raises:
+            ValueError: If `raise_unmatched` and there is no simulation for
+                some measurements. All such measurements are reported.
+        """
+        simulation_indices = np.full(len(measurement_df), -1, dtype=int)
+        for key_cols, measurement_keys, rows in \
+                self._iter_patterns(measurement_df):
+            index, _ = self._get_index(key_cols)
+            simulation_indices[rows] = [
+                index.get(key, -1) for key in measurement_keys]
+
+        if raise_unmatched:
+            unmatched = self.get_unmatched(measurement_df, simulation_indices)
+            if len(unmatched):
+                raise ValueError(
+                    "Could not find simulations for measurement table rows "
+                    f"{list(unmatched)}.")
+
+        return simulation_indices
+
+    @staticmethod
+    def get_unmatched(
+            measurement_df: pd.DataFrame,
+            simulation_indices: np.ndarray) -> pd.Index:
+        """Get the measurements without simulation.
+
+        Arguments:
+            measurement_df: The measurement table.
+            simulation_indices: The result of `match`.
+
+        Returns:
+            The index labels of unmatched measurement table rows.
+        """
+        return measurement_df.index[np.asarray(simulation_indices) < 0]
+
+    def get_ambiguous(self, measurement_df: pd.DataFrame) -> pd.Index:
+        """Get the measurements matching different simulations.
+
+        Measurements are ambiguous if they match multiple simulations
+        with different simulated values (or multiple simulation rows, if the
+        simulation table has no simulation column).
+
+        Arguments:
+            measurement_df: The measurement table.
+
+        Returns:
+            The index labels of ambiguous measurement table rows.
+        """
+        ambiguous_rows = []
+        for key_cols, measurement_keys, rows in \
+                self._iter_patterns(measurement_df):
+            _, ambiguous = self._get_index(key_cols)
+            if ambiguous:
+                ambiguous_rows.extend(
+                    row for row, key in zip(rows, measurement_keys)
+                    if key in ambiguous)
+        return measurement_df.index[sorted(ambiguous_rows)]
+
+
+def _get_observable_transformations(
+        measurement_df: pd.DataFrame,
+        observable_df: pd.DataFrame) -> np.ndarray:
+    """Get the observable transformation for each measurement table row.
+
+    Arguments:
+        measurement_df: The measurement table.
+        observable_df: The observable table.
+
+    Returns:
+        trafos: The observable transformations, `LIN` where none is set.
+    """
+    if OBSERVABLE_TRANSFORMATION not in observable_df:
+        return np.full(len(measurement_df), LIN, dtype=object)
+    trafos = measurement_df[OBSERVABLE_ID].map(
+        observable_df[OBSERVABLE_TRANSFORMATION])
+    return np.where(petab_MS.is_empty_array(trafos), LIN, trafos.values)
+
+
+def _get_noise_distributions(
+        measurement_df: pd.DataFrame,
+        observable_df: pd.DataFrame) -> np.ndarray:
+    """Get the noise distribution for each measurement table row.
+
+    Arguments:
+        measurement_df: The measurement table.
+        observable_df: The observable table.
+
+    Returns:
+        noise_distributions: The noise distributions, `NORMAL` where none is
+            set.
+    """
+    if NOISE_DISTRIBUTION not in observable_df:
+        return np.full(len(measurement_df), NORMAL, dtype=object)
+    noise_distributions = measurement_df[OBSERVABLE_ID].map(
+        observable_df[NOISE_DISTRIBUTION])
+    return np.where(petab_MS.is_empty_array(noise_distributions), NORMAL,
+                    noise_distributions.values)
+
+
+def _scale_array(values: np.ndarray, trafos: np.ndarray) -> np.ndarray:
+    """Scale `values` elementwise by the transformations `trafos`."""
+    scaled = np.array(values, dtype=float)
+    for trafo in pd.unique(trafos):
+        mask = trafos == trafo
+        scaled[mask] = petab_MS.scale(scaled[mask], trafo)
+    return scaled
+
+
 def get_symbolic_noise_formulas(observable_df) -> dict:
     """Sympify noise formulas.
 
@@ -193,6 +393,207 @@ def evaluate_noise_formula(
     return noise_value
 
 
+class CompiledNoiseFormula:
+    """A noise formula compiled into a NumPy function.
+
+    The formula is lambdified once, with a fixed argument order, so that
+    noise values for many measurements can be computed in a single call.
+
+    Attributes:
+        observable_id: The ID of the observable the formula belongs to.
+        expr: The symbolic noise formula.
+        symbols: Names of the free symbols of `expr`, in the order of the
+            arguments of `function`.
+        function: The lambdified noise formula.
+    """
+
+    def __init__(self, observable_id: str, expr: sympy.Expr):
+        self.observable_id = observable_id
+        self.expr = expr
+        symbols = sorted(expr.free_symbols, key=lambda symbol: symbol.name)
+        self.symbols = [symbol.name for symbol in symbols]
+        self.function = sympy.lambdify(symbols, expr, modules='numpy')
+
+    def evaluate(
+            self,
+            noise_parameters: Sequence,
+            parameter_df: pd.DataFrame,
+            simulations: np.ndarray) -> np.ndarray:
+        """Evaluate the noise formula for measurements of this observable.
+
+        Arguments:
+            noise_parameters: The `noiseParameters` entries of the
+                measurement table rows.
+            parameter_df: The parameter table.
+            simulations: The simulations corresponding to the measurements,
+                scaled. The last axis corresponds to the measurements, further
+                leading axes are broadcast.
+
+        Returns:
+            noise_values: The noise values, in the shape of `simulations`.
+        """
+        return self.bind(noise_parameters, parameter_df)(simulations)
+
+    @property
+    def depends_on_simulation(self) -> bool:
+        """Whether the noise formula depends on the simulated observable."""
+        return self.observable_id in self.symbols
+
+    def bind(
+            self,
+            noise_parameters: Sequence,
+            parameter_df: pd.DataFrame
+    ) -> Callable[[np.ndarray], np.ndarray]:
+        """Fill in all parameters of the noise formula once.
+
+        Arguments:
+            noise_parameters: The `noiseParameters` entries of the
+                measurement table rows.
+            parameter_df: The parameter table.
+
+        Returns:
+            evaluate: Function mapping the simulations corresponding to the
+                measurements to the noise values, see `evaluate`.
+        """
+        arguments = [
+            None if symbol == self.observable_id
+            else self._get_argument_values(symbol, noise_parameters,
+                                           parameter_df)
+            for symbol in self.symbols]
+
+        def evaluate(simulations: np.ndarray) -> np.ndarray:
+            simulations = np.asarray(simulations, dtype=float)
+            noise_values = np.asarray(self.function(*(
+                simulations if argument is None else argument
+                for argument in arguments)), dtype=float)
+            return np.broadcast_to(noise_values, simulations.shape)
+
+        return evaluate
+
+    def _get_argument_values(
+            self,
+            symbol: str,
+            noise_parameters: Sequence,
+            parameter_df: pd.DataFrame) -> Union[float, np.ndarray]:
+        """Get the values of the parameter `symbol` for all measurements.
+
+        For the arguments, see `bind`.
+        """
+        match = re.match(
+            rf'^noiseParameter(\d+)_{re.escape(self.observable_id)}$', symbol)
+        if match:
+            i_override = int(match.group(1)) - 1
+            # parse each distinct override string only once
+            codes, uniques = pd.factorize(pd.Series(noise_parameters,
+                                                    dtype=object))
+            unique_values = np.full(len(uniques) + 1, np.nan)
+            for i_unique, overrides in enumerate(uniques):
+                overrides = petab_MS.split_parameter_replacement_list(
+                    overrides)
+                if i_override >= len(overrides):
+                    continue
+                value = overrides[i_override]
+                if not isinstance(value, numbers.Number):
+                    # is parameter
+                    value = parameter_df.loc[value, NOMINAL_VALUE]
+                unique_values[i_unique] = value
+            # code -1 (empty entry) selects the trailing nan
+            values = unique_values[codes]
+            missing = np.isnan(values)
+            if missing.any():
+                values[missing] = self._get_nominal_value(
+                    symbol, parameter_df)
+            return values
+
+        return self._get_nominal_value(symbol, parameter_df)
+
+    def _get_nominal_value(
+            self, symbol: str, parameter_df: pd.DataFrame) -> float:
+        """Get the parameter table nominal value of `symbol`."""
+        if symbol not in parameter_df.index:
+            raise TypeError(
+                f"Cannot replace all parameters in noise formula {self.expr} "
+                f"for observable {self.observable_id}.")
+        return float(parameter_df.loc[symbol, NOMINAL_VALUE])
+
+
+def compile_noise_formulas(
+        noise_formulas: Dict[str, Union[sympy.Expr, CompiledNoiseFormula]]
+) -> Dict[str, CompiledNoiseFormula]:
+    """Compile noise formulas.
+
+    Arguments:
+        noise_formulas: The noise formulas as computed by
+            `get_symbolic_noise_formulas`. Already compiled formulas are
+            passed through.
+
+    Returns:
+        compiled_noise_formulas: Dictionary of {observable_id}:
+            {compiled_noise_formula}.
+    """
+    return {
+        observable_id: (
+            noise_formula
+            if isinstance(noise_formula, CompiledNoiseFormula)
+            or noise_formula is None
+            else CompiledNoiseFormula(observable_id, noise_formula))
+        for observable_id, noise_formula in noise_formulas.items()
+    }
+
+
+def get_compiled_noise_formulas(
+        observable_df: pd.DataFrame) -> Dict[str, CompiledNoiseFormula]:
+    """Sympify and compile noise formulas.
+
+    Arguments:
+        observable_df: The observable table.
+
+    Returns:
+        compiled_noise_formulas: Dictionary of {observable_id}:
+            {compiled_noise_formula}.
+    """
+    return compile_noise_formulas(get_symbolic_noise_formulas(observable_df))
+
+
+def evaluate_noise_formulas(
+        measurement_df: pd.DataFrame,
+        noise_formulas: Dict[str, CompiledNoiseFormula],
+        parameter_df: pd.DataFrame,
+        simulations: np.ndarray) -> np.ndarray:
+    """Evaluate the noise formulas for all rows of a measurement table.
+
+    The formulas are evaluated with one vectorized call per observable.
+
+    Arguments:
+        measurement_df: The measurement table.
+        noise_formulas: The compiled noise formulas as computed by
+            `get_compiled_noise_formulas`.
+        parameter_df: The parameter table.
+        simulations: The simulations corresponding to the measurements,
+            scaled. The last axis corresponds to the rows of
+            `measurement_df`, further leading axes are broadcast.
+
+    Returns:
+        noise_values: The noise values, in the shape of `simulations`.
+    """
+    simulations = np.asarray(simulations, dtype=float)
+    noise_values = np.full(simulations.shape, np.nan)
+    if NOISE_PARAMETERS in measurement_df:
+        noise_parameters = measurement_df[NOISE_PARAMETERS].values
+    else:
+        noise_parameters = np.full(len(measurement_df), None)
+
+    for observable_id, rows in \
+            measurement_df.groupby(OBSERVABLE_ID).indices.items():
+        noise_formula = noise_formulas[observable_id]
+        if noise_formula is None:
+            raise ValueError(
+                f"No noise formula specified for observable {observable_id}.")
+        noise_values[..., rows] = noise_formula.evaluate(
+            noise_parameters[rows], parameter_df, simulations[..., rows])
+    return noise_values
+
+
 def calculate_chi2(
         measurement_dfs: Union[List[pd.DataFrame], pd.DataFrame],
         simulation_dfs: Union[List[pd.DataFrame], pd.DataFrame],
@@ -285,45 +686,102 @@ def calculate_llh_for_table(
         parameter_df: pd.DataFrame) -> float:
     """Calculate log-likelihood for one set of tables. For the arguments, see
     `calculate_llh`."""
-    llhs = []
+    # align simulations to measurements
+    simulation_indices = SimulationMatcher(simulation_df).match(
+        measurement_df)
+    simulations = np.asarray(
+        simulation_df[SIMULATION].values[simulation_indices], dtype=float)
+    measurements = np.asarray(measurement_df[MEASUREMENT].values, dtype=float)
 
-    # matching columns
-    compared_cols = set(MEASUREMENT_DF_COLS)
-    compared_cols -= {MEASUREMENT}
-    compared_cols &= set(measurement_df.columns)
-    compared_cols &= set(simulation_df.columns)
+    # get scales
+    scales = _get_observable_transformations(measurement_df, observable_df)
 
-    # compute noise formulas for observables
-    noise_formulas = get_symbolic_noise_formulas(observable_df)
+    # get noise standard deviations
+    noise_formulas = get_compiled_noise_formulas(observable_df)
+    noise_values = evaluate_noise_formulas(
+        measurement_df, noise_formulas, parameter_df,
+        _scale_array(simulations, scales))
 
-    # iterate over measurements, find corresponding simulations
-    for irow, row in measurement_df.iterrows():
-        measurement = row[MEASUREMENT]
+    # get noise distributions
+    noise_distributions = _get_noise_distributions(
+        measurement_df, observable_df)
 
-        # look up in simulation df
-        masks = [(simulation_df[col] == row[col]) | petab_MS.is_empty(row[col])
-                 for col in compared_cols]
-        mask = reduce(lambda x, y: x & y, masks)
+    llh = calculate_llhs(
+        measurements, simulations, scales, noise_distributions,
+        noise_values).sum()
+    return llh
 
-        simulation = simulation_df.loc[mask][SIMULATION].iloc[0]
 
-        observable = observable_df.loc[row[OBSERVABLE_ID]]
+def calculate_llhs(
+        measurements: np.ndarray,
+        simulations: np.ndarray,
+        scales: Sequence[str],
+        noise_distributions: Sequence[str],
+        noise_values: np.ndarray) -> np.ndarray:
+    """Calculate log likelihoods for arrays of data points.
 
-        # get scale
-        scale = observable.get(OBSERVABLE_TRANSFORMATION, LIN)
+    Data points are grouped by noise distribution and scale, and each group
+    is evaluated as a single array expression.
 
-        # get noise standard deviation
-        noise_value = evaluate_noise_formula(
-            row, noise_formulas, parameter_df, petab_MS.scale(simulation, scale))
+    Arguments:
+        measurements: The measurement values.
+        simulations: The simulated values. The last axis corresponds to the
+            data points, further leading axes (e.g. particles) are broadcast.
+        scales: The scales on which the noise models are to be applied, one
+            per data point.
+        noise_distributions: The noise distributions, one per data point.
+        noise_values: The noise parameters, e.g. the normal standard
+            deviations, broadcastable to the shape of `simulations`.
 
-        # get noise distribution
-        noise_distribution = observable.get(NOISE_DISTRIBUTION, NORMAL)
+    Returns:
+        llhs: The log likelihoods, in the broadcast shape of `measurements`,
+            `simulations` and `noise_values`.
+    """
+    measurements = np.asarray(measurements, dtype=float)
+    simulations = np.asarray(simulations, dtype=float)
+    noise_values = np.asarray(noise_values, dtype=float)
+    shape = np.broadcast(measurements, simulations, noise_values).shape
+    measurements, simulations, noise_values = (
+        np.broadcast_to(array, shape)
+        for array in (measurements, simulations, noise_values))
+
+    llhs = np.empty(shape)
+    groups = pd.DataFrame({
+        NOISE_DISTRIBUTION: np.asarray(noise_distributions, dtype=object),
+        OBSERVABLE_TRANSFORMATION: np.asarray(scales, dtype=object),
+    }).groupby([NOISE_DISTRIBUTION, OBSERVABLE_TRANSFORMATION]).indices
+    for (noise_distribution, scale), indices in groups.items():
+        llhs[..., indices] = - _calculate_nllhs(
+            measurements[..., indices], simulations[..., indices],
+            scale, noise_distribution, noise_values[..., indices])
+    return llhs
 
-        llh = calculate_single_llh(
-            measurement, simulation, scale, noise_distribution, noise_value)
-        llhs.append(llh)
-    llh = sum(llhs)
-    return llh
+
+def calculate_llh_batch(
+        measurements: np.ndarray,
+        simulations: np.ndarray,
+        scales: Sequence[str],
+        noise_distributions: Sequence[str],
+        noise_values: np.ndarray) -> np.ndarray:
+    """Calculate total log likelihoods for a batch of simulations.
+
+    Arguments:
+        measurements: The measurement values, of shape (n_data_points,).
+        simulations: The simulated values, of shape
+            (n_particles, n_data_points).
+        scales: The scales on which the noise models are to be applied, one
+            per data point.
+        noise_distributions: The noise distributions, one per data point.
+        noise_values: The noise parameters, of shape (n_data_points,) or
+            (n_particles, n_data_points). The latter can be obtained via
+            `evaluate_noise_formulas` for noise formulas that depend on the
+            simulation.
+
+    Returns:
+        llhs: The log likelihood of each particle, of shape (n_particles,).
+    """
+    return calculate_llhs(measurements, simulations, scales,
+                          noise_distributions, noise_values).sum(axis=-1)
 
 
 def calculate_single_llh(
@@ -345,8 +803,25 @@ def calculate_single_llh(
     Returns:
         llh: The computed likelihood for the given values.
     """
+    nllh = _calculate_nllhs(
+        measurement, simulation, scale, noise_distribution, noise_value)
+    llh = - nllh
+    return llh
+
+
+def _calculate_nllhs(
+        measurements: np.ndarray,
+        simulations: np.ndarray,
+        scale: str,
+        noise_distribution: str,
+        noise_values: np.ndarray) -> np.ndarray:
+    """Calculate negative log likelihoods for a single combination of noise
+    distribution and scale.
+
+    For the arguments, see `calculate_llhs`.
+    """
     # short-hand
-    m, s, sigma = measurement, simulation, noise_value
+    m, s, sigma = measurements, simulations, noise_values
     pi, log, log10 = np.pi, np.log, np.log10
 
     # go over the possible cases
@@ -367,5 +842,211 @@ def calculate_single_llh(
         raise NotImplementedError(
             "Unsupported combination of noise_distribution and scale "
             f"specified: {noise_distribution}, {scale}.")
-    llh = - nllh
-    return llh
+    return nllh
+
+
+class ProblemEvaluator:
+    """Repeated evaluation of objective functions for a PEtab problem.
+
+    All preprocessing that does not depend on the simulated values, i.e.
+    matching of measurements and simulations, observable transformations,
+    noise formulas and noise distributions, is performed once on
+    construction. Subsequent evaluations are pure array computations on
+    new simulation vectors.
+
+    Simulation vectors are expected in the row order of the simulation table
+    template passed on construction (i.e. ``simulation_df[SIMULATION]``), or,
+    if none was passed, in the row order of the measurement table. Arrays of
+    shape (n_particles, n_simulations) are evaluated for each particle.
+
+    Attributes:
+        measurement_df: The problem measurement table.
+        observable_df: The problem observable table.
+        parameter_df: The problem parameter table.
+        simulation_indices: Position of the simulation for each measurement
+            in the simulation vectors, or ``None`` if simulation vectors are
+            ordered like the measurement table.
+        measurements: The measurement values.
+        scale_codes: The observable transformation of each measurement, see
+            :py:func:`petab_MS.parameters.get_scale_codes`.
+        distribution_codes: The noise distribution of each measurement, as
+            position in :py:data:`petab_MS.C.NOISE_MODELS`.
+    """
+
+    def __init__(
+            self,
+            petab_problem: 'petab_MS.Problem',
+            simulation_df: Optional[pd.DataFrame] = None):
+        """Preprocess the problem.
+
+        Arguments:
+            petab_problem:
+                The PEtab problem to evaluate.
+            simulation_df:
+                A simulation table template. Only its layout, not its
+                simulated values, are used.
+        """
+        if not isinstance(petab_problem.measurement_df, pd.DataFrame):
+            raise ValueError(
+                "ProblemEvaluator requires the measurement table as "
+                "DataFrame.")
+
+        self.measurement_df = petab_problem.measurement_df
+        self.observable_df = petab_problem.observable_df
+        self.parameter_df = petab_problem.parameter_df
+
+        self.simulation_indices = None
+        if simulation_df is not None:
+            self.simulation_indices = SimulationMatcher(
+                simulation_df).match(self.measurement_df)
+
+        self.measurements = np.asarray(
+            self.measurement_df[MEASUREMENT].values, dtype=float)
+
+        scales = _get_observable_transformations(
+            self.measurement_df, self.observable_df)
+        self.scale_codes = petab_MS.get_scale_codes(scales)
+        self._scaled_measurements = _scale_array(self.measurements, scales)
+
+        noise_distributions = _get_noise_distributions(
+            self.measurement_df, self.observable_df)
+        self.distribution_codes = pd.Categorical(
+            noise_distributions, categories=NOISE_MODELS).codes
+        if (self.distribution_codes < 0).any():
+            raise NotImplementedError(
+                "Unsupported noise distributions specified: "
+                f"{set(noise_distributions[self.distribution_codes < 0])}.")
+
+        # index arrays of measurements sharing noise distribution and scale
+        self._groups = [
+            (OBSERVABLE_TRANSFORMATIONS[scale_code],
+             NOISE_MODELS[distribution_code], indices)
+            for (scale_code, distribution_code), indices in pd.DataFrame({
+                'scale': self.scale_codes,
+                'distribution': self.distribution_codes,
+            }).groupby(['scale', 'distribution']).indices.items()]
+
+        # noise formulas with all parameters filled in, and fixed noise
+        #  values where they do not depend on the simulation
+        noise_formulas = get_compiled_noise_formulas(self.observable_df)
+        if NOISE_PARAMETERS in self.measurement_df:
+            noise_parameters = self.measurement_df[NOISE_PARAMETERS].values
+        else:
+            noise_parameters = np.full(len(self.measurement_df), None)
+        self._noise_functions = []
+        self._fixed_noise_values = np.full(len(self.measurement_df), np.nan)
+        for observable_id, rows in \
+                self.measurement_df.groupby(OBSERVABLE_ID).indices.items():
+            noise_formula = noise_formulas[observable_id]
+            if noise_formula is None:
+                raise ValueError("No noise formula specified for observable "
+                                 f"{observable_id}.")
+            noise_function = noise_formula.bind(
+                noise_parameters[rows], self.parameter_df)
+            if noise_formula.depends_on_simulation:
+                self._noise_functions.append((rows, noise_function))
+            else:
+                self._fixed_noise_values[rows] = noise_function(
+                    np.zeros(len(rows)))
+
+    def get_simulations(self, simulations: np.ndarray) -> np.ndarray:
+        """Get the simulations corresponding to the measurements.
+
+        Arguments:
+            simulations: Simulation vector(s), see class documentation.
+
+        Returns:
+            The simulations, ordered like the measurement table.
+        """
+        simulations = np.asarray(simulations, dtype=float)
+        if self.simulation_indices is None:
+            return simulations
+        return simulations[..., self.simulation_indices]
+
+    def get_noise_values(self, scaled_simulations: np.ndarray) -> np.ndarray:
+        """Evaluate the noise formulas.
+
+        Arguments:
+            scaled_simulations: The scaled simulations, ordered like the
+                measurement table.
+
+        Returns:
+            The noise values, in the shape of `scaled_simulations`. Read-only
+            if no noise formula depends on the simulation.
+        """
+        if not self._noise_functions:
+            noise_values = self._fixed_noise_values.view()
+            noise_values.flags.writeable = False
+            return noise_values
+        noise_values = np.broadcast_to(
+            self._fixed_noise_values, scaled_simulations.shape).copy()
+        for rows, noise_function in self._noise_functions:
+            noise_values[..., rows] = noise_function(
+                scaled_simulations[..., rows])
+        return noise_values
+
+    def _scale(self, values: np.ndarray) -> np.ndarray:
+        """Scale values ordered like the measurement table."""
+        return petab_MS.scale_array(values, self.scale_codes)
+
+    def residuals(
+            self,
+            simulations: np.ndarray,
+            normalize: bool = True,
+            scale: bool = True) -> np.ndarray:
+        """Calculate residuals.
+
+        Arguments:
+            simulations:
+                Simulation vector(s), see class documentation.
+            normalize:
+                Whether to normalize residuals by the noise standard deviation
+                terms.
+            scale:
+                Whether to calculate residuals of scaled values.
+
+        Returns:
+            The residuals, ordered like the measurement table.
+        """
+        simulations = self.get_simulations(simulations)
+        if scale:
+            simulations = self._scale(simulations)
+            residuals = simulations - self._scaled_measurements
+        else:
+            residuals = simulations - self.measurements
+        if normalize:
+            residuals /= self.get_noise_values(simulations)
+        return residuals
+
+    def chi2(
+            self,
+            simulations: np.ndarray,
+            normalize: bool = True,
+            scale: bool = True) -> Union[float, np.ndarray]:
+        """Calculate the chi2 value.
+
+        For the arguments, see `residuals`.
+
+        Returns:
+            The chi2 value, or one per particle.
+        """
+        return (self.residuals(simulations, normalize, scale)**2).sum(axis=-1)
+
+    def llh(self, simulations: np.ndarray) -> Union[float, np.ndarray]:
+        """Calculate the log-likelihood.
+
+        Arguments:
+            simulations: Simulation vector(s), see class documentation.
+
+        Returns:
+            The log-likelihood, or one per particle.
+        """
+        simulations = self.get_simulations(simulations)
+        noise_values = self.get_noise_values(self._scale(simulations))
+        noise_values = np.broadcast_to(noise_values, simulations.shape)
+        llhs = np.empty(simulations.shape)
+        for scale, noise_distribution, indices in self._groups:
+            llhs[..., indices] = - _calculate_nllhs(
+                self.measurements[indices], simulations[..., indices],
+                scale, noise_distribution, noise_values[..., indices])
+        return llhs.sum(axis=-1)
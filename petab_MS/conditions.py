@@ -5,7 +5,7 @@ from typing import Iterable, Optional, List, Union
 import numpy as np
 import pandas as pd
 
-from . import lint, core
+from . import cache, lint, core
 from .C import *
 
 
@@ -23,8 +23,7 @@ def get_condition_df(
         return condition_file
 
     if isinstance(condition_file, str):
-        condition_file = pd.read_csv(condition_file, sep='\t',
-                                     float_precision='round_trip')
+        condition_file = cache.read_table(condition_file)
 
     lint.assert_no_leading_trailing_whitespace(
         condition_file.columns.values, "condition")
@@ -70,9 +69,12 @@ def create_condition_df(parameter_ids: Iterable[str],
     data = {CONDITION_ID: condition_ids}
     df = pd.DataFrame(data)
 
+    parameter_ids = list(parameter_ids)
+    invalids = lint.get_invalid_identifier_positions(parameter_ids)
+    if len(invalids):
+        raise ValueError("Invalid parameter ID: "
+                         + str(parameter_ids[invalids[0]]))
     for p in parameter_ids:
-        if not lint.is_valid_identifier(p):
-            raise ValueError("Invalid parameter ID: " + p)
         df[p] = np.nan
 
     df.set_index(CONDITION_ID, inplace=True)
@@ -3,6 +3,8 @@
 import logging
 import os
 import re
+from collections import ChainMap
+from collections.abc import Mapping
 from typing import Iterable, Optional, Callable, Union, Any, Sequence, List
 from warnings import warn
 
@@ -176,18 +178,27 @@ def flatten_timepoint_specific_output_overrides(
 def concat_tables(
         tables: Union[str, pd.DataFrame, Iterable[Union[pd.DataFrame, str]]],
         file_parser: Optional[Callable] = None
-) -> pd.DataFrame:
+) -> Union[pd.DataFrame, Mapping]:
     """Concatenate DataFrames provided as DataFrames or filenames, and a parser
 
+    Tables are collected and concatenated at once. Parsers may also return
+    dicts, as done by :py:func:`petab.measurements.get_measurement_df` for
+    measurements in external files. These are merged.
+
     Arguments:
         tables:
-            Iterable of tables to join, as DataFrame or filename.
+            Iterable of tables to join, as DataFrame or filename. May be a
+            generator, which is consumed once.
         file_parser:
             Function used to read the table in case filenames are provided,
             accepting a filename as only argument.
 
     Returns:
-        The concatenated DataFrames
+        The concatenated DataFrames, or the merged dicts.
+
+    Raises:
+        ValueError:
+            If DataFrames and dicts are mixed, or if dicts share keys.
     """
 
     if isinstance(tables, pd.DataFrame):
@@ -196,18 +207,50 @@ def concat_tables(
     if isinstance(tables, str):
         return file_parser(tables)
 
-    df = pd.DataFrame()
-
+    dfs = []
+    dicts = []
     for tmp_df in tables:
         # load from file, if necessary
         if isinstance(tmp_df, str):
             tmp_df = file_parser(tmp_df)
-        if not isinstance(tmp_df, dict):
-            df = df.append(tmp_df, sort=False, ignore_index=isinstance(
-                tmp_df.index, pd.RangeIndex))
+        if isinstance(tmp_df, Mapping):
+            dicts.append(tmp_df)
         else:
-            df = tmp_df
-    return df
+            dfs.append(tmp_df)
+
+    if dicts:
+        if dfs:
+            raise ValueError("Cannot concatenate tables and dicts.")
+        return _merge_dicts(dicts)
+
+    if not dfs:
+        return pd.DataFrame()
+
+    return pd.concat(dfs, sort=False, ignore_index=all(
+        isinstance(df.index, pd.RangeIndex) for df in dfs))
+
+
+def _merge_dicts(dicts: List[Mapping]) -> Mapping:
+    """Merge dicts with distinct keys, preserving key order.
+
+    Plain dicts are merged into a new dict. Other mappings, e.g. lazily
+    loaded measurements, are chained without accessing their values.
+    """
+    if len(dicts) == 1:
+        return dicts[0]
+
+    seen = set()
+    duplicates = set()
+    for d in dicts:
+        duplicates.update(seen.intersection(d))
+        seen.update(d)
+    if duplicates:
+        raise ValueError(f"Duplicate keys in merged tables: {duplicates}.")
+
+    if all(type(d) is dict for d in dicts):
+        return {key: value for d in dicts for key, value in d.items()}
+    # ChainMap iterates keys of the last mapping first
+    return ChainMap(*reversed(dicts))
 
 
 def to_float_if_float(x: Any) -> Any:
@@ -238,6 +281,21 @@ def is_empty(val) -> bool:
     return val == '' or pd.isnull(val)
 
 
+def is_empty_array(values: pd.Series) -> np.ndarray:
+    """Check which entries of `values`, e.g. a table column, are empty.
+
+    Vectorized version of :py:func:`is_empty`.
+
+    Arguments:
+        values: The values to check.
+
+    Returns:
+        empty: Boolean array, whether the respective field is to be considered
+        empty.
+    """
+    return np.asarray(values.isnull() | (values == ''))
+
+
 def create_combine_archive(
         yaml_file: str,
         filename: str,
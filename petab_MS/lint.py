@@ -1,11 +1,16 @@
 """Integrity checks and tests for specific features used"""
 
-import copy
+import hashlib
+import json
 import logging
 import numbers
+import os
 import re
-from typing import Optional, Iterable, Any
+import tempfile
+from typing import (Optional, Iterable, Any, Union, Iterator, NamedTuple,
+                    Tuple, Callable, List, Dict)
 from collections import Counter
+from collections.abc import Mapping
 
 import libsbml
 import numpy as np
@@ -13,11 +18,20 @@ import pandas as pd
 import sympy as sp
 
 import petab_MS
-from . import (core, parameters, sbml, measurements)
+from . import (cache, core, parameters, sbml, measurements)
 from .C import *  # noqa: F403
 
 logger = logging.getLogger(__name__)
 
+# Valid identifiers, see is_valid_identifier
+_IDENTIFIER_REGEX = re.compile(r'^[a-zA-Z_]\w*$')
+
+#: Inputs of lint checks, see :py:class:`LintCheck`
+LINT_INPUTS = ('sbml', 'condition', 'measurement', 'observable', 'parameter')
+
+# Increment if lint checks change, to invalidate cached lint results
+_LINT_CACHE_FORMAT_VERSION = 1
+
 
 def _check_df(df: pd.DataFrame, req_cols: Iterable, name: str) -> None:
     """Check if given columns are present in DataFrame
@@ -37,6 +51,66 @@ def _check_df(df: pd.DataFrame, req_cols: Iterable, name: str) -> None:
             f"DataFrame {name} requires the columns {missing_cols}.")
 
 
+class LintIssue(NamedTuple):
+    """A problem found by a lint check.
+
+    Attributes:
+        table: The table the problem was found in, e.g. ``'measurement'``.
+        check: Name of the check that found the problem.
+        message: Description of the problem.
+        rows: Positions of the offending rows in the table, if applicable.
+    """
+    table: str
+    check: str
+    message: str
+    rows: Tuple[int, ...] = ()
+
+
+class LintReport:
+    """Problems found by lint checks, in the order they were found.
+
+    Evaluates to ``False`` if no problems were found.
+
+    Attributes:
+        issues: The problems found.
+    """
+
+    def __init__(self, issues: Optional[Iterable[LintIssue]] = None):
+        self.issues = list(issues) if issues is not None else []
+
+    def add(self, table: str, check: str, message: str,
+            rows: Iterable[int] = ()) -> None:
+        """Add a problem.
+
+        See :py:class:`LintIssue` for the arguments.
+        """
+        self.issues.append(LintIssue(table, check, message,
+                                     tuple(int(row) for row in rows)))
+
+    def extend(self, other: 'LintReport') -> None:
+        """Add all problems of another report."""
+        self.issues.extend(other.issues)
+
+    def __iter__(self) -> Iterator[LintIssue]:
+        return iter(self.issues)
+
+    def __len__(self) -> int:
+        return len(self.issues)
+
+    def to_df(self) -> pd.DataFrame:
+        """Get the problems as a table, one row per problem."""
+        return pd.DataFrame(self.issues, columns=LintIssue._fields)
+
+    def log(self, logger_: logging.Logger = logger) -> None:
+        """Log all problems as errors, with the offending rows."""
+        for issue in self.issues:
+            rows = ""
+            if issue.rows:
+                rows = f" Rows: {list(issue.rows[:10])}" \
+                    + (" ..." if len(issue.rows) > 10 else "")
+            logger_.error(f"{issue.message}{rows}")
+
+
 def assert_no_leading_trailing_whitespace(
         names_list: Iterable[str], name: str) -> None:
     """Check that there is no trailing whitespace in elements of Iterable
@@ -48,19 +122,48 @@ def assert_no_leading_trailing_whitespace(
     Raises:
         AssertionError: if there is trailing whitespace
     """
-    r = re.compile(r'(?:^\s)|(?:\s$)')
-    for i, x in enumerate(names_list):
-        if isinstance(x, str) and r.search(x):
-            raise AssertionError(f"Whitespace around {name}[{i}] = '{x}'.")
+    names_list = pd.Series(list(names_list), dtype=object)
+    positions = get_whitespace_positions(names_list)
+    if len(positions):
+        i = positions[0]
+        raise AssertionError(
+            f"Whitespace around {name}[{i}] = '{names_list[i]}'.")
+
+
+def get_whitespace_positions(values: Iterable) -> np.ndarray:
+    """Find strings with leading or trailing whitespace.
+
+    Arguments:
+        values: Values to check. Non-string values are ignored.
+
+    Returns:
+        Positions of the strings with leading or trailing whitespace.
+    """
+    # check each distinct value only once
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    try:
+        # NaN for non-string values
+        has_whitespace = pd.Series(uniques, dtype=object).str.contains(
+            r'(?:^\s)|(?:\s$)')
+    except AttributeError:
+        # no string values at all
+        return np.array([], dtype=int)
+    # code -1 (missing value) selects the trailing False
+    has_whitespace = np.append(
+        has_whitespace.fillna(False).to_numpy(dtype=bool), False)
+    return np.flatnonzero(has_whitespace[codes])
 
 
 def check_condition_df(
-        df: pd.DataFrame, sbml_model: Optional[libsbml.Model] = None) -> None:
+        df: pd.DataFrame,
+        sbml_model: Union[libsbml.Model, sbml.ModelIndex, None] = None
+) -> None:
     """Run sanity checks on PEtab condition table
 
     Arguments:
         df: PEtab condition DataFrame
-        sbml_model: SBML Model for additional checking of parameter IDs
+        sbml_model: SBML Model, or its model index, for additional checking
+            of parameter IDs
 
     Raises:
         AssertionError: in case of problems
@@ -84,11 +187,12 @@ def check_condition_df(
                 df[column_name].values, column_name)
 
     if sbml_model is not None:
+        model_index = sbml.get_model_index(sbml_model)
         for column_name in df.columns:
             if column_name != CONDITION_NAME \
-                    and sbml_model.getParameter(column_name) is None \
-                    and sbml_model.getSpecies(column_name) is None \
-                    and sbml_model.getCompartment(column_name) is None:
+                    and column_name not in model_index.parameters \
+                    and not model_index.is_species_or_compartment(
+                        column_name):
                 raise AssertionError(
                     "Condition table contains column for unknown entity '"
                     f"{column_name}'. Column names must match parameter, "
@@ -135,14 +239,13 @@ def check_measurement_df(df: pd.DataFrame,
             # Check for positivity of measurements in case of
             #  log-transformation
             assert_unique_observable_ids(observable_df)
-            # If the above is not checked, in the following loop
-            # trafo may become a pandas Series
-            for measurement, obs_id in zip(df[MEASUREMENT], df[OBSERVABLE_ID]):
-                trafo = observable_df.loc[obs_id, OBSERVABLE_TRANSFORMATION]
-                if measurement <= 0.0 and trafo in [LOG, LOG10]:
-                    raise ValueError('Measurements with observable '
-                                     f'transformation {trafo} must be '
-                                     f'positive, but {measurement} <= 0.')
+            rows, transformations = get_nonpositive_log_measurements(
+                df, observable_df)
+            if len(rows):
+                raise ValueError('Measurements with observable '
+                                 f'transformation {transformations[0]} must '
+                                 'be positive, but '
+                                 f'{df[MEASUREMENT].iloc[rows[0]]} <= 0.')
 
     if observable_df is not None:
         assert_measured_observables_defined(df, observable_df)
@@ -150,6 +253,101 @@ def check_measurement_df(df: pd.DataFrame,
             df, observable_df)
 
 
+def get_nonpositive_log_measurements(
+        measurement_df: pd.DataFrame,
+        observable_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Find non-positive measurements of log-transformed observables.
+
+    Arguments:
+        measurement_df: PEtab measurement table
+        observable_df: PEtab observable table with unique observable IDs
+
+    Returns:
+        Positions of the offending measurements, and the observable
+        transformations of those.
+    """
+    if OBSERVABLE_TRANSFORMATION not in observable_df:
+        return np.array([], dtype=int), np.array([], dtype=object)
+
+    transformations = measurement_df[OBSERVABLE_ID].map(
+        observable_df[OBSERVABLE_TRANSFORMATION]).to_numpy(dtype=object)
+    is_log = np.isin(transformations, [LOG, LOG10])
+    # measurement entries referencing external files are not checked
+    values = pd.to_numeric(measurement_df[MEASUREMENT],
+                           errors='coerce').to_numpy(dtype=float)
+    with np.errstate(invalid='ignore'):
+        rows = np.flatnonzero(is_log & (values <= 0.0))
+    return rows, transformations[rows]
+
+
+def lint_measurement_df(
+        df: pd.DataFrame,
+        observable_df: Optional[pd.DataFrame] = None) -> 'LintReport':
+    """Run all checks of :py:func:`check_measurement_df`, collecting all
+    problems instead of stopping at the first one.
+
+    Arguments:
+        df: PEtab measurement DataFrame
+        observable_df: PEtab observable DataFrame for checking if measurements
+            are compatible with observable transformations.
+
+    Returns:
+        The problems found.
+    """
+    report = LintReport()
+    table = 'measurement'
+
+    missing_cols = set(MEASUREMENT_DF_REQUIRED_COLS) - set(df.columns)
+    if missing_cols:
+        report.add(table, 'required_columns',
+                   f"DataFrame {table} requires the columns {missing_cols}.")
+        return report
+
+    for column_name in MEASUREMENT_DF_COLS:
+        if column_name in df \
+                and not np.issubdtype(df[column_name].dtype, np.number):
+            rows = get_whitespace_positions(df[column_name])
+            if len(rows):
+                report.add(table, 'whitespace',
+                           f"Whitespace around {column_name} values.", rows)
+
+    if observable_df is None:
+        return report
+
+    undefined = ~df[OBSERVABLE_ID].isin(observable_df.index)
+    if undefined.any():
+        report.add(table, 'observables_defined',
+                   "Undefined observables in measurement file: "
+                   f"{set(df[OBSERVABLE_ID][undefined])}.",
+                   np.flatnonzero(undefined))
+
+    non_unique_ids = get_non_unique(observable_df.index)
+    if non_unique_ids:
+        report.add('observable', 'unique_observable_ids',
+                   f"Non-unique values found in the {OBSERVABLE_ID} column"
+                   f" of the observable table: {non_unique_ids}")
+        # observable properties cannot be mapped to the measurements
+        return report
+
+    rows, transformations = get_nonpositive_log_measurements(
+        df, observable_df)
+    if len(rows):
+        report.add(table, 'log_positivity',
+                   "Measurements with observable transformation "
+                   f"{set(transformations)} must be positive.", rows)
+
+    for override_type in ['observable', 'noise']:
+        rows, expected, actual = measurements.get_override_count_mismatches(
+            df, observable_df, override_type)
+        if len(rows):
+            report.add(table, f'{override_type}_parameter_count',
+                       f"Mismatch of {override_type} parameter overrides. "
+                       f"Expected {expected[0]} but got {actual[0]} for "
+                       f"{df[OBSERVABLE_ID].iloc[rows[0]]}.", rows)
+
+    return report
+
+
 def check_parameter_df(
         df: pd.DataFrame,
         sbml_model: Optional[libsbml.Model] = None,
@@ -568,47 +766,60 @@ def measurement_table_has_timepoint_specific_mappings(
     Returns:
         True if there are time-point or replicate specific (non-numeric)
         parameter assignments in the measurement table, False otherwise.
+        Missing preequilibration conditions count as a separate group.
     """
     if measurement_df is None:
         return False
 
-    # since we edit it, copy it first
-    measurement_df = copy.deepcopy(measurement_df)
-
-    # mask numeric values
+    # integer codes of the groups by observable and (preequilibration)
+    #  condition, then further split by the overrides. NaN is a group value.
+    group_codes = np.zeros(len(measurement_df), dtype=np.int64)
+    num_groups = {}
     for col, allow_scalar_numeric in [
+        (OBSERVABLE_ID, None),
+        (SIMULATION_CONDITION_ID, None),
+        (PREEQUILIBRATION_CONDITION_ID, None),
         (OBSERVABLE_PARAMETERS, allow_scalar_numeric_observable_parameters),
         (NOISE_PARAMETERS, allow_scalar_numeric_noise_parameters)
     ]:
-        if col not in measurement_df:
-            continue
+        if col in measurement_df:
+            if allow_scalar_numeric is None:
+                codes = pd.factorize(measurement_df[col])[0]
+            else:
+                codes = _get_override_codes(measurement_df[col],
+                                            allow_scalar_numeric)
+            # skip all-null columns
+            if (codes >= 0).any():
+                group_codes = pd.factorize(
+                    group_codes * (codes.max() + 2) + codes + 1)[0]
+        num_groups[col] = group_codes.max() + 1 if len(group_codes) else 0
 
-        measurement_df[col] = measurement_df[col].apply(str)
-
-        if allow_scalar_numeric:
-            measurement_df.loc[
-                measurement_df[col].apply(is_scalar_float), col
-            ] = np.nan
-
-    grouping_cols = core.get_notnull_columns(
-        measurement_df,
-        [OBSERVABLE_ID,
-         SIMULATION_CONDITION_ID,
-         PREEQUILIBRATION_CONDITION_ID,
-         OBSERVABLE_PARAMETERS,
-         NOISE_PARAMETERS])
-    grouped_df = measurement_df.groupby(grouping_cols, dropna=False)
-
-    grouping_cols = core.get_notnull_columns(
-        measurement_df,
-        [OBSERVABLE_ID,
-         SIMULATION_CONDITION_ID,
-         PREEQUILIBRATION_CONDITION_ID])
-    grouped_df2 = measurement_df.groupby(grouping_cols)
     # data frame has timepoint specific overrides if grouping by noise
     # parameters and observable parameters in addition to observable,
     # condition and preeq id yields more groups
-    return len(grouped_df) != len(grouped_df2)
+    return bool(num_groups[NOISE_PARAMETERS]
+                != num_groups[PREEQUILIBRATION_CONDITION_ID])
+
+
+def _get_override_codes(overrides: pd.Series, allow_scalar_numeric: bool
+                        ) -> np.ndarray:
+    """Get integer codes of the string representations of overrides.
+
+    Arguments:
+        overrides: Observable or noise parameter column
+        allow_scalar_numeric: Whether numeric overrides are masked
+
+    Returns:
+        The codes, -1 for masked numeric overrides.
+    """
+    codes, uniques = pd.factorize(overrides.values)
+    # NaN, which has code -1
+    uniques = np.append(np.asarray(uniques, dtype=object), np.nan)
+    strings = pd.Series([str(x) for x in uniques], dtype=object)
+    string_codes = pd.factorize(strings)[0]
+    if allow_scalar_numeric:
+        string_codes[strings.map(is_scalar_float).values] = -1
+    return string_codes[codes]
 
 
 def observable_table_has_nontrivial_noise_formula(
@@ -709,91 +920,386 @@ def get_non_unique(values):
     return [value for (value, count) in counter.items() if count > 1]
 
 
-def lint_problem(problem: 'petab.Problem') -> bool:
-    """Run PEtab validation on problem
+class LintCheck(NamedTuple):
+    """A group of lint checks, run as one task by
+    :py:func:`run_lint_checks`.
+
+    Attributes:
+        name: Name of the check group.
+        function: Runs the checks on the problem and returns a
+            :py:class:`LintReport`.
+        dependencies: Names of check groups this group relies on. It is run
+            after those, and skipped if they found problems.
+        process_task: If set, the checks are run in a separate process
+            when running in parallel. ``process_task(problem)`` returns a
+            picklable function with its arguments, to be run there instead
+            of `function`.
+        inputs: The parts of the problem the checks depend on, see
+            :py:data:`LINT_INPUTS`. Cached results are reused while these
+            are unchanged. Defaults to all inputs.
+    """
+    name: str
+    function: Callable[..., LintReport]
+    dependencies: Tuple[str, ...] = ()
+    process_task: Optional[
+        Callable[['petab.Problem'], Tuple[Callable, Tuple]]] = None
+    inputs: Optional[Tuple[str, ...]] = None
 
-    Arguments:
-        problem: PEtab problem to check
 
-    Returns:
-        True is errors occurred, False otherwise
+def _lint_sbml(problem: 'petab.Problem') -> LintReport:
+    """Check SBML consistency, see :py:func:`petab.sbml.is_sbml_consistent`.
     """
-    # pylint: disable=too-many-statements
-    errors_occurred = False
+    if problem.sbml_model is None:
+        logger.warning("SBML model not available. Skipping.")
+        return LintReport()
+    return _lint_sbml_document(problem.sbml_model.getSBMLDocument())
 
-    # Run checks on individual files
-    if problem.sbml_model is not None:
-        logger.info("Checking SBML model...")
-        errors_occurred |= not sbml.is_sbml_consistent(
-            problem.sbml_model.getSBMLDocument())
-        sbml.log_sbml_errors(problem.sbml_model.getSBMLDocument())
-    else:
+
+def _get_sbml_task(problem: 'petab.Problem') -> Tuple[Callable, Tuple]:
+    """Get the SBML consistency check with the model as string, to be run
+    in a separate process."""
+    if problem.sbml_model is None:
+        return _lint_sbml_string, (None, )
+    return _lint_sbml_string, (libsbml.SBMLWriter().writeSBMLToString(
+        problem.sbml_model.getSBMLDocument()), )
+
+
+def _lint_sbml_string(sbml_string: Optional[str]) -> LintReport:
+    """Check SBML consistency of a model given as string."""
+    if sbml_string is None:
         logger.warning("SBML model not available. Skipping.")
+        return LintReport()
+    return _lint_sbml_document(
+        libsbml.SBMLReader().readSBMLFromString(sbml_string))
+
+
+def _lint_sbml_document(sbml_document: libsbml.SBMLDocument) -> LintReport:
+    """Check SBML consistency, reporting all messages if the check fails."""
+    logger.info("Checking SBML model...")
+    report = LintReport()
+    sbml_document.setConsistencyChecks(
+        libsbml.LIBSBML_CAT_UNITS_CONSISTENCY, False)
+    if not sbml_document.checkConsistency():
+        return report
+
+    for error_idx in range(sbml_document.getNumErrors()):
+        error = sbml_document.getError(error_idx)
+        report.add('sbml', 'sbml_consistency',
+                   f'libSBML {error.getSeverityAsString()} '
+                   f'({error.getCategoryAsString()}): {error.getMessage()}')
+    if not report:
+        report.add('sbml', 'sbml_consistency', 'SBML model is inconsistent.')
+    return report
+
+
+def _report_assertion(table: str, check: str, function: Callable,
+                      *args) -> LintReport:
+    """Run a check raising ``AssertionError`` and report its message."""
+    report = LintReport()
+    try:
+        function(*args)
+    except AssertionError as e:
+        report.add(table, check, str(e))
+    return report
 
-    if problem.measurement_df is not None:
-        logger.info("Checking measurement table...")
-        try:
-            check_measurement_df(problem.measurement_df, problem.observable_df)
-
-            if problem.condition_df is not None:
-                assert_measurement_conditions_present_in_condition_table(
-                    problem.measurement_df, problem.condition_df
-                )
-        except AssertionError as e:
-            logger.error(e)
-            errors_occurred = True
-    else:
-        logger.warning("Measurement table not available. Skipping.")
 
+def _lint_measurements(problem: 'petab.Problem') -> LintReport:
+    """Check the measurement table."""
+    if problem.measurement_df is None:
+        logger.warning("Measurement table not available. Skipping.")
+        return LintReport()
+    if isinstance(problem.measurement_df, Mapping):
+        logger.info("Measurements given as dict, not as table. Skipping.")
+        return LintReport()
+
+    logger.info("Checking measurement table...")
+    report = lint_measurement_df(problem.measurement_df,
+                                 problem.observable_df)
     if problem.condition_df is not None:
-        logger.info("Checking condition table...")
-        try:
-            check_condition_df(problem.condition_df, problem.sbml_model)
-        except AssertionError as e:
-            logger.error(e)
-            errors_occurred = True
-    else:
+        report.extend(_report_assertion(
+            'measurement', 'conditions_present',
+            assert_measurement_conditions_present_in_condition_table,
+            problem.measurement_df, problem.condition_df))
+    return report
+
+
+def _lint_conditions(problem: 'petab.Problem') -> LintReport:
+    """Check the condition table."""
+    if problem.condition_df is None:
         logger.warning("Condition table not available. Skipping.")
+        return LintReport()
 
-    if problem.observable_df is not None:
-        logger.info("Checking observable table...")
-        try:
-            check_observable_df(problem.observable_df)
-        except AssertionError as e:
-            logger.error(e)
-            errors_occurred = True
-        if problem.sbml_model is not None:
-            for obs_id in problem.observable_df.index:
-                if problem.sbml_model.getElementBySId(obs_id):
-                    logger.error(f"Observable ID {obs_id} shadows model "
-                                 "entity.")
-                    errors_occurred = True
-    else:
-        logger.warning("Observable table not available. Skipping.")
+    logger.info("Checking condition table...")
+    return _report_assertion('condition', 'condition_df', check_condition_df,
+                             problem.condition_df, problem.model_index)
 
-    if problem.parameter_df is not None:
-        logger.info("Checking parameter table...")
-        try:
-            check_parameter_df(problem.parameter_df, problem.sbml_model,
-                               problem.observable_df,
-                               problem.measurement_df, problem.condition_df)
-        except AssertionError as e:
-            logger.error(e)
-            errors_occurred = True
-    else:
+
+def _lint_observables(problem: 'petab.Problem') -> LintReport:
+    """Check the observable table."""
+    if problem.observable_df is None:
+        logger.warning("Observable table not available. Skipping.")
+        return LintReport()
+
+    logger.info("Checking observable table...")
+    report = _report_assertion('observable', 'observable_df',
+                               check_observable_df, problem.observable_df)
+    if problem.model_index is not None:
+        for obs_id in problem.observable_df.index:
+            if problem.model_index.has_element(obs_id):
+                report.add('observable', 'observable_shadowing',
+                           f"Observable ID {obs_id} shadows model entity.")
+    return report
+
+
+def _lint_parameters(problem: 'petab.Problem') -> LintReport:
+    """Check the parameter table, also against the other tables."""
+    if problem.parameter_df is None:
         logger.warning("Parameter table not available. Skipping.")
+        return LintReport()
+
+    logger.info("Checking parameter table...")
+    # measurement dicts contain no parameter overrides
+    measurement_df = problem.measurement_df \
+        if not isinstance(problem.measurement_df, Mapping) else None
+    return _report_assertion('parameter', 'parameter_df', check_parameter_df,
+                             problem.parameter_df, problem.sbml_model,
+                             problem.observable_df, measurement_df,
+                             problem.condition_df)
+
+
+def _lint_model_parameters(problem: 'petab.Problem') -> LintReport:
+    """Check model parameters against condition and parameter table."""
+    if problem.sbml_model is None or problem.condition_df is None \
+            or problem.parameter_df is None:
+        return LintReport()
+
+    return _report_assertion(
+        'parameter', 'model_parameters',
+        assert_model_parameters_in_condition_or_parameter_table,
+        problem.sbml_model, problem.condition_df, problem.parameter_df)
+
+
+#: The check groups run by :py:func:`lint_problem`, in report order
+LINT_CHECKS = [
+    LintCheck('sbml', _lint_sbml, process_task=_get_sbml_task,
+              inputs=('sbml', )),
+    LintCheck('measurement', _lint_measurements,
+              inputs=('measurement', 'observable', 'condition')),
+    LintCheck('condition', _lint_conditions, inputs=('condition', 'sbml')),
+    LintCheck('observable', _lint_observables,
+              inputs=('observable', 'sbml')),
+    # assert_all_parameters_present_in_parameter_df relies on valid
+    #  measurement, condition and observable tables
+    LintCheck('parameter', _lint_parameters,
+              dependencies=('measurement', 'condition', 'observable')),
+    LintCheck('model_parameters', _lint_model_parameters,
+              inputs=('sbml', 'condition', 'parameter')),
+]
+
+
+def run_lint_checks(problem: 'petab.Problem',
+                    checks: Optional[List[LintCheck]] = None,
+                    num_threads: Optional[int] = None,
+                    cache_dir: Optional[str] = None) -> LintReport:
+    """Run groups of lint checks, independent groups concurrently.
+
+    If a cache directory is set, the results of each group are stored
+    there, and only groups whose inputs changed are rerun.
 
-    if problem.sbml_model is not None and problem.condition_df is not None \
-            and problem.parameter_df is not None:
-        try:
-            assert_model_parameters_in_condition_or_parameter_table(
-                problem.sbml_model,
-                problem.condition_df,
-                problem.parameter_df
-            )
-        except AssertionError as e:
-            logger.error(e)
-            errors_occurred = True
+    Arguments:
+        problem: PEtab problem to check
+        checks: The check groups to run. Dependencies must precede their
+            dependents. Defaults to :py:data:`LINT_CHECKS`.
+        num_threads: Number of check groups to run at the same time. Defaults
+            to the environment variable with the name of
+            :py:data:`petab.ENV_NUM_THREADS`. Check groups with
+            ``process_task`` run in a separate process.
+        cache_dir: Cache directory for lint results. Defaults to
+            :py:func:`petab.cache.get_cache_dir`.
+
+    Returns:
+        The problems found, in the order of `checks`.
+    """
+    if checks is None:
+        checks = LINT_CHECKS
+    if num_threads is None:
+        num_threads = int(os.environ.get(petab_MS.ENV_NUM_THREADS, 1))
+    if cache_dir is None:
+        cache_dir = cache.get_cache_dir()
+    names = {check.name for check in checks}
+    for check in checks:
+        if set(check.dependencies) - names:
+            raise ValueError(f"Unknown dependencies of lint check "
+                             f"{check.name}: "
+                             f"{set(check.dependencies) - names}.")
+
+    reports = {}
+    keys = _get_lint_cache_keys(problem, checks) \
+        if cache_dir is not None else {}
+
+    def get_task(check: LintCheck
+                 ) -> Union[LintReport, Tuple[Callable, Tuple]]:
+        """Get the function and arguments to run, or the report if the
+        group is skipped or cached."""
+        failed = [dependency for dependency in check.dependencies
+                  if reports[dependency]]
+        if failed:
+            logger.info(f"Skipping lint check {check.name}, because "
+                        f"{failed} found problems.")
+            return LintReport()
+        if check.name in keys:
+            report = _load_lint_report(cache_dir, keys[check.name])
+            if report is not None:
+                logger.debug(f"Using cached results of lint check "
+                             f"{check.name}.")
+                return report
+        if num_threads > 1 and check.process_task is not None:
+            return check.process_task(problem)
+        return check.function, (problem, )
+
+    def finish(name: str, report: LintReport) -> None:
+        """Record and cache the report of a group that was run."""
+        reports[name] = report
+        if name in keys:
+            _store_lint_report(cache_dir, keys[name], report)
+
+    if num_threads == 1:
+        for check in checks:
+            task = get_task(check)
+            if isinstance(task, LintReport):
+                reports[check.name] = task
+            else:
+                finish(check.name, task[0](*task[1]))
+        return _merge_reports(checks, reports)
+
+    from concurrent.futures import (ThreadPoolExecutor, ProcessPoolExecutor,
+                                    wait, FIRST_COMPLETED)
+    pending = list(checks)
+    running = {}
+    with ThreadPoolExecutor(max_workers=num_threads) as thread_pool, \
+            ProcessPoolExecutor(max_workers=1) as process_pool:
+        while pending or running:
+            for check in [check for check in pending
+                          if all(dependency in reports
+                                 for dependency in check.dependencies)]:
+                pending.remove(check)
+                task = get_task(check)
+                if isinstance(task, LintReport):
+                    reports[check.name] = task
+                    continue
+                if check.process_task is not None:
+                    pool = process_pool
+                else:
+                    # resolve lazily loaded attributes before sharing the
+                    #  problem
+                    problem.model_index
+                    pool = thread_pool
+                running[pool.submit(task[0], *task[1])] = check.name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(running.pop(future), future.result())
+
+    return _merge_reports(checks, reports)
+
+
+def _get_lint_cache_keys(problem: 'petab.Problem',
+                         checks: List[LintCheck]) -> Dict[str, str]:
+    """Get the cache keys of the results of lint check groups.
+
+    A key covers the content of the inputs of a group and the keys of its
+    dependencies, whose results decide whether the group is skipped.
+    """
+    input_hashes = {}
+    keys = {}
+    for check in checks:
+        inputs = LINT_INPUTS if check.inputs is None else check.inputs
+        for input_ in inputs:
+            if input_ not in input_hashes:
+                input_hashes[input_] = _get_lint_input_hash(problem, input_)
+        key = json.dumps([
+            _LINT_CACHE_FORMAT_VERSION, petab_MS.__version__, check.name,
+            check.function.__module__, check.function.__qualname__,
+            {input_: input_hashes[input_] for input_ in inputs},
+            [keys[dependency] for dependency in check.dependencies]])
+        keys[check.name] = hashlib.sha256(key.encode()).hexdigest()
+    return keys
+
+
+def _get_lint_input_hash(problem: 'petab.Problem', input_: str) -> str:
+    """Get a hash of the content of an input of lint checks."""
+    if input_ not in LINT_INPUTS:
+        raise ValueError(f"Unknown lint input {input_}.")
+    if input_ != 'sbml':
+        return cache.get_table_hash(getattr(problem, f'{input_}_df'))
+    sbml_file = getattr(problem, '_sbml_file', None)
+    if sbml_file is not None:
+        # not loaded yet
+        return cache.get_file_hash(sbml_file)
+    if problem.sbml_model is None:
+        return ''
+    return hashlib.sha256(libsbml.SBMLWriter().writeSBMLToString(
+        problem.sbml_model.getSBMLDocument()).encode()).hexdigest()
+
+
+def _load_lint_report(cache_dir: str, key: str) -> Optional[LintReport]:
+    """Load cached lint results, or None if not cached."""
+    try:
+        with open(os.path.join(cache_dir, 'lint', f'{key}.json')) as f:
+            issues = json.load(f)
+    except FileNotFoundError:
+        return None
+    report = LintReport()
+    for table, check, message, rows in issues:
+        report.add(table, check, message, tuple(rows))
+    return report
+
+
+def _store_lint_report(cache_dir: str, key: str, report: LintReport
+                       ) -> None:
+    """Cache lint results.
+
+    The results are written to a temporary file first and then renamed,
+    so concurrent readers never see incomplete results.
+    """
+    lint_dir = os.path.join(cache_dir, 'lint')
+    os.makedirs(lint_dir, exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(dir=lint_dir, prefix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump([list(issue) for issue in report], f, default=int)
+    os.replace(tmp_file, os.path.join(lint_dir, f'{key}.json'))
+
+
+def _merge_reports(checks: List[LintCheck],
+                   reports: Dict[str, LintReport]) -> LintReport:
+    """Merge the reports of check groups in the order of the groups."""
+    report = LintReport()
+    for check in checks:
+        report.extend(reports[check.name])
+    return report
+
+
+def lint_problem(problem: 'petab.Problem',
+                 num_threads: Optional[int] = None,
+                 cache_dir: Optional[str] = None) -> bool:
+    """Run PEtab validation on problem
+
+    Independent checks are run concurrently, and results of unchanged
+    inputs are reused from the cache, see :py:func:`run_lint_checks`.
+
+    Arguments:
+        problem: PEtab problem to check
+        num_threads: See :py:func:`run_lint_checks`.
+        cache_dir: See :py:func:`run_lint_checks`.
+
+    Returns:
+        True is errors occurred, False otherwise
+    """
+    report = run_lint_checks(problem, num_threads=num_threads,
+                             cache_dir=cache_dir)
+    report.log()
+    errors_occurred = bool(report)
 
     if errors_occurred:
         logger.error('Not OK')
@@ -894,7 +1400,25 @@ def is_valid_identifier(x: str) -> bool:
     if pd.isna(x):
         return False
 
-    return re.match(r'^[a-zA-Z_]\w*$', x) is not None
+    return _IDENTIFIER_REGEX.match(x) is not None
+
+
+def get_invalid_identifier_positions(ids: Iterable) -> np.ndarray:
+    """Find invalid identifiers, see :py:func:`is_valid_identifier`.
+
+    Arguments:
+        ids: Identifiers to check. Missing and non-string values are invalid.
+
+    Returns:
+        Positions of the invalid identifiers.
+    """
+    ids = pd.Series(ids, dtype=object)
+    try:
+        is_valid = ids.str.match(_IDENTIFIER_REGEX, na=False)
+    except AttributeError:
+        # no string values at all
+        return np.arange(len(ids))
+    return np.flatnonzero(~is_valid.to_numpy(dtype=bool))
 
 
 def check_ids(ids: Iterable[str], kind: str = '') -> None:
@@ -907,16 +1431,15 @@ def check_ids(ids: Iterable[str], kind: str = '') -> None:
     Raises:
         ValueError - in case of invalid IDs
     """
-    invalids = [(index, _id)
-                for index, _id in enumerate(ids)
-                if not is_valid_identifier(_id)]
+    ids = pd.Series(ids, dtype=object)
+    invalids = get_invalid_identifier_positions(ids)
 
-    if invalids:
+    if len(invalids):
         # The first row is the header row, and Python lists are zero-indexed,
         # hence need to add 2 for the correct line number.
         offset = 2
         error_output = '\n'.join([
             f'Line {index+offset}: ' +
-            ('Missing ID' if pd.isna(_id) else _id)
-            for index, _id in invalids])
+            ('Missing ID' if pd.isna(_id) else str(_id))
+            for index, _id in zip(invalids, ids.values[invalids])])
         raise ValueError(f"Invalid {kind} ID(s):\n{error_output}")
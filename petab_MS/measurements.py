@@ -3,28 +3,54 @@
 
 
 import itertools
+import logging
 import numbers
-from typing import List, Union, Dict
+import tempfile
+import time
+from collections.abc import Mapping
+from typing import Callable, Iterable, List, Union, Dict, Optional, Tuple
 from warnings import warn
 import copy
 import numpy as np
 import pandas as pd
 
-from . import (lint, core, observables)
+from . import (cache, lint, core, observables)
 from . import problem
+from . import ENV_NUM_THREADS
 from .C import *  # noqa: F403
 from pyabc.external.r import R
 import os
 
+logger = logging.getLogger(__name__)
+
+# Row positions in the measurement table for each combination of
+#  simulationConditionId and preequilibrationConditionId
+ConditionRowIndex = Dict[Tuple[str, str], np.ndarray]
+
 
 def get_measurement_df(
-        measurement_file: Union[None, str, pd.DataFrame]
+        measurement_file: Union[None, str, pd.DataFrame],
+        lazy: bool = False,
+        columns: Optional[Iterable[str]] = None,
+        chunksize: Optional[int] = None,
+        num_threads: Optional[int] = None
 ) -> pd.DataFrame:
     """
     Read the provided measurement file into a ``pandas.Dataframe``.
 
     Arguments:
         measurement_file: Name of file to read from or pandas.Dataframe
+        lazy: For measurement tables referencing external csv files, only
+            read the file headers now, and each file on first access. See
+            :py:class:`LazyMeasurementDict`.
+        columns: For measurement tables referencing external csv files, the
+            columns of those files to load. Defaults to all columns.
+        chunksize: For measurement tables referencing external csv files,
+            read those files in chunks of this many rows.
+        num_threads: For measurement tables referencing external csv files,
+            the maximum number of threads reading those files concurrently.
+            Defaults to the environment variable with the name of
+            :py:data:`petab.ENV_NUM_THREADS`.
 
     Returns:
         Measurement DataFrame
@@ -33,36 +59,17 @@ def get_measurement_df(
         return measurement_file
 
     if isinstance(measurement_file, str):
-        measurement_df = pd.read_csv(measurement_file, sep='\t',
-                                       float_precision='round_trip')
+        measurement_df = cache.read_table(measurement_file)
         type = problem.check_value_type(measurement_df.measurement[0])
         if type is "csv_file":
-            # if single file
-            if len(measurement_df.measurement) == 1:
-                measurement_df_dict = {}
-                path, filename = measurement_file.rsplit("/", 1)
-                for file_name, condition in zip(measurement_df.measurement,
-                                     measurement_df.simulationConditionId):
-                    tmp_measurement_df = pd.read_csv(path + "/" + file_name,
-                                                     sep='\t',
-                                                     float_precision='round_trip')
-                    lint.assert_no_leading_trailing_whitespace(
-                        tmp_measurement_df.columns.values, MEASUREMENT)
-                    for col in tmp_measurement_df.columns:
-                        measurement_df_dict[condition + "__" + col] = tmp_measurement_df[col]
-            else:
-                measurement_df_dict = {}
-                path, filename = measurement_file.rsplit("/", 1)
-                for file_name, condition, observables_id in zip(measurement_df.measurement,
-                                                measurement_df.simulationConditionId, measurement_df.observableId):
-                    tmp_measurement_df = pd.read_csv(path + "/" + file_name,
-                                                     sep='\t',
-                                                     float_precision='round_trip')
-                    lint.assert_no_leading_trailing_whitespace(
-                        tmp_measurement_df.columns.values, MEASUREMENT)
-                    for col in tmp_measurement_df.columns:
-                        measurement_df_dict[condition + "__" + observables_id + "__" + col] = \
-                        tmp_measurement_df[col]
+            external_files = _get_external_measurement_files(
+                measurement_df, measurement_file)
+            measurement_df_dict = LazyMeasurementDict(
+                external_files, columns=columns, chunksize=chunksize,
+                num_threads=num_threads)
+            if not lazy:
+                measurement_df_dict.load()
+                measurement_df_dict = dict(measurement_df_dict)
         elif type is "r_file":
             for name, condition, observables_id in zip(
                     measurement_df.measurement,
@@ -84,6 +91,150 @@ def get_measurement_df(
     return measurement_df_dict
 
 
+def _get_external_measurement_files(
+        measurement_df: pd.DataFrame,
+        measurement_file: str
+) -> Dict[str, str]:
+    """Get the csv files referenced in a measurement table.
+
+    Arguments:
+        measurement_df: The measurement table referencing csv files.
+        measurement_file: The measurement table file name, relative to which
+            the referenced files are located.
+
+    Returns:
+        Dictionary mapping the key prefix of the measurements of each file,
+        i.e. ``condition__`` for a single referenced file and
+        ``condition__observable__`` otherwise, to the file name.
+    """
+    path = os.path.dirname(measurement_file)
+    if len(measurement_df.measurement) == 1:
+        prefixes = [condition + "__"
+                    for condition in measurement_df.simulationConditionId]
+    else:
+        prefixes = [condition + "__" + observable_id + "__"
+                    for condition, observable_id in zip(
+                        measurement_df.simulationConditionId,
+                        measurement_df.observableId)]
+    return {prefix: os.path.join(path, file_name)
+            for prefix, file_name in zip(prefixes,
+                                         measurement_df.measurement)}
+
+
+class LazyMeasurementDict(Mapping):
+    """Measurements from external csv files, read on first access.
+
+    Keys are the file's key prefix (see
+    :py:func:`get_measurement_df`) followed by the column name, values the
+    respective columns. On construction, only the file headers are read.
+    On first access of a column, all selected columns of the respective file
+    are read and cached. :py:meth:`load` reads all files at once,
+    concurrently.
+
+    Attributes:
+        files: Key prefixes mapped to the file names.
+        columns: The columns to load, or ``None`` for all columns.
+        chunksize: Read files in chunks of this many rows, or ``None`` to
+            read them at once.
+        num_threads: Maximum number of threads used to read files. Defaults
+            to the environment variable with the name of
+            :py:data:`petab.ENV_NUM_THREADS`.
+        read_times: Key prefixes mapped to the time in seconds it took to
+            read and parse the respective file.
+        cache_dir: Directory of the table cache enabled on construction, see
+            :py:func:`petab.cache.get_cache_dir`.
+    """
+
+    def __init__(self,
+                 files: Dict[str, str],
+                 columns: Optional[Iterable[str]] = None,
+                 chunksize: Optional[int] = None,
+                 num_threads: Optional[int] = None):
+        self.files = files
+        self.columns = list(columns) if columns is not None else None
+        self.chunksize = chunksize
+        if num_threads is None:
+            num_threads = int(os.environ.get(ENV_NUM_THREADS, 1))
+        self.num_threads = num_threads
+        self.read_times = {}
+        self.cache_dir = cache.get_cache_dir()
+        # key -> (key prefix, column)
+        self._keys = {}
+        # key prefix -> selected columns
+        self._usecols = {}
+        self._data = {}
+        for prefix, header in zip(files, self._map(self._read_header,
+                                                   files)):
+            lint.assert_no_leading_trailing_whitespace(
+                header.values, MEASUREMENT)
+            self._usecols[prefix] = [
+                col for col in header
+                if self.columns is None or col in self.columns]
+            for col in self._usecols[prefix]:
+                self._keys[prefix + col] = (prefix, col)
+
+    def __getitem__(self, key: str) -> pd.Series:
+        if key not in self._data:
+            prefix, _ = self._keys[key]
+            self._store(prefix, self._read(prefix))
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def load(self) -> None:
+        """Read all files that have not been read yet.
+
+        Files are read concurrently by up to `num_threads` threads.
+        """
+        prefixes = [prefix for prefix in self.files
+                    if not self._is_loaded(prefix)]
+        for prefix, df in zip(prefixes, self._map(self._read, prefixes)):
+            self._store(prefix, df)
+
+    def unload(self) -> None:
+        """Drop all data read so far. It will be re-read on access."""
+        self._data = {}
+
+    def _map(self, func: Callable, prefixes: List[str]) -> List:
+        """Apply `func` to all `prefixes`, using up to `num_threads`
+        threads. Results are in the order of `prefixes`."""
+        num_threads = min(self.num_threads, len(prefixes))
+        if num_threads <= 1:
+            return list(map(func, prefixes))
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            return list(executor.map(func, prefixes))
+
+    def _read_header(self, prefix: str) -> pd.Index:
+        """Read the column names of the file with the given prefix."""
+        return pd.read_csv(self.files[prefix], sep='\t', nrows=0).columns
+
+    def _is_loaded(self, prefix: str) -> bool:
+        return all(prefix + col in self._data
+                   for col in self._usecols[prefix])
+
+    def _read(self, prefix: str) -> pd.DataFrame:
+        """Read the selected columns of the file with the given prefix."""
+        start = time.perf_counter()
+        df = cache.read_table(self.files[prefix],
+                              usecols=self._usecols[prefix],
+                              chunksize=self.chunksize,
+                              cache_dir=self.cache_dir)
+        self.read_times[prefix] = time.perf_counter() - start
+        logger.debug(f"Read {self.files[prefix]} in "
+                     f"{self.read_times[prefix]:.3f}s")
+        return df
+
+    def _store(self, prefix: str, df: pd.DataFrame) -> None:
+        for col in df.columns:
+            self._data[prefix + col] = df[col]
+
+
 def write_measurement_df(df: pd.DataFrame, filename: str) -> None:
     """Write PEtab measurement table
 
@@ -174,8 +325,37 @@ def get_simulation_conditions(measurement_df: pd.DataFrame) -> pd.DataFrame:
     return simulation_conditions.sort_values(grouping_cols, ignore_index=True)
 
 
+def get_condition_row_index(measurement_df: pd.DataFrame
+                            ) -> ConditionRowIndex:
+    """
+    Group the rows of `measurement_df` by simulation condition in one pass.
+
+    The result can be used to repeatedly select the rows for a condition
+    without scanning the full measurement table, e.g. via
+    :py:func:`get_rows_for_condition`.
+
+    Arguments:
+        measurement_df: PEtab measurement table
+
+    Returns:
+        Dictionary mapping tuples of 'simulationConditionId' and
+        'preequilibrationConditionId' to the positions of the respective rows
+        in ``measurement_df``. Missing condition IDs are represented by ''
+        (empty string), as in :py:func:`get_simulation_conditions`.
+    """
+    keys = pd.DataFrame({
+        col: measurement_df[col].fillna('').values
+        if col in measurement_df else np.full(len(measurement_df), '')
+        for col in [SIMULATION_CONDITION_ID, PREEQUILIBRATION_CONDITION_ID]
+    })
+    return keys.groupby(
+        [SIMULATION_CONDITION_ID, PREEQUILIBRATION_CONDITION_ID]).indices
+
+
 def get_rows_for_condition(measurement_df: pd.DataFrame,
-                           condition: Union[pd.Series, pd.DataFrame, Dict]
+                           condition: Union[pd.Series, pd.DataFrame, Dict],
+                           condition_row_index:
+                           Optional[ConditionRowIndex] = None
                            ) -> pd.DataFrame:
     """
     Extract rows in `measurement_df` for `condition` according
@@ -189,11 +369,28 @@ def get_rows_for_condition(measurement_df: pd.DataFrame,
             DataFrame with single row (or Series) and columns
             'preequilibrationConditionId' and 'simulationConditionId'.
             Or dictionary with those keys.
+        condition_row_index:
+            Output of :py:func:`get_condition_row_index` for
+            ``measurement_df``. Optional, saves time if precomputed.
 
     Returns:
         The subselection of rows in ``measurement_df`` for the condition
     ``condition``.
     """
+    if condition_row_index is not None \
+            and SIMULATION_CONDITION_ID in condition:
+        sim_condition_id = condition[SIMULATION_CONDITION_ID]
+        preeq_condition_id = condition[PREEQUILIBRATION_CONDITION_ID] \
+            if PREEQUILIBRATION_CONDITION_ID in condition else ''
+        if isinstance(sim_condition_id, pd.Series):
+            sim_condition_id = sim_condition_id.iloc[0]
+        if isinstance(preeq_condition_id, pd.Series):
+            preeq_condition_id = preeq_condition_id.iloc[0]
+        rows = condition_row_index.get(
+            (sim_condition_id, preeq_condition_id or ''),
+            np.array([], dtype=int))
+        return measurement_df.iloc[rows, :]
+
     # filter rows for condition
     row_filter = 1
     # check for equality in all grouping cols
@@ -300,6 +497,70 @@ def measurements_have_replicates(measurement_df: pd.DataFrame) -> bool:
         measurement_df.fillna('').groupby(grouping_cols).size().values - 1)
 
 
+def get_parameter_override_counts(overrides: Iterable) -> np.ndarray:
+    """Count the overrides in entries of an ``observableParameters`` or
+    ``noiseParameters`` column.
+
+    Each distinct entry is split only once.
+
+    Arguments:
+        overrides: The column entries
+
+    Returns:
+        The number of overrides of each entry, see
+        :py:func:`split_parameter_replacement_list`.
+    """
+    codes, uniques = pd.factorize(pd.Series(overrides, dtype=object))
+    # code -1 (empty entry) selects the trailing zero
+    unique_counts = np.array(
+        [len(split_parameter_replacement_list(unique)) for unique in uniques]
+        + [0], dtype=int)
+    return unique_counts[codes]
+
+
+def get_override_count_mismatches(
+        measurement_df: pd.DataFrame,
+        observable_df: pd.DataFrame,
+        override_type: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find measurements with a wrong number of parameter overrides.
+
+    Arguments:
+        measurement_df: PEtab measurement table
+        observable_df: PEtab observable table
+        override_type: ``'observable'`` or ``'noise'``
+
+    Returns:
+        Positions of the measurements whose number of overrides does not
+        match the number of placeholders of their observable, and the
+        expected and actual number of overrides for those. Measurements of
+        undefined observables are skipped.
+    """
+    if override_type == 'observable':
+        formula_column, override_column = \
+            OBSERVABLE_FORMULA, OBSERVABLE_PARAMETERS
+    else:
+        formula_column, override_column = NOISE_FORMULA, NOISE_PARAMETERS
+
+    # sympify only once and save number of parameters
+    placeholder_counts = pd.Series(
+        [len(observables.get_formula_placeholders(
+            formula, obs_id, override_type))
+         for obs_id, formula in zip(observable_df.index.values,
+                                    observable_df[formula_column])],
+        index=observable_df.index, dtype=float)
+    expected = measurement_df[OBSERVABLE_ID].map(
+        placeholder_counts).to_numpy()
+
+    if override_column in measurement_df:
+        actual = get_parameter_override_counts(
+            measurement_df[override_column])
+    else:
+        actual = np.zeros(len(measurement_df), dtype=int)
+
+    rows = np.flatnonzero(~np.isnan(expected) & (actual != expected))
+    return rows, expected[rows].astype(int), actual[rows]
+
+
 def assert_overrides_match_parameter_count(
         measurement_df: pd.DataFrame,
         observable_df: pd.DataFrame) -> None:
@@ -310,59 +571,30 @@ def assert_overrides_match_parameter_count(
         measurement_df: PEtab measurement table
         observable_df: PEtab observable table
     """
-
-    # sympify only once and save number of parameters
-    observable_parameters_count = {
-        obs_id: len(observables.get_formula_placeholders(
-            formula, obs_id, 'observable'))
-        for obs_id, formula in zip(observable_df.index.values,
-                                   observable_df[OBSERVABLE_FORMULA])}
-    noise_parameters_count = {
-        obs_id:
-            len(observables.get_formula_placeholders(formula, obs_id, 'noise'))
-        for obs_id, formula in zip(observable_df.index.values,
-                                   observable_df[NOISE_FORMULA])}
-
-    for _, row in measurement_df.iterrows():
-        # check observable parameters
-        try:
-            expected = observable_parameters_count[row[OBSERVABLE_ID]]
-        except KeyError:
-            raise ValueError(
-                f"Observable {row[OBSERVABLE_ID]} used in measurement table "
-                f"is not defined.")
-        actual = len(split_parameter_replacement_list(
-            row.get(OBSERVABLE_PARAMETERS, None)))
-        # No overrides are also allowed
-        if actual != expected:
-            formula = observable_df.loc[row[OBSERVABLE_ID], OBSERVABLE_FORMULA]
-            raise AssertionError(
-                f'Mismatch of observable parameter overrides for '
-                f'{row[OBSERVABLE_ID]} ({formula})'
-                f'in:\n{row}\n'
-                f'Expected {expected} but got {actual}')
-
-        # check noise parameters
-        replacements = split_parameter_replacement_list(
-            row.get(NOISE_PARAMETERS, None))
-        try:
-            expected = noise_parameters_count[row[OBSERVABLE_ID]]
-
-            # No overrides are also allowed
-            if len(replacements) != expected:
-                raise AssertionError(
-                    f'Mismatch of noise parameter overrides in:\n{row}\n'
-                    f'Expected {expected} but got {actual}')
-        except KeyError:
-            # no overrides defined, but a numerical sigma can be provided
-            # anyways
-            if not len(replacements) == 1 \
-                    or not isinstance(replacements[0], numbers.Number):
-                raise AssertionError(
-                    f'No placeholders have been specified in the noise model '
-                    f'for observable {row[OBSERVABLE_ID]}, but parameter ID '
-                    'or multiple overrides were specified in the '
-                    'noiseParameters column.')
+    undefined = ~measurement_df[OBSERVABLE_ID].isin(observable_df.index)
+    if undefined.any():
+        raise ValueError(
+            f"Observable {measurement_df[OBSERVABLE_ID][undefined].iloc[0]} "
+            "used in measurement table is not defined.")
+
+    rows, expected, actual = get_override_count_mismatches(
+        measurement_df, observable_df, 'observable')
+    if len(rows):
+        row = measurement_df.iloc[rows[0]]
+        formula = observable_df.loc[row[OBSERVABLE_ID], OBSERVABLE_FORMULA]
+        raise AssertionError(
+            f'Mismatch of observable parameter overrides for '
+            f'{row[OBSERVABLE_ID]} ({formula})'
+            f'in:\n{row}\n'
+            f'Expected {expected[0]} but got {actual[0]}')
+
+    rows, expected, actual = get_override_count_mismatches(
+        measurement_df, observable_df, 'noise')
+    if len(rows):
+        row = measurement_df.iloc[rows[0]]
+        raise AssertionError(
+            f'Mismatch of noise parameter overrides in:\n{row}\n'
+            f'Expected {expected[0]} but got {actual[0]}')
 
 
 def df_to_dict(measurement_df):
@@ -377,4 +609,106 @@ def df_to_dict(measurement_df):
     for uni_val in unique_values:
         tmp_df = measurement_df.loc[measurement_df['observableId'] == uni_val]
         measurement_dict[uni_val] = np.array(tmp_df['measurement'])
-    return  measurement_dict
\ No newline at end of file
+    return  measurement_dict
+
+
+class SharedMeasurementDict(Mapping):
+    """Measurement arrays in a memory-mapped file shared between processes.
+
+    The arrays are written once to a single file. Pickled instances only
+    carry the file name and the array layout, and on unpickling attach to
+    the file read-only, so all processes share the same physical memory.
+
+    The file is not removed automatically, the creating process should call
+    :py:meth:`unlink` once no process needs it anymore.
+
+    Attributes:
+        file_name: The memory-mapped file.
+    """
+
+    # alignment of the arrays in the file, in bytes
+    _alignment = 64
+
+    def __init__(self, file_name: str, layout: List[Tuple]):
+        """Constructor. Attach to an existing file.
+
+        Arguments:
+            file_name: The memory-mapped file
+            layout: Tuples of key, dtype string, shape and byte offset of
+                each array in the file.
+        """
+        self.file_name = file_name
+        self._layout = layout
+        self._data = {}
+        # empty files cannot be memory-mapped
+        if any(np.prod(shape) for _, _, shape, _ in layout):
+            buffer = np.memmap(file_name, dtype=np.uint8, mode='r')
+        for key, dtype, shape, offset in layout:
+            count = int(np.prod(shape))
+            if count == 0:
+                array = np.empty(shape, dtype=dtype)
+                array.flags.writeable = False
+            else:
+                array = np.frombuffer(buffer, dtype=dtype, count=count,
+                                      offset=offset).reshape(shape)
+            self._data[key] = array
+
+    @staticmethod
+    def from_dict(measurement_dict: Dict[str, np.ndarray],
+                  directory: Optional[str] = None
+                  ) -> 'SharedMeasurementDict':
+        """Write measurement arrays to a new memory-mapped file.
+
+        Arguments:
+            measurement_dict: Measurement arrays (or Series) by key, as
+                returned by :py:meth:`petab.Problem.get_measurement_dict`.
+            directory: Directory to create the file in, e.g. ``/dev/shm`` for
+                shared memory. Defaults to the system's temporary directory.
+
+        Returns:
+            The shared measurement dict.
+
+        Raises:
+            ValueError: For non-numeric arrays.
+        """
+        arrays = {key: np.ascontiguousarray(value)
+                  for key, value in measurement_dict.items()}
+        layout = []
+        offset = 0
+        for key, array in arrays.items():
+            if array.dtype.hasobject:
+                raise ValueError(f"Cannot share non-numeric measurements "
+                                 f"{key}.")
+            offset = -(-offset // SharedMeasurementDict._alignment) \
+                * SharedMeasurementDict._alignment
+            layout.append((key, array.dtype.str, array.shape, offset))
+            offset += array.nbytes
+
+        fd, file_name = tempfile.mkstemp(dir=directory, prefix='petab_',
+                                         suffix='.bin')
+        with os.fdopen(fd, 'wb') as f:
+            for (_, _, _, offset), array in zip(layout, arrays.values()):
+                f.seek(offset)
+                f.write(array.tobytes())
+        return SharedMeasurementDict(file_name, layout)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getstate__(self):
+        """Return state for pickling, without the data"""
+        return {'file_name': self.file_name, 'layout': self._layout}
+
+    def __setstate__(self, state):
+        """Attach to the file after unpickling"""
+        self.__init__(state['file_name'], state['layout'])
+
+    def unlink(self) -> None:
+        """Remove the file. Attached processes keep their mapping."""
+        os.remove(self.file_name)
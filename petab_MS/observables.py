@@ -8,7 +8,7 @@ import pandas as pd
 import re
 import sympy as sp
 
-from . import lint, core
+from . import cache, lint, core, sbml
 from .C import *  # noqa: F403
 
 
@@ -28,8 +28,7 @@ def get_observable_df(
         return observable_file
 
     if isinstance(observable_file, str):
-        observable_file = pd.read_csv(observable_file, sep='\t',
-                                      float_precision='round_trip')
+        observable_file = cache.read_table(observable_file)
 
     lint.assert_no_leading_trailing_whitespace(
         observable_file.columns.values, "observable")
@@ -59,7 +58,7 @@ def write_observable_df(df: pd.DataFrame, filename: str) -> None:
 
 def get_output_parameters(
         observable_df: pd.DataFrame,
-        sbml_model: libsbml.Model,
+        sbml_model: Union[libsbml.Model, 'sbml.ModelIndex'],
         observables: bool = True,
         noise: bool = True,
 ) -> List[str]:
@@ -70,7 +69,7 @@ def get_output_parameters(
 
     Arguments:
         observable_df: PEtab observable table
-        sbml_model: SBML model
+        sbml_model: SBML model, or its model index
         observables: Include parameters from observableFormulas
         noise: Include parameters from noiseFormulas
 
@@ -83,13 +82,14 @@ def get_output_parameters(
     if noise and NOISE_FORMULA in observable_df:
         formulas.extend(observable_df[NOISE_FORMULA])
     output_parameters = OrderedDict()
+    model_index = sbml.get_model_index(sbml_model)
 
     for formula in formulas:
         free_syms = sorted(sp.sympify(formula).free_symbols,
                            key=lambda symbol: symbol.name)
         for free_sym in free_syms:
             sym = str(free_sym)
-            if sbml_model.getElementBySId(sym) is None and sym != 'time':
+            if not model_index.has_element(sym) and sym != 'time':
                 output_parameters[sym] = None
 
     return list(output_parameters.keys())
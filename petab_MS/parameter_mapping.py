@@ -5,6 +5,7 @@ import logging
 import numbers
 import os
 import re
+import weakref
 from typing import Tuple, Dict, Union, Any, List, Optional, Iterable
 
 import libsbml
@@ -12,7 +13,7 @@ import numpy as np
 import pandas as pd
 
 from . import lint, measurements, sbml, core, observables, parameters
-from . import ENV_NUM_THREADS
+from . import ENV_NUM_THREADS, ENV_PARALLEL_BACKEND
 from .C import *  # noqa: F403
 
 
@@ -31,6 +32,10 @@ ScaleMappingDictTuple = Tuple[ScaleMappingDict, ScaleMappingDict]
 ParMappingDictQuadruple = Tuple[ParMappingDict, ParMappingDict,
                                 ScaleMappingDict, ScaleMappingDict]
 
+# Measurement tables known to pass _perform_mapping_checks, by id, with the
+#  value of allow_timepoint_specific_numeric_noise_parameters they passed with
+_checked_measurement_tables = {}
+
 
 def get_optimization_to_simulation_parameter_mapping(
         condition_df: pd.DataFrame,
@@ -42,14 +47,16 @@ def get_optimization_to_simulation_parameter_mapping(
         warn_unmapped: Optional[bool] = True,
         scaled_parameters: bool = False,
         fill_fixed_parameters: bool = True,
-        allow_timepoint_specific_numeric_noise_parameters: bool = False
-) -> List[ParMappingDictQuadruple]:
+        allow_timepoint_specific_numeric_noise_parameters: bool = False,
+        as_arrays: bool = False
+) -> Union[List[ParMappingDictQuadruple], 'ParameterMappingArrays']:
     """
     Create list of mapping dicts from PEtab-problem to SBML parameters.
 
-    Mapping can be performed in parallel. The number of threads is controlled
-    by the environment variable with the name of
-    :py:data:`petab.ENV_NUM_THREADS`.
+    Mapping can be performed in parallel. The number of threads or processes
+    is controlled by the environment variable with the name of
+    :py:data:`petab.ENV_NUM_THREADS`, the kind of workers by the environment
+    variable with the name of :py:data:`petab.ENV_PARALLEL_BACKEND`.
 
     Parameters:
         condition_df, measurement_df, parameter_df, observable_df:
@@ -74,6 +81,10 @@ def get_optimization_to_simulation_parameter_mapping(
             if the noise formula consists only of one single parameter.
             It is expected that the respective mapping is performed elsewhere.
             The value mapped to the respective parameter here is undefined.
+        as_arrays:
+            Whether to return the mapping as :py:class:`ParameterMappingArrays`
+            instead of dicts. Estimated parameters are indexed by their
+            position in ``parameter_df``.
 
     Returns:
         Parameter value and parameter scale mapping for all conditions.
@@ -91,7 +102,34 @@ def get_optimization_to_simulation_parameter_mapping(
         If no preequilibration condition is defined, the respective dicts will
         be empty. ``NaN`` is used where no mapping exists.
     """
+    mapping = _get_optimization_to_simulation_parameter_mapping(
+        condition_df=condition_df, measurement_df=measurement_df,
+        parameter_df=parameter_df, observable_df=observable_df,
+        sbml_model=sbml_model, simulation_conditions=simulation_conditions,
+        warn_unmapped=warn_unmapped, scaled_parameters=scaled_parameters,
+        fill_fixed_parameters=fill_fixed_parameters,
+        allow_timepoint_specific_numeric_noise_parameters=  # noqa: E251,E501
+        allow_timepoint_specific_numeric_noise_parameters)
+    if as_arrays:
+        return ParameterMappingArrays.from_mapping(
+            mapping, list(parameter_df.index)
+            if parameter_df is not None else None)
+    return mapping
+
 
+def _get_optimization_to_simulation_parameter_mapping(
+        condition_df: pd.DataFrame,
+        measurement_df: pd.DataFrame,
+        parameter_df: Optional[pd.DataFrame],
+        observable_df: Optional[pd.DataFrame],
+        sbml_model: Union[libsbml.Model, sbml.ModelIndex],
+        simulation_conditions: Optional[pd.DataFrame],
+        warn_unmapped: bool,
+        scaled_parameters: bool,
+        fill_fixed_parameters: bool,
+        allow_timepoint_specific_numeric_noise_parameters: bool
+) -> List[ParMappingDictQuadruple]:
+    """See :py:func:`get_optimization_to_simulation_parameter_mapping`."""
     # Ensure inputs are okay
     _perform_mapping_checks(
         measurement_df,
@@ -102,16 +140,27 @@ def get_optimization_to_simulation_parameter_mapping(
         simulation_conditions = measurements.get_simulation_conditions(
             measurement_df)
 
-    simulation_parameters = sbml.get_model_parameters(sbml_model,
+    # picklable snapshot of the model, sufficient for condition mapping
+    model_index = sbml.get_model_index(sbml_model)
+    simulation_parameters = sbml.get_model_parameters(model_index,
                                                       with_values=True)
     # Add output parameters that are not already defined in the SBML model
     if observable_df is not None:
         output_parameters = observables.get_output_parameters(
-            observable_df=observable_df, sbml_model=sbml_model)
+            observable_df=observable_df, sbml_model=model_index)
         for par_id in output_parameters:
             simulation_parameters[par_id] = np.nan
 
+    # measurement rows per condition, instead of filtering the full
+    #  table for each condition
+    condition_row_index = measurements.get_condition_row_index(
+        measurement_df)
+
     num_threads = int(os.environ.get(ENV_NUM_THREADS, 1))
+    backend = os.environ.get(ENV_PARALLEL_BACKEND, PARALLEL_BACKEND_THREAD)
+    if backend not in PARALLEL_BACKENDS:
+        raise ValueError(f"Unknown parallel backend {backend}. Must be one "
+                         f"of {PARALLEL_BACKENDS}.")
 
     # If sequential execution is requested, let's not create any
     # thread-allocation overhead
@@ -119,21 +168,31 @@ def get_optimization_to_simulation_parameter_mapping(
         mapping = map(
             _map_condition,
             _map_condition_arg_packer(
-                simulation_conditions, measurement_df, condition_df,
-                parameter_df, sbml_model, simulation_parameters, warn_unmapped,
-                scaled_parameters, fill_fixed_parameters,
+                simulation_conditions, measurement_df, condition_row_index,
+                condition_df, parameter_df, model_index,
+                simulation_parameters,
+                warn_unmapped, scaled_parameters, fill_fixed_parameters,
                 allow_timepoint_specific_numeric_noise_parameters))
         return list(mapping)
 
+    if backend == PARALLEL_BACKEND_PROCESS:
+        return _map_conditions_in_processes(
+            num_threads, simulation_conditions, measurement_df,
+            condition_row_index, condition_df, parameter_df, model_index,
+            simulation_parameters, warn_unmapped,
+            scaled_parameters, fill_fixed_parameters,
+            allow_timepoint_specific_numeric_noise_parameters)
+
     # Run multi-threaded
     from concurrent.futures import ThreadPoolExecutor
     with ThreadPoolExecutor(max_workers=num_threads) as executor:
         mapping = executor.map(
             _map_condition,
             _map_condition_arg_packer(
-                simulation_conditions, measurement_df, condition_df,
-                parameter_df, sbml_model, simulation_parameters, warn_unmapped,
-                scaled_parameters, fill_fixed_parameters,
+                simulation_conditions, measurement_df, condition_row_index,
+                condition_df, parameter_df, model_index,
+                simulation_parameters,
+                warn_unmapped, scaled_parameters, fill_fixed_parameters,
                 allow_timepoint_specific_numeric_noise_parameters))
     return list(mapping)
 
@@ -141,6 +200,7 @@ def get_optimization_to_simulation_parameter_mapping(
 def _map_condition_arg_packer(
         simulation_conditions,
         measurement_df,
+        condition_row_index,
         condition_df,
         parameter_df,
         sbml_model,
@@ -152,12 +212,90 @@ def _map_condition_arg_packer(
 ):
     """Helper function to pack extra arguments for _map_condition"""
     for _, condition in simulation_conditions.iterrows():
-        yield(condition, measurement_df, condition_df, parameter_df,
+        cur_measurement_df = measurements.get_rows_for_condition(
+            measurement_df, condition, condition_row_index)
+        _set_mapping_checks_passed(
+            cur_measurement_df,
+            allow_timepoint_specific_numeric_noise_parameters)
+        yield(condition, cur_measurement_df, condition_df, parameter_df,
               sbml_model, simulation_parameters, warn_unmapped,
               scaled_parameters, fill_fixed_parameters,
               allow_timepoint_specific_numeric_noise_parameters)
 
 
+def _map_conditions_in_processes(
+        num_processes: int,
+        simulation_conditions: pd.DataFrame,
+        measurement_df: pd.DataFrame,
+        condition_row_index: 'measurements.ConditionRowIndex',
+        condition_df: pd.DataFrame,
+        *args
+) -> List[ParMappingDictQuadruple]:
+    """Map conditions in a process pool.
+
+    The workers receive a compact snapshot of the shared tables once on
+    start-up, instead of once per condition. Tasks carry the condition and
+    the corresponding measurement rows.
+
+    Arguments:
+        num_processes: Number of worker processes.
+        simulation_conditions, measurement_df, condition_df:
+            See :py:func:`get_optimization_to_simulation_parameter_mapping`.
+        condition_row_index:
+            Output of :py:func:`petab.measurements.get_condition_row_index`
+            for `measurement_df`.
+        args:
+            Remaining arguments of :py:func:`_map_condition`, starting with
+            the parameter table.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    # only the columns relevant for mapping
+    measurement_df = measurement_df[[
+        col for col in (OBSERVABLE_ID, SIMULATION_CONDITION_ID,
+                        PREEQUILIBRATION_CONDITION_ID, OBSERVABLE_PARAMETERS,
+                        NOISE_PARAMETERS)
+        if col in measurement_df]]
+
+    # only the conditions that are simulated
+    condition_ids = set(simulation_conditions[SIMULATION_CONDITION_ID])
+    if PREEQUILIBRATION_CONDITION_ID in simulation_conditions:
+        condition_ids |= set(
+            simulation_conditions[PREEQUILIBRATION_CONDITION_ID])
+    condition_df = condition_df[condition_df.index.isin(condition_ids)]
+
+    # conditions with their unique measurement rows
+    tasks = [
+        (condition, measurements.get_rows_for_condition(
+            measurement_df, condition, condition_row_index).drop_duplicates())
+        for condition in simulation_conditions.to_dict('records')]
+    chunksize = max(1, len(tasks) // (4 * num_processes))
+    with ProcessPoolExecutor(
+            max_workers=num_processes,
+            initializer=_init_mapping_worker,
+            initargs=((condition_df, *args), )) as executor:
+        return list(executor.map(_map_condition_in_worker, tasks,
+                                 chunksize=chunksize))
+
+
+# Arguments of _map_condition shared by all conditions, in worker processes
+_mapping_worker_args = None
+
+
+def _init_mapping_worker(shared_args) -> None:
+    """Set the shared arguments in a mapping worker process."""
+    global _mapping_worker_args
+    _mapping_worker_args = shared_args
+
+
+def _map_condition_in_worker(task: Tuple[Dict, pd.DataFrame]
+                             ) -> ParMappingDictQuadruple:
+    """Helper function for condition mapping in worker processes."""
+    # subset of the measurement table checked in the main process
+    _set_mapping_checks_passed(task[1], _mapping_worker_args[-1])
+    return _map_condition((*task, *_mapping_worker_args))
+
+
 def _map_condition(packed_args):
     """Helper function for parallel condition mapping.
 
@@ -165,14 +303,11 @@ def _map_condition(packed_args):
     :py:func:`get_optimization_to_simulation_parameter_mapping`.
     """
 
-    (condition, measurement_df, condition_df, parameter_df, sbml_model,
+    (condition, cur_measurement_df, condition_df, parameter_df, sbml_model,
      simulation_parameters, warn_unmapped, scaled_parameters,
      fill_fixed_parameters,
      allow_timepoint_specific_numeric_noise_parameters) = packed_args
 
-    cur_measurement_df = measurements.get_rows_for_condition(
-        measurement_df, condition)
-
     if PREEQUILIBRATION_CONDITION_ID not in condition \
             or not isinstance(condition[PREEQUILIBRATION_CONDITION_ID], str) \
             or not condition[PREEQUILIBRATION_CONDITION_ID]:
@@ -216,7 +351,7 @@ def get_parameter_mapping_for_condition(
         condition_id: str,
         is_preeq: bool,
         cur_measurement_df: pd.DataFrame,
-        sbml_model: libsbml.Model,
+        sbml_model: Union[libsbml.Model, sbml.ModelIndex],
         condition_df: pd.DataFrame,
         parameter_df: pd.DataFrame = None,
         simulation_parameters: Optional[Dict[str, str]] = None,
@@ -242,7 +377,8 @@ def get_parameter_mapping_for_condition(
             PEtab parameter DataFrame
         sbml_model:
             The sbml model with observables and noise specified according to
-            the PEtab format used to retrieve simulation parameter IDs.
+            the PEtab format used to retrieve simulation parameter IDs, or its
+            :py:class:`petab.sbml.ModelIndex`.
         simulation_parameters:
             Model simulation parameter IDs mapped to parameter values (output
             of ``petab.sbml.get_model_parameters(.., with_values=True)``).
@@ -367,7 +503,9 @@ def _apply_condition_parameters(par_mapping: ParMappingDict,
                                 scale_mapping: ScaleMappingDict,
                                 condition_id: str,
                                 condition_df: pd.DataFrame,
-                                sbml_model: libsbml.Model) -> None:
+                                sbml_model: Union[libsbml.Model,
+                                                  sbml.ModelIndex]
+                                ) -> None:
     """Replace parameter IDs in parameter mapping dictionary by condition
     table parameter values (in-place).
 
@@ -381,9 +519,11 @@ def _apply_condition_parameters(par_mapping: ParMappingDict,
             continue
 
         # Species and compartments are handled elsewhere
-        if sbml_model.getSpecies(overridee_id) is not None:
-            continue
-        if sbml_model.getCompartment(overridee_id) is not None:
+        if isinstance(sbml_model, sbml.ModelIndex):
+            if sbml_model.is_species_or_compartment(overridee_id):
+                continue
+        elif sbml_model.getSpecies(overridee_id) is not None \
+                or sbml_model.getCompartment(overridee_id) is not None:
             continue
 
         par_mapping[overridee_id] = core.to_float_if_float(
@@ -469,6 +609,11 @@ def _perform_mapping_checks(
 ) -> None:
     """Check for PEtab features which we can't account for during parameter
     mapping."""
+    checked_with = _checked_measurement_tables.get(id(measurement_df))
+    if checked_with is not None and (
+            not checked_with
+            or allow_timepoint_specific_numeric_noise_parameters):
+        return
 
     if lint.measurement_table_has_timepoint_specific_mappings(
             measurement_df,
@@ -480,6 +625,23 @@ def _perform_mapping_checks(
             "Timepoint-specific parameter overrides currently unsupported.")
 
 
+def _set_mapping_checks_passed(
+        measurement_df: pd.DataFrame,
+        allow_timepoint_specific_numeric_noise_parameters: bool
+) -> None:
+    """Record that a measurement table passes the mapping checks, so that
+    :py:func:`_perform_mapping_checks` skips it.
+
+    Only for tables that are not modified afterwards, like the per-condition
+    subsets of a checked table. The record is removed with the table.
+    """
+    key = id(measurement_df)
+    _checked_measurement_tables[key] = \
+        allow_timepoint_specific_numeric_noise_parameters
+    weakref.finalize(measurement_df, _checked_measurement_tables.pop, key,
+                     None)
+
+
 def handle_missing_overrides(mapping_par_opt_to_par_sim: ParMappingDict,
                              warn: bool = True,
                              condition_id: str = None) -> None:
@@ -629,3 +791,161 @@ def merge_preeq_and_sim_pars(
         scale_mapping.append(scale_map_sim)
 
     return parameter_mapping, scale_mapping
+
+
+class ParameterMappingArrays:
+    """Array representation of the parameter mapping for all conditions.
+
+    Compact alternative to the list of dicts returned by
+    :py:func:`get_optimization_to_simulation_parameter_mapping`, with one row
+    per condition and one column per model parameter. All arrays have shape
+    (n_conditions, n_model_parameters).
+
+    Attributes:
+        model_parameter_ids:
+            The model parameter IDs, i.e. the columns.
+        optimization_parameter_ids:
+            The optimization parameter IDs, i.e. the entries of the vectors
+            passed to :py:meth:`apply`.
+        preeq_indices, sim_indices:
+            Position of the mapped optimization parameter in
+            `optimization_parameter_ids`, or -1 for fixed values, for
+            preequilibration and simulation, respectively.
+        preeq_values, sim_values:
+            Fixed values, ``NaN`` where mapped to optimization parameters or
+            where no mapping exists.
+        preeq_scales, sim_scales:
+            Parameter scales as codes, see
+            :py:func:`petab.parameters.get_scale_codes`.
+        has_preequilibration:
+            Whether the condition has a preequilibration, shape
+            (n_conditions, ). The preequilibration arrays are ``NaN``, resp.
+            -1, otherwise.
+    """
+
+    def __init__(self,
+                 model_parameter_ids: List[str],
+                 optimization_parameter_ids: List[str],
+                 preeq_indices: np.ndarray,
+                 sim_indices: np.ndarray,
+                 preeq_values: np.ndarray,
+                 sim_values: np.ndarray,
+                 preeq_scales: np.ndarray,
+                 sim_scales: np.ndarray,
+                 has_preequilibration: np.ndarray):
+        self.model_parameter_ids = model_parameter_ids
+        self.optimization_parameter_ids = optimization_parameter_ids
+        self.preeq_indices = preeq_indices
+        self.sim_indices = sim_indices
+        self.preeq_values = preeq_values
+        self.sim_values = sim_values
+        self.preeq_scales = preeq_scales
+        self.sim_scales = sim_scales
+        self.has_preequilibration = has_preequilibration
+
+    @staticmethod
+    def from_mapping(
+            mapping: List[ParMappingDictQuadruple],
+            optimization_parameter_ids: Optional[List[str]] = None
+    ) -> 'ParameterMappingArrays':
+        """Convert a dict-based parameter mapping.
+
+        Arguments:
+            mapping:
+                As returned by
+                :py:func:`get_optimization_to_simulation_parameter_mapping`.
+            optimization_parameter_ids:
+                The optimization parameter IDs in optimization vector order.
+                Defaults to the mapped parameter IDs, sorted.
+
+        Returns:
+            The array representation.
+
+        Raises:
+            ValueError:
+                If parameters are mapped to IDs not in
+                `optimization_parameter_ids`.
+        """
+        # model parameters in order of first occurrence
+        model_parameter_ids = list(dict.fromkeys(
+            par_id for condition_mapping in mapping
+            for par_map in condition_mapping[:2] for par_id in par_map))
+
+        if optimization_parameter_ids is None:
+            optimization_parameter_ids = sorted({
+                value for condition_mapping in mapping
+                for par_map in condition_mapping[:2]
+                for value in par_map.values() if isinstance(value, str)})
+        optimization_parameter_ids = list(optimization_parameter_ids)
+        optimization_parameter_indices = {
+            par_id: ix for ix, par_id in enumerate(optimization_parameter_ids)}
+
+        def to_arrays(par_maps, scale_maps):
+            # (n_conditions x n_model_parameters) object frames, one pass
+            par_df = pd.DataFrame.from_records(
+                par_maps, columns=model_parameter_ids)
+            scale_df = pd.DataFrame.from_records(
+                scale_maps, columns=model_parameter_ids)
+            is_mapped = np.vectorize(
+                lambda x: isinstance(x, str), otypes=[bool])(par_df.values)
+            mapped_ids = par_df.values[is_mapped]
+            unknown = set(mapped_ids) - optimization_parameter_indices.keys()
+            if unknown:
+                raise ValueError("Parameters are mapped to unknown "
+                                 f"optimization parameters {sorted(unknown)}.")
+            indices = np.full(par_df.shape, -1, dtype=int)
+            indices[is_mapped] = [
+                optimization_parameter_indices[par_id]
+                for par_id in mapped_ids]
+            values = par_df.where(~is_mapped).astype(float).values
+            scales = parameters.get_scale_codes(
+                scale_df.values.ravel()).reshape(scale_df.shape)
+            return indices, values, scales
+
+        preeq_indices, preeq_values, preeq_scales = to_arrays(
+            [condition_mapping[0] for condition_mapping in mapping],
+            [condition_mapping[2] for condition_mapping in mapping])
+        sim_indices, sim_values, sim_scales = to_arrays(
+            [condition_mapping[1] for condition_mapping in mapping],
+            [condition_mapping[3] for condition_mapping in mapping])
+
+        return ParameterMappingArrays(
+            model_parameter_ids=model_parameter_ids,
+            optimization_parameter_ids=optimization_parameter_ids,
+            preeq_indices=preeq_indices,
+            sim_indices=sim_indices,
+            preeq_values=preeq_values,
+            sim_values=sim_values,
+            preeq_scales=preeq_scales,
+            sim_scales=sim_scales,
+            has_preequilibration=np.array([
+                bool(condition_mapping[0]) for condition_mapping in mapping],
+                dtype=bool),
+        )
+
+    def apply(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the simulation parameter vectors for all conditions.
+
+        Arguments:
+            x:
+                Optimization parameter vector ordered like
+                `optimization_parameter_ids`, or an array of such vectors
+                with shape (..., n_optimization_parameters).
+
+        Returns:
+            The preequilibration and simulation parameter values, each with
+            shape (..., n_conditions, n_model_parameters). The values are on
+            the scales given by `preeq_scales` and `sim_scales`.
+        """
+        x = np.asarray(x, dtype=float)
+        return (self._gather(x, self.preeq_indices, self.preeq_values),
+                self._gather(x, self.sim_indices, self.sim_values))
+
+    @staticmethod
+    def _gather(x: np.ndarray, indices: np.ndarray, values: np.ndarray
+                ) -> np.ndarray:
+        """Fill in optimization parameters at non-negative indices."""
+        if not x.shape[-1]:
+            return np.broadcast_to(
+                values, x.shape[:-1] + values.shape).copy()
+        return np.where(indices >= 0, x[..., np.maximum(indices, 0)], values)
@@ -8,7 +8,8 @@ from typing import Iterable, Set, List, Tuple, Dict, Union
 
 import libsbml
 
-from . import lint, core, measurements, conditions, observables
+from . import (cache, lint, core, measurements, conditions, observables,
+               sbml)
 from .C import *  # noqa: F403
 
 
@@ -33,12 +34,10 @@ def get_parameter_df(
         parameter_df = parameter_file
 
     if isinstance(parameter_file, str):
-        parameter_df = pd.read_csv(parameter_file, sep='\t',
-                                   float_precision='round_trip')
+        parameter_df = cache.read_table(parameter_file)
 
     if isinstance(parameter_file, list):
-        parameter_df = pd.concat([pd.read_csv(subset_file, sep='\t',
-                                              float_precision='round_trip')
+        parameter_df = pd.concat([cache.read_table(subset_file)
                                   for subset_file in parameter_file])
         # Remove identical parameter definitions
         parameter_df.drop_duplicates(inplace=True, ignore_index=True)
@@ -178,7 +177,7 @@ def create_parameter_df(sbml_model: libsbml.Model,
 
 
 def get_required_parameters_for_parameter_table(
-        sbml_model: libsbml.Model,
+        sbml_model: Union[libsbml.Model, sbml.ModelIndex],
         condition_df: pd.DataFrame,
         observable_df: pd.DataFrame,
         measurement_df: pd.DataFrame) -> Set[str]:
@@ -186,7 +185,7 @@ def get_required_parameters_for_parameter_table(
     Get set of parameters which need to go into the parameter table
 
     Arguments:
-        sbml_model: PEtab SBML model
+        sbml_model: PEtab SBML model, or its model index
         condition_df: PEtab condition table
         observable_df: PEtab observable table
         measurement_df: PEtab measurement table
@@ -198,6 +197,8 @@ def get_required_parameters_for_parameter_table(
         that are not defined in the SBML model.
     """
 
+    model_index = sbml.get_model_index(sbml_model)
+
     # use ordered dict as proxy for ordered set
     parameter_ids = OrderedDict()
 
@@ -218,17 +219,17 @@ def get_required_parameters_for_parameter_table(
     for kwargs in [dict(observables=True, noise=False),
                    dict(observables=False, noise=True)]:
         output_parameters = observables.get_output_parameters(
-            observable_df, sbml_model, **kwargs)
+            observable_df, model_index, **kwargs)
         placeholders = observables.get_placeholders(
             observable_df, **kwargs)
         for p in output_parameters:
-            if p not in placeholders and sbml_model.getParameter(p) is None:
+            if p not in placeholders and p not in model_index.parameters:
                 parameter_ids[p] = None
 
     # Add condition table parametric overrides unless already defined in the
     # SBML model
     for p in conditions.get_parametric_overrides(condition_df):
-        if sbml_model.getParameter(p) is None:
+        if p not in model_index.parameters:
             parameter_ids[p] = None
 
     return parameter_ids.keys()
@@ -441,6 +442,111 @@ def map_unscale(
     return map(lambda x: unscale(x[0], x[1]), zip(parameters, scale_strs))
 
 
+def get_scale_codes(
+    scale_strs: Union[Iterable[str], str]
+) -> np.ndarray:
+    """Get integer codes for scales, for use in array-based computations.
+
+    The code of a scale is its position in
+    :py:data:`petab_MS.C.OBSERVABLE_TRANSFORMATIONS`, i.e. 0 for 'lin', 1 for
+    'log' and 2 for 'log10'. Empty entries are treated as 'lin'.
+
+    Arguments:
+        scale_strs:
+            Scales to encode.
+
+    Returns:
+        Array of ``uint8`` scale codes.
+    """
+    if isinstance(scale_strs, str):
+        scale_strs = [scale_strs]
+    scale_strs = pd.Series(list(scale_strs), dtype=object)
+    scale_strs[core.is_empty_array(scale_strs)] = LIN
+    codes = pd.Categorical(
+        scale_strs, categories=OBSERVABLE_TRANSFORMATIONS).codes
+    if (codes < 0).any():
+        raise ValueError("Invalid parameter scaling: "
+                         + str(scale_strs[codes < 0].iloc[0]))
+    return codes.astype(np.uint8)
+
+
+def scale_array(
+    parameters: np.ndarray,
+    scale_codes: Union[np.ndarray, Iterable[str], str]
+) -> np.ndarray:
+    """Scale the parameters, i.e. as `map_scale()`, but for arrays.
+
+    Arguments:
+        parameters:
+            Parameters to be scaled, with parameters along the last axis, e.g.
+            of shape (n_samples, n_parameters).
+        scale_codes:
+            Scales to apply, one per parameter, as codes (see
+            :py:func:`get_scale_codes`) or strings. Broadcast if a single
+            string.
+
+    Returns:
+        The scaled parameters.
+    """
+    return _transform_array(parameters, scale_codes, [np.log, np.log10])
+
+
+def unscale_array(
+    parameters: np.ndarray,
+    scale_codes: Union[np.ndarray, Iterable[str], str]
+) -> np.ndarray:
+    """Unscale the parameters, i.e. as `map_unscale()`, but for arrays.
+
+    Arguments:
+        parameters:
+            Parameters to be unscaled, with parameters along the last axis,
+            e.g. of shape (n_samples, n_parameters).
+        scale_codes:
+            Scales that the parameters are currently on, one per parameter, as
+            codes (see :py:func:`get_scale_codes`) or strings. Broadcast if a
+            single string.
+
+    Returns:
+        The unscaled parameters.
+    """
+    return _transform_array(parameters, scale_codes,
+                            [np.exp, lambda x: np.power(10., x)])
+
+
+def _transform_array(
+    parameters: np.ndarray,
+    scale_codes: Union[np.ndarray, Iterable[str], str],
+    transforms: List
+) -> np.ndarray:
+    """Apply the log- and log10-transforms to the respective columns.
+
+    Arguments:
+        parameters: See :py:func:`scale_array`.
+        scale_codes: See :py:func:`scale_array`.
+        transforms: The transforms for 'log' and 'log10' scaled parameters.
+
+    Returns:
+        The transformed parameters, as a new array.
+    """
+    parameters = np.array(parameters, dtype=float)
+    scale_codes = np.asarray(scale_codes)
+    if scale_codes.dtype.kind not in 'iu':
+        scale_codes = get_scale_codes(scale_codes.ravel()) \
+            if scale_codes.ndim else get_scale_codes(str(scale_codes))
+    if scale_codes.size == 1:
+        scale_codes = np.full(parameters.shape[-1:], scale_codes.ravel()[0])
+
+    for code, transform in zip(
+            (OBSERVABLE_TRANSFORMATIONS.index(LOG),
+             OBSERVABLE_TRANSFORMATIONS.index(LOG10)), transforms):
+        columns = np.flatnonzero(scale_codes == code)
+        if len(columns) == len(scale_codes):
+            parameters = transform(parameters)
+        elif len(columns):
+            parameters[..., columns] = transform(parameters[..., columns])
+    return parameters
+
+
 def normalize_parameter_df(parameter_df: pd.DataFrame) -> pd.DataFrame:
     """Add missing columns and fill in default values."""
     df = parameter_df.copy(deep=True)
@@ -471,3 +577,111 @@ def normalize_parameter_df(parameter_df: pd.DataFrame) -> pd.DataFrame:
                 df.loc[irow, prior_par_col] = f'{lb};{ub}'
 
     return df
+
+
+class ParameterVectorView:
+    """Cached array view on the parameter vector of a parameter table.
+
+    All derived arrays are computed on first access and cached. They are
+    read-only. The view does not track changes of the parameter table, so a
+    new view has to be created after the table was modified.
+
+    Attributes:
+        parameter_df: The parameter table.
+        ids: The parameter IDs.
+    """
+
+    def __init__(self, parameter_df: pd.DataFrame):
+        self.parameter_df = parameter_df
+        self.ids = self._freeze(np.array(parameter_df.index.values))
+        self._cache = {}
+
+    @staticmethod
+    def _freeze(values: np.ndarray) -> np.ndarray:
+        """Make array read-only, as it is shared between callers."""
+        values.flags.writeable = False
+        return values
+
+    def _get_cached(self, key, compute) -> np.ndarray:
+        """Get cached array, compute if necessary."""
+        if key not in self._cache:
+            self._cache[key] = self._freeze(compute())
+        return self._cache[key]
+
+    @property
+    def scales(self) -> np.ndarray:
+        """Parameter scales, 'lin' if not specified."""
+        def compute():
+            if PARAMETER_SCALE not in self.parameter_df:
+                return np.full(len(self.ids), LIN, dtype=object)
+            scales = self.parameter_df[PARAMETER_SCALE].values.copy()
+            scales[core.is_empty_array(
+                self.parameter_df[PARAMETER_SCALE])] = LIN
+            return scales
+        return self._get_cached('scales', compute)
+
+    @property
+    def scale_codes(self) -> np.ndarray:
+        """Parameter scales as codes, see :py:func:`get_scale_codes`."""
+        return self._get_cached(
+            'scale_codes', lambda: get_scale_codes(self.scales))
+
+    @property
+    def free_indices(self) -> np.ndarray:
+        """Indices of estimated parameters."""
+        return self._get_cached('free_indices', lambda: np.flatnonzero(
+            self.parameter_df[ESTIMATE].values != 0))
+
+    @property
+    def fixed_indices(self) -> np.ndarray:
+        """Indices of non-estimated parameters."""
+        return self._get_cached('fixed_indices', lambda: np.flatnonzero(
+            self.parameter_df[ESTIMATE].values == 0))
+
+    def get_values(self, column: str, scaled: bool = False) -> np.ndarray:
+        """Get a numeric column of the parameter table.
+
+        Arguments:
+            column:
+                The column, e.g. ``nominalValue``, ``lowerBound`` or
+                ``upperBound``.
+            scaled:
+                Whether to scale the values according to the parameter scale,
+                or return them on linear scale.
+
+        Returns:
+            The values, in parameter vector order.
+        """
+        if scaled:
+            return self._get_cached((column, True), lambda: scale_array(
+                self.get_values(column), self.scale_codes))
+        # copy, the table must stay writable
+        return self._get_cached((column, False), lambda: np.array(
+            self.parameter_df[column].values, dtype=float))
+
+    def apply_mask(self, v: np.ndarray, free: bool = True,
+                   fixed: bool = True) -> np.ndarray:
+        """Get the entries of free or fixed parameters of a vector.
+
+        Arguments:
+            v:
+                The full parameter vector, or an array with parameters along
+                the last axis.
+            free:
+                Whether to return free parameters, i.e. parameters to
+                estimate.
+            fixed:
+                Whether to return fixed parameters, i.e. parameters not to
+                estimate.
+
+        Returns:
+            The reduced vector.
+        """
+        v = np.asarray(v)
+        if free and fixed:
+            return v
+        if free:
+            return v[..., self.free_indices]
+        if fixed:
+            return v[..., self.fixed_indices]
+        return v[..., []]
@@ -64,6 +64,12 @@ def parse_cli_args():
                             'Specifying -[smcp] will override defaults')
     parser.add_argument('-d', '--directory', dest='directory',
                         default=os.getcwd())
+    parser.add_argument('--cache-dir', dest='cache_dir',
+                        default=petab_MS.get_cache_dir(),
+                        help='Cache directory for parsed tables and lint '
+                             'results. Only checks whose inputs changed '
+                             'since the last run are rerun. Defaults to '
+                             f'${petab_MS.ENV_CACHE_DIR}.')
     args = parser.parse_args()
 
     if args.model_name:
@@ -134,7 +140,8 @@ def main():
             #  problem = petab.CompositeProblem.from_yaml(args.yaml_file_name)
             return
 
-        problem = petab_MS.Problem.from_yaml(args.yaml_file_name)
+        problem = petab_MS.Problem.from_yaml(args.yaml_file_name,
+                                             cache_dir=args.cache_dir)
 
     else:
         logger.debug('Looking for...')
@@ -150,18 +157,19 @@ def main():
             logger.debug(f'\tParameter table: {args.parameter_file_name}')
 
         try:
-            problem = petab.Problem.from_files(
-                sbml_file=args.sbml_file_name,
+            problem = petab_MS.Problem.from_files(
+                model_file=args.sbml_file_name,
                 condition_file=args.condition_file_name,
                 measurement_file=args.measurement_file_name,
                 parameter_file=args.parameter_file_name,
-                observable_files=args.observable_file_name
+                observable_files=args.observable_file_name,
+                cache_dir=args.cache_dir
             )
         except FileNotFoundError as e:
             logger.error(e)
             sys.exit(1)
 
-    ret = petab_MS.lint.lint_problem(problem)
+    ret = petab_MS.lint.lint_problem(problem, cache_dir=args.cache_dir)
     sys.exit(ret)
 
 
@@ -0,0 +1,210 @@
+"""Functions related to parameter prior densities"""
+
+import math
+from typing import Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from . import parameters
+from .C import *  # noqa: F403
+
+
+class PriorDensity:
+    """Joint prior density of the estimated parameters of a parameter table.
+
+    The density is evaluated for parameter vectors on parameter scale. For
+    prior types not defined on parameter scale, this includes the Jacobian
+    of the parameter scale transformation. Priors are truncated to the
+    parameter bounds and renormalized accordingly.
+
+    Parameters with priors of the same type are evaluated together, for all
+    samples at once.
+
+    Attributes:
+        parameter_ids: IDs of the estimated parameters, i.e. the columns of
+            the evaluated arrays.
+        scale_codes: Parameter scales, see
+            :py:func:`petab.parameters.get_scale_codes`.
+        lb_scaled, ub_scaled: Parameter bounds on parameter scale.
+    """
+
+    # prior type -> base distribution, space of the base distribution
+    #  (LIN: linear parameter values, LOG: natural logarithm of the linear
+    #  parameter values, None: parameter scale)
+    _prior_types = {
+        UNIFORM: (UNIFORM, LIN),
+        PARAMETER_SCALE_UNIFORM: (UNIFORM, None),
+        NORMAL: (NORMAL, LIN),
+        LOG_NORMAL: (NORMAL, LOG),
+        PARAMETER_SCALE_NORMAL: (NORMAL, None),
+        LAPLACE: (LAPLACE, LIN),
+        LOG_LAPLACE: (LAPLACE, LOG),
+        PARAMETER_SCALE_LAPLACE: (LAPLACE, None),
+    }
+
+    def __init__(self, parameter_df: pd.DataFrame, mode: str = OBJECTIVE):
+        """Constructor.
+
+        Arguments:
+            parameter_df: PEtab parameter table
+            mode: 'objective' or 'initialization' prior
+        """
+        self.parameter_ids = list(
+            parameter_df.index[parameter_df[ESTIMATE] == 1])
+        prior_list = parameters.get_priors_from_df(parameter_df, mode=mode)
+
+        for prior_type, *_ in prior_list:
+            if prior_type not in self._prior_types:
+                raise NotImplementedError(
+                    f"Parameter priors of type {prior_type} are not "
+                    "implemented.")
+
+        self.scale_codes = parameters.get_scale_codes(
+            [scaling for _, _, scaling, _ in prior_list])
+        bounds = np.array([bounds for *_, bounds in prior_list],
+                          dtype=float).reshape(-1, 2)
+        self.lb_scaled = parameters.scale_array(bounds[:, 0], self.scale_codes)
+        self.ub_scaled = parameters.scale_array(bounds[:, 1], self.scale_codes)
+        prior_parameters = np.array(
+            [prior_pars[:2] for _, prior_pars, _, _ in prior_list],
+            dtype=float).reshape(-1, 2)
+
+        # (base distribution, space, columns, first and second prior
+        #  parameter, log of the prior mass within the bounds), by prior type
+        prior_types = pd.Series(
+            [prior_type for prior_type, *_ in prior_list], dtype=object)
+        self._groups = []
+        for prior_type, columns in prior_types.groupby(
+                prior_types).indices.items():
+            distribution, space = self._prior_types[prior_type]
+            a, b = prior_parameters[columns, 0], prior_parameters[columns, 1]
+            if space is None:
+                lb, ub = self.lb_scaled[columns], self.ub_scaled[columns]
+            else:
+                lb, ub = bounds[columns, 0], bounds[columns, 1]
+                if space == LOG:
+                    with np.errstate(divide='ignore'):
+                        lb, ub = np.log(lb), np.log(ub)
+            log_mass = np.log(_cdf(distribution, ub, a, b)
+                              - _cdf(distribution, lb, a, b))
+            self._groups.append(
+                (distribution, space, columns, a, b, log_mass))
+
+    def __call__(self, x: np.ndarray) -> Union[float, np.ndarray]:
+        """See :py:meth:`logpdf`."""
+        return self.logpdf(x)
+
+    def logpdf(self, x: np.ndarray) -> Union[float, np.ndarray]:
+        """Evaluate the joint log-prior.
+
+        Arguments:
+            x: Parameter vector on parameter scale, ordered like
+                `parameter_ids`, or an array of such vectors with shape
+                (n_samples, n_parameters).
+
+        Returns:
+            The log-prior, one value per sample. ``-inf`` outside the
+            parameter bounds.
+        """
+        x = np.asarray(x, dtype=float)
+        logpdfs = np.zeros(x.shape)
+        for distribution, space, columns, a, b, log_mass in self._groups:
+            y, _, log_jacobian, _ = self._to_base(
+                x[..., columns], self.scale_codes[columns], space)
+            logpdfs[..., columns] = _logpdf(distribution, y, a, b) \
+                + log_jacobian - log_mass
+        logpdfs[~self._in_bounds(x)] = -np.inf
+        return logpdfs.sum(axis=-1)
+
+    def gradient(self, x: np.ndarray) -> np.ndarray:
+        """Evaluate the gradient of the joint log-prior.
+
+        Arguments:
+            x: See :py:meth:`logpdf`.
+
+        Returns:
+            The derivatives of the log-prior with respect to the parameters
+            on parameter scale, in the shape of `x`. ``NaN`` outside the
+            parameter bounds.
+        """
+        x = np.asarray(x, dtype=float)
+        gradient = np.zeros(x.shape)
+        for distribution, space, columns, a, b, _ in self._groups:
+            y, dy_dx, _, dlog_jacobian_dx = self._to_base(
+                x[..., columns], self.scale_codes[columns], space)
+            gradient[..., columns] = \
+                _dlogpdf(distribution, y, a, b) * dy_dx + dlog_jacobian_dx
+        gradient[~self._in_bounds(x)] = np.nan
+        return gradient
+
+    def _in_bounds(self, x: np.ndarray) -> np.ndarray:
+        """Check parameter bounds, elementwise."""
+        return (x >= self.lb_scaled) & (x <= self.ub_scaled)
+
+    @staticmethod
+    def _to_base(x: np.ndarray, scale_codes: np.ndarray, space: str
+                 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Transform parameters to the space of the base distribution.
+
+        Returns:
+            The transformed values `y`, the derivative ``dy/dx``, the log
+            Jacobian ``log |dy/dx|`` and its derivative with respect to `x`.
+        """
+        if space is None:
+            return x, np.ones(x.shape), np.zeros(x.shape), np.zeros(x.shape)
+
+        is_lin = scale_codes == OBSERVABLE_TRANSFORMATIONS.index(LIN)
+        is_log = scale_codes == OBSERVABLE_TRANSFORMATIONS.index(LOG)
+        ln10 = np.log(10)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if space == LIN:
+                # linear parameter values
+                y = parameters.unscale_array(x, scale_codes)
+                dy_dx = np.where(is_lin, 1., np.where(is_log, y, y * ln10))
+                dlog_jacobian_dx = np.broadcast_to(
+                    np.where(is_lin, 0., np.where(is_log, 1., ln10)),
+                    x.shape)
+            else:
+                # log of linear parameter values
+                y = np.where(is_lin, np.log(x),
+                             np.where(is_log, x, x * ln10))
+                dy_dx = np.where(is_lin, 1 / x,
+                                 np.where(is_log, 1., ln10))
+                dlog_jacobian_dx = np.where(is_lin, -1 / x, 0.)
+            log_jacobian = np.log(np.abs(dy_dx))
+        return y, dy_dx, log_jacobian, dlog_jacobian_dx
+
+
+def _logpdf(distribution: str, y: np.ndarray, a: np.ndarray, b: np.ndarray
+            ) -> np.ndarray:
+    """Log-density of the base distribution with prior parameters a, b."""
+    if distribution == UNIFORM:
+        return np.where((y >= a) & (y <= b), -np.log(b - a), -np.inf)
+    if distribution == NORMAL:
+        return -0.5 * np.log(2 * np.pi) - np.log(b) \
+            - 0.5 * ((y - a) / b) ** 2
+    return -np.log(2 * b) - np.abs(y - a) / b
+
+
+def _dlogpdf(distribution: str, y: np.ndarray, a: np.ndarray, b: np.ndarray
+             ) -> np.ndarray:
+    """Derivative of the log-density of the base distribution."""
+    if distribution == UNIFORM:
+        return np.zeros(np.broadcast(y, a).shape)
+    if distribution == NORMAL:
+        return -(y - a) / b ** 2
+    return -np.sign(y - a) / b
+
+
+def _cdf(distribution: str, y: np.ndarray, a: np.ndarray, b: np.ndarray
+         ) -> np.ndarray:
+    """Cumulative distribution function of the base distribution."""
+    if distribution == UNIFORM:
+        return np.clip((y - a) / (b - a), 0, 1)
+    if distribution == NORMAL:
+        erf = np.vectorize(math.erf, otypes=[float])
+        return 0.5 * (1 + erf((y - a) / (b * np.sqrt(2))))
+    with np.errstate(over='ignore'):
+        return np.where(y < a, 0.5 * np.exp((y - a) / b),
+                        1 - 0.5 * np.exp(-(y - a) / b))
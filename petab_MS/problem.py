@@ -1,14 +1,17 @@
 """PEtab Problem class"""
 
+import functools
 import os
 import tempfile
+from collections.abc import Mapping
 from warnings import warn
 import numbers
 import pandas as pd
 import libsbml
 from typing import Optional, List, Union, Dict, Iterable, Callable
-from . import (parameter_mapping, measurements, conditions, parameters,
-               sampling, sbml, yaml, core, observables, format_version)
+from . import (cache, parameter_mapping, measurements, conditions,
+               parameters, sampling, sbml, yaml, core, observables,
+               format_version)
 from .C import *  # noqa: F403
 from . import observables
 from . import obcetive_function as obj_fun
@@ -34,7 +37,10 @@ class Problem:
         visualization_df: PEtab visualization table
         sbml_reader: Stored to keep object alive.
         sbml_document: Stored to keep object alive.
-        sbml_model: PEtab SBML model
+        sbml_model: PEtab SBML model. If `model_file` is an SBML file, or
+            after unpickling, it is only loaded on first access.
+        model_index: Cached summary of the SBML model, see
+            :py:class:`petab.sbml.ModelIndex`.
     """
 
     def __init__(self,
@@ -44,41 +50,143 @@ class Problem:
                  parameter_df: pd.DataFrame = None,
                  visualization_df: pd.DataFrame = None,
                  observable_df: pd.DataFrame = None,
-                 objective_callable: Callable = None):
+                 objective_callable: Callable = None,
+                 sbml_model: libsbml.Model = None,
+                 sbml_reader: libsbml.SBMLReader = None,
+                 sbml_document: libsbml.SBMLDocument = None):
 
         self.condition_df: Optional[pd.DataFrame] = condition_df
         self.measurement_df: Optional[pd.DataFrame] = measurement_df
-        self.parameter_df: Optional[pd.DataFrame] = parameter_df
+        self._parameter_view = None
+        self.parameter_df = parameter_df
         self.visualization_df: Optional[pd.DataFrame] = visualization_df
         self.observable_df: Optional[pd.DataFrame] = observable_df
         self.model_file = model_file
         self.objective_callable = objective_callable
+        # SBML string of a model that has not been rebuilt after unpickling
+        self._sbml_string: Optional[str] = None
+        # SBML file of a model that has not been loaded yet
+        self._sbml_file: Optional[str] = None
+        self._model_index = None
+        self.sbml_reader: Optional[libsbml.SBMLReader] = sbml_reader
+        self.sbml_document: Optional[libsbml.SBMLDocument] = sbml_document
+        self.sbml_model: Optional[libsbml.Model] = sbml_model
+        if sbml_model is None and sbml.is_sbml_file(model_file):
+            self._sbml_file = model_file
 
 
+    @property
+    def parameter_df(self) -> Optional[pd.DataFrame]:
+        """PEtab parameter table"""
+        return self._parameter_df
+
+    @parameter_df.setter
+    def parameter_df(self, parameter_df: Optional[pd.DataFrame]):
+        self._parameter_df = parameter_df
+        self.invalidate_parameter_view()
+
+    @property
+    def parameter_view(self) -> 'parameters.ParameterVectorView':
+        """Cached array view on the parameter table parameter vector.
+
+        Renewed when `parameter_df` is reassigned. After modifying
+        `parameter_df` in place, call :py:meth:`invalidate_parameter_view`.
+        """
+        if self._parameter_view is None:
+            self._parameter_view = parameters.ParameterVectorView(
+                self.parameter_df)
+        return self._parameter_view
+
+    def invalidate_parameter_view(self) -> None:
+        """Discard cached values derived from the parameter table."""
+        self._parameter_view = None
+
+    @property
+    def sbml_model(self) -> Optional[libsbml.Model]:
+        """PEtab SBML model"""
+        self._load_sbml()
+        return self._sbml_model
+
+    @sbml_model.setter
+    def sbml_model(self, sbml_model: Optional[libsbml.Model]):
+        # replaces any model not loaded yet, without parsing it
+        self._sbml_string = self._sbml_file = None
+        self._sbml_model = sbml_model
+        self._model_index = None
+
+    @property
+    def sbml_document(self) -> Optional[libsbml.SBMLDocument]:
+        """SBML document, stored to keep the model alive"""
+        self._load_sbml()
+        return self._sbml_document
+
+    @sbml_document.setter
+    def sbml_document(self, sbml_document: Optional[libsbml.SBMLDocument]):
+        self._load_sbml()
+        self._sbml_document = sbml_document
+
+    @property
+    def sbml_reader(self) -> Optional[libsbml.SBMLReader]:
+        """SBML reader, stored to keep the model alive"""
+        self._load_sbml()
+        return self._sbml_reader
+
+    @sbml_reader.setter
+    def sbml_reader(self, sbml_reader: Optional[libsbml.SBMLReader]):
+        self._load_sbml()
+        self._sbml_reader = sbml_reader
+
+    @property
+    def model_index(self) -> Optional['sbml.ModelIndex']:
+        """Cached summary of the SBML model.
+
+        Shipped along when pickling, so that it is available in worker
+        processes without parsing the SBML model. Renewed when `sbml_model`
+        is reassigned. After modifying `sbml_model` in place, call
+        :py:meth:`invalidate_model_index`.
+        """
+        if self._model_index is None and self.sbml_model is not None:
+            self._model_index = sbml.ModelIndex.from_sbml_model(
+                self.sbml_model)
+        return self._model_index
+
+    def invalidate_model_index(self) -> None:
+        """Discard the cached summary of the SBML model."""
+        self._model_index = None
+
+    def _load_sbml(self) -> None:
+        """Load the SBML model if it has not been loaded yet."""
+        if self._sbml_string is not None:
+            self._sbml_reader, self._sbml_document, self._sbml_model = \
+                sbml.load_sbml_from_string(self._sbml_string)
+        elif self._sbml_file is not None:
+            self._sbml_reader, self._sbml_document, self._sbml_model = \
+                sbml.get_sbml_model(self._sbml_file)
+        self._sbml_string = self._sbml_file = None
+
     def __getstate__(self):
-        """Return state for pickling"""
+        """Return state for pickling
+
+        The SBML model is shipped as string along with the model index. It
+        is only parsed again when accessed after unpickling.
+        """
         state = self.__dict__.copy()
 
         # libsbml stuff cannot be serialized directly
-        if self.sbml_model:
-            sbml_document = self.sbml_model.getSBMLDocument()
+        if self._sbml_model is not None:
+            sbml_document = self._sbml_model.getSBMLDocument()
             sbml_writer = libsbml.SBMLWriter()
-            state['sbml_string'] = sbml_writer.writeSBMLToString(sbml_document)
+            state['_sbml_string'] = \
+                sbml_writer.writeSBMLToString(sbml_document)
+            state['_model_index'] = self.model_index
 
-        exclude = ['sbml_reader', 'sbml_document', 'sbml_model']
-        for key in exclude:
-            state.pop(key)
+        for key in ['_sbml_reader', '_sbml_document', '_sbml_model']:
+            state[key] = None
 
         return state
 
     def __setstate__(self, state):
         """Set state after unpickling"""
-        # load SBML model from pickled string
-        sbml_string = state.pop('sbml_string', None)
-        if sbml_string:
-            self.sbml_reader, self.sbml_document, self.sbml_model = \
-                sbml.load_sbml_from_string(sbml_string)
-
         self.__dict__.update(state)
 
     @staticmethod
@@ -87,7 +195,9 @@ class Problem:
                    measurement_file: Union[str, Iterable[str]] = None,
                    parameter_file: Union[str, List[str]] = None,
                    observable_files: Union[str, Iterable[str]] = None,
-                   objective_file: str = None
+                   objective_file: str = None,
+                   lazy_measurements: bool = False,
+                   cache_dir: Optional[str] = None
                    ) -> 'Problem':
         """
         Factory method to load model and tables from files.
@@ -98,26 +208,36 @@ class Problem:
             parameter_file: PEtab parameter table
             observable_files: PEtab observables tables
             objective_file: PEtab objective function Callable
+            lazy_measurements: Read measurements from external csv files
+                only on first access, see
+                :py:class:`petab.measurements.LazyMeasurementDict`.
+            cache_dir: Directory of the on-disk cache of parsed tables. If
+                ``None``, the cache is only used if enabled via the
+                environment variable with the name of
+                :py:data:`petab.ENV_CACHE_DIR`. See :py:mod:`petab.cache`.
 
         """
 
         condition_df = measurement_df = parameter_df = None
 
-        if condition_file:
-            condition_df = conditions.get_condition_df(condition_file)
+        with cache.table_cache(cache_dir):
+            if condition_file:
+                condition_df = conditions.get_condition_df(condition_file)
 
-        if measurement_file:
-            # If there are multiple tables, we will merge them
-            measurement_df = core.concat_tables(
-                measurement_file, measurements.get_measurement_df)
+            if measurement_file:
+                # If there are multiple tables, we will merge them
+                measurement_df = core.concat_tables(
+                    measurement_file,
+                    functools.partial(measurements.get_measurement_df,
+                                      lazy=lazy_measurements))
 
-        if parameter_file:
-            parameter_df = parameters.get_parameter_df(parameter_file)
+            if parameter_file:
+                parameter_df = parameters.get_parameter_df(parameter_file)
 
-        if observable_files:
-            # If there are multiple tables, we will merge them
-            observable_df = core.concat_tables(
-                observable_files, observables.get_observable_df)
+            if observable_files:
+                # If there are multiple tables, we will merge them
+                observable_df = core.concat_tables(
+                    observable_files, observables.get_observable_df)
         if objective_file:
             ojbective_callable = obj_fun.get_objective_function(objective_file)
 
@@ -130,12 +250,16 @@ class Problem:
                        )
 
     @staticmethod
-    def from_yaml(yaml_config: Union[Dict, str]) -> 'Problem':
+    def from_yaml(yaml_config: Union[Dict, str],
+                  lazy_measurements: bool = False,
+                  cache_dir: Optional[str] = None) -> 'Problem':
         """
         Factory method to load model and tables as specified by YAML file.
 
         Arguments:
             yaml_config: PEtab configuration as dictionary or YAML file name
+            lazy_measurements: See :py:meth:`Problem.from_files`.
+            cache_dir: See :py:meth:`Problem.from_files`.
         """
         if isinstance(yaml_config, str):
             path_prefix = os.path.dirname(yaml_config)
@@ -178,7 +302,9 @@ class Problem:
                 os.path.join(path_prefix, f)
                 for f in problem0.get(OBSERVABLE_FILES, [])],
             objective_file=os.path.join(path_prefix,
-                                        problem0[OBJECTIVE_FILE][0])
+                                        problem0[OBJECTIVE_FILE][0]),
+            lazy_measurements=lazy_measurements,
+            cache_dir=cache_dir
         )
 
     @staticmethod
@@ -358,7 +484,7 @@ class Problem:
 
     def get_model_parameters(self):
         """See :py:func:`petab.sbml.get_model_parameters`"""
-        return sbml.get_model_parameters(self.sbml_model)
+        return sbml.get_model_parameters(self.model_index)
 
     def get_observables(self, remove: bool = False):
         """
@@ -401,7 +527,7 @@ class Problem:
         """
         Return dictionary of measurement as dictionary
         """
-        if isinstance(self.measurement_df, dict):
+        if isinstance(self.measurement_df, Mapping):
             return self.measurement_df
         keys = set(self.measurement_df.observableId)
         n = int(len(self.measurement_df.measurement)/len(keys))
@@ -409,6 +535,30 @@ class Problem:
                   for i in range(0, len(self.measurement_df.measurement), n)]
         return dict(zip(keys, [val for val in values]))
 
+    def share_measurements(self, directory: Optional[str] = None
+                           ) -> 'measurements.SharedMeasurementDict':
+        """Move the measurements to a memory-mapped file.
+
+        Replaces `measurement_df` by a
+        :py:class:`petab.measurements.SharedMeasurementDict` of the
+        measurement dict. When pickled, e.g. to be sent to worker processes,
+        the problem then only carries the file name, and all workers share
+        read-only views on the same memory.
+
+        Arguments:
+            directory: Directory to create the file in, e.g. ``/dev/shm``.
+                Defaults to the system's temporary directory.
+
+        Returns:
+            The shared measurement dict. Call its ``unlink`` method once the
+            workers are done.
+        """
+        if not isinstance(self.measurement_df,
+                          measurements.SharedMeasurementDict):
+            self.measurement_df = measurements.SharedMeasurementDict.from_dict(
+                self.get_measurement_dict(), directory=directory)
+        return self.measurement_df
+
     def _apply_mask(self, v: List, free: bool = True, fixed: bool = True):
         """Apply mask of only free or only fixed values.
 
@@ -430,9 +580,9 @@ class Problem:
         if not free and not fixed:
             return []
         if not free:
-            return [v[ix] for ix in self.x_fixed_indices]
+            return [v[ix] for ix in self.parameter_view.fixed_indices]
         if not fixed:
-            return [v[ix] for ix in self.x_free_indices]
+            return [v[ix] for ix in self.parameter_view.free_indices]
         return v
 
     def get_x_ids(self, free: bool = True, fixed: bool = True):
@@ -451,7 +601,7 @@ class Problem:
         v:
             The parameter ids.
         """
-        v = list(self.parameter_df.index.values)
+        v = self.parameter_view.ids.tolist()
         return self._apply_mask(v, free=free, fixed=fixed)
 
     @property
@@ -489,10 +639,8 @@ class Problem:
         v:
             The parameter nominal values.
         """
-        v = list(self.parameter_df[NOMINAL_VALUE])
-        if scaled:
-            v = list(parameters.map_scale(
-                v, self.parameter_df[PARAMETER_SCALE]))
+        v = self.parameter_view.get_values(
+            NOMINAL_VALUE, scaled=scaled).tolist()
         return self._apply_mask(v, free=free, fixed=fixed)
 
     def get_x_nominal_dict(self, free: bool = True, fixed: bool = True,
@@ -515,10 +663,8 @@ class Problem:
         v:
             The parameter nominal values as dict
         """
-        v = list(self.parameter_df[NOMINAL_VALUE])
-        if scaled:
-            v = list(parameters.map_scale(
-                v, self.parameter_df[PARAMETER_SCALE]))
+        v = self.parameter_view.get_values(
+            NOMINAL_VALUE, scaled=scaled).tolist()
         par_dict = dict(zip(self.x_ids,
                         self._apply_mask(v, free=free, fixed=fixed)))
         return par_dict
@@ -575,10 +721,8 @@ class Problem:
         v:
             The lower parameter bounds.
         """
-        v = list(self.parameter_df[LOWER_BOUND])
-        if scaled:
-            v = list(parameters.map_scale(
-                v, self.parameter_df[PARAMETER_SCALE]))
+        v = self.parameter_view.get_values(
+            LOWER_BOUND, scaled=scaled).tolist()
         return self._apply_mask(v, free=free, fixed=fixed)
 
     @property
@@ -611,10 +755,8 @@ class Problem:
         v:
             The upper parameter bounds.
         """
-        v = list(self.parameter_df[UPPER_BOUND])
-        if scaled:
-            v = list(parameters.map_scale(
-                v, self.parameter_df[PARAMETER_SCALE]))
+        v = self.parameter_view.get_values(
+            UPPER_BOUND, scaled=scaled).tolist()
         return self._apply_mask(v, free=free, fixed=fixed)
 
     @property
@@ -630,14 +772,12 @@ class Problem:
     @property
     def x_free_indices(self) -> List[int]:
         """Parameter table estimated parameter indices."""
-        estimated = list(self.parameter_df[ESTIMATE])
-        return [j for j, val in enumerate(estimated) if val != 0]
+        return self.parameter_view.free_indices.tolist()
 
     @property
     def x_fixed_indices(self) -> List[int]:
         """Parameter table non-estimated parameter indices."""
-        estimated = list(self.parameter_df[ESTIMATE])
-        return [j for j, val in enumerate(estimated) if val == 0]
+        return self.parameter_view.fixed_indices.tolist()
 
     def get_simulation_conditions_from_measurement_df(self):
         """See petab.get_simulation_conditions"""
@@ -659,7 +799,7 @@ class Problem:
                 self.measurement_df,
                 self.parameter_df,
                 self.observable_df,
-                self.sbml_model,
+                self.model_index,
                 warn_unmapped=warn_unmapped,
                 scaled_parameters=scaled_parameters,
                 allow_timepoint_specific_numeric_noise_parameters=  # noqa: E251,E501
@@ -3,7 +3,7 @@
 import numpy as np
 import pandas as pd
 
-from typing import Tuple
+from typing import Tuple, Union
 
 from . import parameters
 from .C import *  # noqa: F403
@@ -81,27 +81,164 @@ def sample_from_prior(prior: Tuple[str, list, str, list],
     return clip_to_bounds(sp)
 
 
-def sample_parameter_startpoints(parameter_df: pd.DataFrame,
-                                 n_starts: int = 100,
-                                 seed: int = None) -> np.array:
+def sample_parameter_startpoints(
+        parameter_df: pd.DataFrame,
+        n_starts: int = 100,
+        seed: Union[int, np.random.Generator] = None) -> np.array:
     """Create numpy.array with starting points for an optimization
 
     Arguments:
         parameter_df: PEtab parameter DataFrame
         n_starts: Number of points to be sampled
-        seed: Random number generator seed (see numpy.random.seed)
+        seed: Random number generator seed or generator
+            (see numpy.random.default_rng)
 
     Returns:
         Array of sampled starting points with dimensions
         n_startpoints x n_optimization_parameters
     """
-    if seed is not None:
-        np.random.seed(seed)
+    return PriorSampler(parameter_df, mode=INITIALIZATION).sample(
+        n_starts, rng=seed)
 
-    # get types and parameters of priors from dataframe
-    prior_list = parameters.get_priors_from_df(
-        parameter_df, mode=INITIALIZATION)
 
-    startpoints = [sample_from_prior(prior, n_starts) for prior in prior_list]
+class PriorSampler:
+    """Batched sampling from the priors of a parameter table.
 
-    return np.array(startpoints).T
+    Parameters with priors of the same type are drawn together as one
+    matrix. Samples are on parameter scale and clipped to the parameter
+    bounds, as in :py:func:`sample_from_prior`.
+
+    Attributes:
+        parameter_ids: IDs of the sampled (i.e. estimated) parameters.
+        scale_codes: Parameter scales, see
+            :py:func:`petab.parameters.get_scale_codes`.
+        lb_scaled, ub_scaled: Parameter bounds on parameter scale.
+    """
+
+    # prior type -> base distribution, transformation of the base samples
+    #  before scaling ('lin': scale, 'log': exponentiate and scale,
+    #  None: on parameter scale)
+    _prior_types = {
+        UNIFORM: (UNIFORM, LIN),
+        PARAMETER_SCALE_UNIFORM: (UNIFORM, None),
+        NORMAL: (NORMAL, LIN),
+        LOG_NORMAL: (NORMAL, LOG),
+        PARAMETER_SCALE_NORMAL: (NORMAL, None),
+        LAPLACE: (LAPLACE, LIN),
+        LOG_LAPLACE: (LAPLACE, LOG),
+        PARAMETER_SCALE_LAPLACE: (LAPLACE, None),
+    }
+
+    def __init__(self, parameter_df: pd.DataFrame,
+                 mode: str = INITIALIZATION):
+        """Constructor.
+
+        Arguments:
+            parameter_df: PEtab parameter table
+            mode: 'initialization' or 'objective' prior
+        """
+        self.parameter_ids = list(
+            parameter_df.index[parameter_df[ESTIMATE] == 1])
+        prior_list = parameters.get_priors_from_df(parameter_df, mode=mode)
+
+        for prior_type, *_ in prior_list:
+            if prior_type not in self._prior_types:
+                raise NotImplementedError(
+                    f"Parameter priors of type {prior_type} are not "
+                    "implemented.")
+
+        self.scale_codes = parameters.get_scale_codes(
+            [scaling for _, _, scaling, _ in prior_list])
+        bounds = np.array([bounds for *_, bounds in prior_list],
+                          dtype=float).reshape(-1, 2)
+        self.lb_scaled = parameters.scale_array(bounds[:, 0], self.scale_codes)
+        self.ub_scaled = parameters.scale_array(bounds[:, 1], self.scale_codes)
+        # first and second prior parameter of each parameter
+        self._prior_parameters = np.array(
+            [prior_pars[:2] for _, prior_pars, _, _ in prior_list],
+            dtype=float).reshape(-1, 2)
+
+        # (base distribution, transformation, columns), grouped by prior type
+        prior_types = pd.Series(
+            [prior_type for prior_type, *_ in prior_list], dtype=object)
+        self._groups = [
+            (*self._prior_types[prior_type], columns)
+            for prior_type, columns in prior_types.groupby(
+                prior_types).indices.items()]
+
+    @property
+    def n_parameters(self) -> int:
+        """Number of sampled parameters."""
+        return len(self.parameter_ids)
+
+    def sample(self, n_samples: int,
+               rng: Union[None, int, np.random.Generator] = None
+               ) -> np.ndarray:
+        """Draw samples.
+
+        Arguments:
+            n_samples: Number of samples
+            rng: Random number generator, or seed for
+                :py:func:`numpy.random.default_rng`
+
+        Returns:
+            Array of samples with dimensions n_samples x n_parameters
+        """
+        rng = np.random.default_rng(rng)
+        samples = np.empty((n_samples, self.n_parameters))
+        for distribution, _, columns in self._groups:
+            samples[:, columns] = self._draw(
+                rng, distribution, self._prior_parameters[columns, 0],
+                self._prior_parameters[columns, 1],
+                (n_samples, len(columns)))
+        return self._transform(samples)
+
+    def sample_streams(self, n_samples: int, seed: int,
+                       chunk: int = 0) -> np.ndarray:
+        """Draw samples from independent streams per parameter.
+
+        Each parameter is drawn from its own generator, seeded from `seed`,
+        the parameter index and `chunk`. Different chunks can be generated
+        in parallel, e.g. in worker processes, and are reproducible
+        independently of the order in which they are drawn.
+
+        Arguments:
+            n_samples: Number of samples
+            seed: Seed, shared across chunks
+            chunk: Index of the chunk of samples
+
+        Returns:
+            Array of samples with dimensions n_samples x n_parameters
+        """
+        samples = np.empty((n_samples, self.n_parameters))
+        for distribution, _, columns in self._groups:
+            for column in columns:
+                rng = np.random.default_rng(
+                    np.random.SeedSequence(seed, spawn_key=(column, chunk)))
+                samples[:, column] = self._draw(
+                    rng, distribution, self._prior_parameters[column, 0],
+                    self._prior_parameters[column, 1], (n_samples, ))
+        return self._transform(samples)
+
+    @staticmethod
+    def _draw(rng: np.random.Generator, distribution: str,
+              a: np.ndarray, b: np.ndarray, size: Tuple) -> np.ndarray:
+        """Draw from the base distribution with the given prior
+        parameters."""
+        if distribution == UNIFORM:
+            return (b - a) * rng.random(size) + a
+        if distribution == NORMAL:
+            return rng.normal(loc=a, scale=b, size=size)
+        return rng.laplace(loc=a, scale=b, size=size)
+
+    def _transform(self, samples: np.ndarray) -> np.ndarray:
+        """Bring base samples to parameter scale and clip to bounds."""
+        for _, transformation, columns in self._groups:
+            if transformation is None:
+                continue
+            values = samples[:, columns]
+            if transformation == LOG:
+                values = np.exp(values)
+            samples[:, columns] = parameters.scale_array(
+                values, self.scale_codes[columns])
+        return np.maximum(np.minimum(self.ub_scaled, samples), self.lb_scaled)
@@ -3,7 +3,7 @@ from warnings import warn
 import logging
 from pandas.io.common import get_handle, is_url, is_file_like
 import re
-from typing import Dict, Any, List, Union, Tuple
+from typing import Dict, Any, List, Optional, Set, Union, Tuple
 import libsbml
 
 logger = logging.getLogger(__name__)
@@ -386,6 +386,9 @@ def get_model_parameters(sbml_model: libsbml.Model, with_values=False
             returns a dictionary with those parameter IDs as keys and parameter
             values from the SBML model as values.
     """
+    if isinstance(sbml_model, ModelIndex):
+        return sbml_model.get_model_parameters(with_values=with_values)
+
     if not with_values:
         return [p.getId() for p in sbml_model.getListOfParameters()
                 if sbml_model.getAssignmentRuleByVariable(p.getId()) is None]
@@ -395,6 +398,120 @@ def get_model_parameters(sbml_model: libsbml.Model, with_values=False
             if sbml_model.getAssignmentRuleByVariable(p.getId()) is None}
 
 
+class ModelIndex:
+    """Picklable snapshot of the SBML model entities referenced by PEtab.
+
+    Can be used instead of a ``libsbml.Model`` where only IDs and parameter
+    values are required, e.g. to ship the model to worker processes.
+
+    Attributes:
+        parameters:
+            Model parameter IDs mapped to their values, in model order.
+            Includes assignment rule targets.
+        species:
+            IDs of the model species mapped to their initial concentration,
+            or initial amount if no concentration is set.
+        compartments:
+            IDs of the model compartments mapped to their size.
+        assignment_rule_targets:
+            IDs of the variables of assignment rules.
+        element_ids:
+            IDs of all model elements, including e.g. reactions and function
+            definitions.
+    """
+
+    def __init__(self,
+                 parameters: Dict[str, float],
+                 species: Dict[str, float],
+                 compartments: Dict[str, float],
+                 assignment_rule_targets: Set[str],
+                 element_ids: Optional[Set[str]] = None):
+        self.parameters = parameters
+        self.species = species
+        self.compartments = compartments
+        self.assignment_rule_targets = assignment_rule_targets
+        if element_ids is None:
+            element_ids = {*parameters, *species, *compartments}
+        self.element_ids = element_ids
+
+    @staticmethod
+    def from_sbml_model(sbml_model: libsbml.Model) -> 'ModelIndex':
+        """Create the snapshot of an SBML model.
+
+        Arguments:
+            sbml_model: SBML model
+
+        Returns:
+            The model index.
+        """
+        return ModelIndex(
+            parameters={p.getId(): p.getValue()
+                        for p in sbml_model.getListOfParameters()},
+            species={s.getId(): s.getInitialConcentration()
+                     if s.isSetInitialConcentration()
+                     else s.getInitialAmount()
+                     for s in sbml_model.getListOfSpecies()},
+            compartments={c.getId(): c.getSize()
+                          for c in sbml_model.getListOfCompartments()},
+            assignment_rule_targets={
+                r.getVariable() for r in sbml_model.getListOfRules()
+                if r.isAssignment()},
+            element_ids={e.getId() for e in sbml_model.getListOfAllElements()
+                         if e.isSetId()},
+        )
+
+    def get_model_parameters(self, with_values=False
+                             ) -> Union[List[str], Dict[str, float]]:
+        """Return model parameters which are not AssignmentRule targets.
+
+        See :py:func:`get_model_parameters`.
+        """
+        if not with_values:
+            return [par_id for par_id in self.parameters
+                    if par_id not in self.assignment_rule_targets]
+
+        return {par_id: value for par_id, value in self.parameters.items()
+                if par_id not in self.assignment_rule_targets}
+
+    def is_species_or_compartment(self, element_id: str) -> bool:
+        """Check whether the ID refers to a species or compartment.
+
+        Arguments:
+            element_id: The element ID.
+
+        Returns:
+            ``True`` if `element_id` is a species or compartment ID.
+        """
+        return element_id in self.species or element_id in self.compartments
+
+    def has_element(self, element_id: str) -> bool:
+        """Check whether the ID refers to any model element.
+
+        Arguments:
+            element_id: The element ID.
+
+        Returns:
+            ``True`` if the model contains an element with ID `element_id`.
+        """
+        return element_id in self.element_ids
+
+
+def get_model_index(sbml_model: Union[libsbml.Model, ModelIndex]
+                    ) -> ModelIndex:
+    """Get the model index of an SBML model.
+
+    Arguments:
+        sbml_model: SBML model, or its model index.
+
+    Returns:
+        `sbml_model` if it already is a model index, otherwise a new index
+        of the model.
+    """
+    if isinstance(sbml_model, ModelIndex):
+        return sbml_model
+    return ModelIndex.from_sbml_model(sbml_model)
+
+
 def write_sbml(sbml_doc: libsbml.SBMLDocument, filename: str) -> None:
     """Write PEtab visualization table
 
@@ -409,6 +526,19 @@ def write_sbml(sbml_doc: libsbml.SBMLDocument, filename: str) -> None:
                            f"create SBML file {filename}.")
 
 
+def is_sbml_file(file_name: Optional[str]) -> bool:
+    """Check whether a file name refers to an SBML model.
+
+    Arguments:
+        file_name: File name or URL
+
+    Returns:
+        ``True`` if the file has an ``.xml`` or ``.sbml`` extension.
+    """
+    return isinstance(file_name, str) \
+        and file_name.lower().endswith(('.xml', '.sbml'))
+
+
 def get_sbml_model(
         filepath_or_buffer
 ) -> Tuple[libsbml.SBMLReader, libsbml.SBMLDocument, libsbml.Model]:
@@ -65,7 +65,7 @@ class Simulator(abc.ABC):
         self.working_dir = working_dir
         self.working_dir.mkdir(parents=True, exist_ok=True)
 
-        self.noise_formulas = petab_MS.calculate.get_symbolic_noise_formulas(
+        self.noise_formulas = petab_MS.calculate.get_compiled_noise_formulas(
             self.petab_problem.observable_df)
         self.rng = np.random.default_rng()
 
@@ -133,7 +133,7 @@ class Simulator(abc.ABC):
     def add_noise(
             self,
             simulation_df: pd.DataFrame,
-            noise_scaling_factor: float = 1,
+            noise_scaling_factor: Union[float, np.ndarray] = 1,
             **kwargs
     ) -> pd.DataFrame:
         """Add noise to simulated data.
@@ -142,26 +142,25 @@ class Simulator(abc.ABC):
             simulation_df:
                 A PEtab measurements table that contains simulated data.
             noise_scaling_factor:
-                A multiplier of the scale of the noise distribution.
+                A multiplier of the scale of the noise distribution, or an
+                array of multipliers, one per row of `simulation_df`.
             **kwargs:
-                Additional keyword arguments are passed to `sample_noise`.
+                Additional keyword arguments are passed to
+                `sample_noise_for_table`.
 
         Returns:
             Simulated data with noise, as a PEtab measurements table.
         """
         simulation_df_with_noise = simulation_df.copy()
-        simulation_df_with_noise[petab_MS.C.MEASUREMENT] = [
-            sample_noise(
+        simulation_df_with_noise[petab_MS.C.MEASUREMENT] = \
+            sample_noise_for_table(
                 self.petab_problem,
-                row,
-                row[petab_MS.C.MEASUREMENT],
+                simulation_df,
                 self.noise_formulas,
                 self.rng,
                 noise_scaling_factor,
                 **kwargs,
             )
-            for _, row in simulation_df_with_noise.iterrows()
-        ]
         return simulation_df_with_noise
 
 
@@ -169,7 +168,9 @@ def sample_noise(
         petab_problem: petab_MS.Problem,
         measurement_row: pd.Series,
         simulated_value: float,
-        noise_formulas: Optional[Dict[str, sp.Expr]] = None,
+        noise_formulas: Optional[Dict[
+            str, Union[sp.Expr, petab_MS.calculate.CompiledNoiseFormula]]
+        ] = None,
         rng: Optional[np.random.Generator] = None,
         noise_scaling_factor: float = 1,
         zero_bounded: bool = False,
@@ -187,8 +188,8 @@ def sample_noise(
             A simulated value without noise.
         noise_formulas:
             Processed noise formulas from the PEtab observables table, in the
-            form output by the `petab.calculate.get_symbolic_noise_formulas`
-            method.
+            form output by the `petab.calculate.get_compiled_noise_formulas`
+            or `petab.calculate.get_symbolic_noise_formulas` method.
         rng:
             A NumPy random generator.
         noise_scaling_factor:
@@ -202,17 +203,21 @@ def sample_noise(
         The sample from the PEtab noise distribution.
     """
     if noise_formulas is None:
-        noise_formulas = petab_MS.calculate.get_symbolic_noise_formulas(
+        noise_formulas = petab_MS.calculate.get_compiled_noise_formulas(
             petab_problem.observable_df)
     if rng is None:
         rng = np.random.default_rng()
 
-    noise_value = petab_MS.calculate.evaluate_noise_formula(
-        measurement_row,
-        noise_formulas,
+    observable_id = measurement_row[petab_MS.C.OBSERVABLE_ID]
+    noise_formula = noise_formulas[observable_id]
+    if not isinstance(noise_formula, petab_MS.calculate.CompiledNoiseFormula):
+        noise_formula = petab_MS.calculate.CompiledNoiseFormula(
+            observable_id, noise_formula)
+    noise_value = noise_formula.evaluate(
+        [measurement_row.get(petab_MS.C.NOISE_PARAMETERS, None)],
         petab_problem.parameter_df,
-        simulated_value
-    )
+        [simulated_value]
+    )[0]
 
     # default noise distribution is petab.C.NORMAL
     noise_distribution = (
@@ -238,3 +243,91 @@ def sample_noise(
     ):
         return 0.0
     return simulated_value_with_noise
+
+
+def sample_noise_for_table(
+        petab_problem: petab_MS.Problem,
+        simulation_df: pd.DataFrame,
+        noise_formulas: Optional[Dict[
+            str, Union[sp.Expr, petab_MS.calculate.CompiledNoiseFormula]]
+        ] = None,
+        rng: Optional[np.random.Generator] = None,
+        noise_scaling_factor: Union[float, np.ndarray] = 1,
+        zero_bounded: bool = False,
+) -> np.ndarray:
+    """Generate samples from PEtab noise distributions for a whole table.
+
+    Vectorized version of `sample_noise`: noise formulas are evaluated once
+    per observable, and samples are drawn once per noise distribution.
+
+    Arguments:
+        petab_problem:
+            The PEtab problem used to generate the simulated values.
+        simulation_df:
+            A PEtab measurements table that contains simulated data.
+        noise_formulas:
+            See `sample_noise`.
+        rng:
+            A NumPy random generator.
+        noise_scaling_factor:
+            A multiplier of the scale of the noise distribution, or an array
+            of multipliers, one per row of `simulation_df`.
+        zero_bounded:
+            See `sample_noise`.
+
+    Returns:
+        The samples from the PEtab noise distributions, one per row of
+        `simulation_df`.
+    """
+    if noise_formulas is None:
+        noise_formulas = petab_MS.calculate.get_compiled_noise_formulas(
+            petab_problem.observable_df)
+    if rng is None:
+        rng = np.random.default_rng()
+
+    simulated_values = simulation_df[petab_MS.C.MEASUREMENT].to_numpy(
+        dtype=float)
+    observable_ids = simulation_df[petab_MS.C.OBSERVABLE_ID]
+    if petab_MS.C.NOISE_PARAMETERS in simulation_df:
+        noise_parameters = simulation_df[
+            petab_MS.C.NOISE_PARAMETERS].to_numpy(dtype=object)
+    else:
+        noise_parameters = np.full(len(simulation_df), None, dtype=object)
+
+    noise_values = np.empty(len(simulation_df))
+    for observable_id, rows in observable_ids.groupby(
+            observable_ids.values, sort=False).indices.items():
+        noise_formula = noise_formulas[observable_id]
+        if not isinstance(noise_formula,
+                          petab_MS.calculate.CompiledNoiseFormula):
+            noise_formula = petab_MS.calculate.CompiledNoiseFormula(
+                observable_id, noise_formula)
+        noise_values[rows] = noise_formula.evaluate(
+            noise_parameters[rows], petab_problem.parameter_df,
+            simulated_values[rows])
+    noise_values *= noise_scaling_factor
+
+    # default noise distribution is petab.C.NORMAL, also for empty entries
+    observable_df = petab_problem.observable_df
+    if petab_MS.C.NOISE_DISTRIBUTION in observable_df:
+        noise_distributions = observable_ids.map(
+            observable_df[petab_MS.C.NOISE_DISTRIBUTION]).fillna(
+            petab_MS.C.NORMAL)
+    else:
+        noise_distributions = pd.Series(petab_MS.C.NORMAL,
+                                        index=observable_ids.index)
+
+    simulated_values_with_noise = np.empty(len(simulation_df))
+    for noise_distribution, rows in noise_distributions.groupby(
+            noise_distributions.values, sort=False).indices.items():
+        # below is e.g.: `rng.normal(loc=simulations, scale=noise_values)`
+        simulated_values_with_noise[rows] = getattr(rng, noise_distribution)(
+            loc=simulated_values[rows],
+            scale=noise_values[rows],
+        )
+
+    if zero_bounded:
+        simulated_values_with_noise[
+            np.sign(simulated_values)
+            != np.sign(simulated_values_with_noise)] = 0.0
+    return simulated_values_with_noise
@@ -0,0 +1,100 @@
+"""Benchmark of parallel parameter mapping backends.
+
+Maps a synthetic problem with many simulation conditions sequentially, with
+threads and with processes. Usage::
+
+    python -m tests.benchmark_parameter_mapping [n_conditions] [n_workers]
+"""
+
+import os
+import sys
+import time
+
+import libsbml
+import pandas as pd
+
+import petab_MS
+from petab_MS.C import *
+
+
+def create_problem(n_conditions: int,
+                   n_observables: int = 5,
+                   n_timepoints: int = 5,
+                   n_model_parameters: int = 100,
+                   n_condition_parameters: int = 10):
+    """Create a synthetic problem with condition-specific overrides.
+
+    Returns:
+        The SBML document and the condition, measurement and parameter table.
+    """
+    document = libsbml.SBMLDocument(3, 1)
+    sbml_model = document.createModel()
+    for i in range(n_model_parameters):
+        petab_MS.add_global_parameter(sbml_model, f'p{i}').setValue(1.0)
+    for i in range(n_condition_parameters):
+        petab_MS.add_global_parameter(sbml_model, f'k{i}')
+    for j in range(n_observables):
+        petab_MS.add_global_parameter(
+            sbml_model, f'observableParameter1_obs{j}')
+        petab_MS.add_global_parameter(sbml_model, f'noiseParameter1_obs{j}')
+
+    condition_ids = [f'c{i}' for i in range(n_conditions)]
+    condition_df = pd.DataFrame(
+        {f'k{i}': range(n_conditions) for i in range(n_condition_parameters)},
+        index=pd.Index(condition_ids, name=CONDITION_ID))
+
+    rows = [
+        {OBSERVABLE_ID: f'obs{j}',
+         SIMULATION_CONDITION_ID: condition_id,
+         PREEQUILIBRATION_CONDITION_ID: condition_ids[0],
+         TIME: float(t),
+         MEASUREMENT: 0.0,
+         OBSERVABLE_PARAMETERS: f'scaling_{condition_id}',
+         NOISE_PARAMETERS: 'sigma'}
+        for condition_id in condition_ids
+        for j in range(n_observables)
+        for t in range(n_timepoints)
+    ]
+    measurement_df = pd.DataFrame(rows)
+
+    parameter_ids = [f'p{i}' for i in range(n_model_parameters)] \
+        + [f'scaling_{condition_id}' for condition_id in condition_ids] \
+        + ['sigma']
+    parameter_df = pd.DataFrame({
+        PARAMETER_ID: parameter_ids,
+        PARAMETER_SCALE: LOG10,
+        NOMINAL_VALUE: 1.0,
+        ESTIMATE: 1,
+    }).set_index(PARAMETER_ID)
+
+    return document, condition_df, measurement_df, parameter_df
+
+
+def main():
+    n_conditions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_workers = sys.argv[2] if len(sys.argv) > 2 else str(os.cpu_count())
+    # keep the document alive, the model does not own it
+    sbml_document, condition_df, measurement_df, parameter_df = \
+        create_problem(n_conditions)
+    sbml_model = sbml_document.getModel()
+
+    results = {}
+    for backend, num_threads in [
+            (PARALLEL_BACKEND_THREAD, '1'),
+            (PARALLEL_BACKEND_THREAD, n_workers),
+            (PARALLEL_BACKEND_PROCESS, n_workers)]:
+        os.environ[petab_MS.ENV_NUM_THREADS] = num_threads
+        os.environ[petab_MS.ENV_PARALLEL_BACKEND] = backend
+        start = time.perf_counter()
+        mapping = petab_MS.get_optimization_to_simulation_parameter_mapping(
+            condition_df=condition_df, measurement_df=measurement_df,
+            parameter_df=parameter_df, sbml_model=sbml_model)
+        elapsed = time.perf_counter() - start
+        results.setdefault('mapping', mapping)
+        assert mapping == results['mapping']
+        print(f"{n_conditions} conditions, {backend} backend, "
+              f"{num_threads} workers: {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
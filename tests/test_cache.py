@@ -0,0 +1,103 @@
+"""Tests for petab_MS/cache.py"""
+import os
+from math import nan
+
+import numpy as np
+import pandas as pd
+
+import petab_MS
+from petab_MS.C import *
+
+
+def test_read_table(tmp_path, monkeypatch):
+    """Test petab_MS.cache.read_table."""
+    cache_dir = str(tmp_path / 'cache')
+    file_name = str(tmp_path / 'conditions.tsv')
+    condition_df = pd.DataFrame(data={
+        CONDITION_ID: ['c1', 'c2'],
+        CONDITION_NAME: ['', 'condition 2'],
+        'k1': [0.1, 1 / 3],
+        'k2': [1, 2],
+    })
+    condition_df.to_csv(file_name, sep='\t', index=False)
+    expected = petab_MS.read_table(file_name)
+
+    # disabled
+    monkeypatch.delenv(petab_MS.ENV_CACHE_DIR, raising=False)
+    assert petab_MS.get_cache_dir() is None
+    petab_MS.read_table(file_name)
+    assert not os.path.exists(cache_dir)
+
+    # stored on first read, loaded on second read
+    with petab_MS.table_cache(cache_dir):
+        assert petab_MS.get_cache_dir() == cache_dir
+        pd.testing.assert_frame_equal(petab_MS.read_table(file_name),
+                                      expected)
+        assert len(os.listdir(cache_dir)) == 1
+        cached = petab_MS.read_table(file_name)
+    assert petab_MS.get_cache_dir() is None
+    pd.testing.assert_frame_equal(cached, expected)
+
+    # numeric columns stay memory-mapped, object columns are not pickled
+    assert isinstance(cached['k1'].values.base, np.memmap)
+    entry_dir = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    assert sorted(os.listdir(entry_dir)) \
+        == ['0.json', '1.json', '2.npy', '3.npy', 'columns.json']
+
+    # cached data can be modified without affecting the cache
+    cached.loc[0, 'k1'] = 5
+    pd.testing.assert_frame_equal(
+        petab_MS.read_table(file_name, cache_dir=cache_dir), expected)
+
+    # selected columns and changed files are cached separately
+    monkeypatch.setenv(petab_MS.ENV_CACHE_DIR, cache_dir)
+    assert petab_MS.get_cache_dir() == cache_dir
+    pd.testing.assert_frame_equal(
+        petab_MS.read_table(file_name, usecols=['k1']), expected[['k1']])
+    condition_df['k1'] = [2.0, 3.0]
+    condition_df.to_csv(file_name, sep='\t', index=False)
+    assert petab_MS.read_table(file_name)['k1'].tolist() == [2.0, 3.0]
+    assert len(os.listdir(cache_dir)) == 3
+
+    # used by the table readers
+    pd.testing.assert_frame_equal(
+        petab_MS.get_condition_df(file_name),
+        condition_df.set_index(CONDITION_ID).replace('', np.nan))
+
+
+def test_read_empty_table(tmp_path):
+    """Test petab_MS.cache.read_table with a table without rows."""
+    cache_dir = str(tmp_path / 'cache')
+    file_name = str(tmp_path / 'conditions.tsv')
+    pd.DataFrame(columns=[CONDITION_ID, 'k1']).to_csv(
+        file_name, sep='\t', index=False)
+    expected = petab_MS.read_table(file_name)
+    for _ in range(2):
+        pd.testing.assert_frame_equal(
+            petab_MS.read_table(file_name, cache_dir=cache_dir), expected)
+    assert not os.path.exists(cache_dir)
+
+
+def test_get_table_hash():
+    """Test petab_MS.cache.get_table_hash."""
+    df = pd.DataFrame(data={CONDITION_ID: ['c1', 'c2'], 'k1': [1.0, 2.0]})
+    assert petab_MS.get_table_hash(df) == petab_MS.get_table_hash(df.copy())
+    assert petab_MS.get_table_hash(df) \
+        != petab_MS.get_table_hash(df.assign(k1=[1.0, 3.0]))
+    assert petab_MS.get_table_hash(df) \
+        != petab_MS.get_table_hash(df.rename(columns={'k1': 'k2'}))
+
+    # measurement dicts of tables, series and arrays
+    measurement_dict = {
+        'c1__obs1': pd.Series([0.1, 0.2]),
+        'obs2': np.arange(6.).reshape(2, 3),
+        'obs3': np.array(['a', nan], dtype=object),
+        'table': df,
+    }
+    expected = petab_MS.get_table_hash(measurement_dict)
+    assert petab_MS.get_table_hash(dict(measurement_dict)) == expected
+    for key, value in [('c1__obs1', pd.Series([0.1, 0.3])),
+                       ('obs2', np.arange(6.).reshape(3, 2)),
+                       ('obs3', np.array(['a', 'b'], dtype=object))]:
+        assert petab_MS.get_table_hash(
+            {**measurement_dict, key: value}) != expected
@@ -3,6 +3,7 @@
 from petab import (calculate_residuals, calculate_chi2, calculate_llh,
                    calculate_single_llh)
 from petab.C import *
+import petab_MS
 import pandas as pd
 import numpy as np
 import pytest
@@ -279,3 +280,179 @@ def test_calculate_single_llh():
                                noise_distribution=LAPLACE, scale=LOG10)
     expected_llh = - abs((log10(s)-log10(m))/sigma) - log(2*sigma*m*log(10))
     assert llh == pytest.approx(expected_llh)
+
+
+def test_residuals_simulation_matching(models):  # pylint: disable=W0621
+    """Test matching of measurements and simulations in
+    petab_MS.calculate_residuals_for_table."""
+    for i_model, model in enumerate(models):
+        print(f"Model {i_model}")
+        (measurement_df, observable_df, parameter_df, simulation_df,
+         expected_residuals, _, _) = model
+        # order of the simulation table must not matter
+        simulation_df = simulation_df.iloc[::-1]
+        residual_df = petab_MS.calculate_residuals_for_table(
+            measurement_df, simulation_df, observable_df, parameter_df)
+        assert sorted(residual_df[RESIDUAL]) == pytest.approx(
+            sorted(expected_residuals))
+
+    (measurement_df, observable_df, parameter_df, simulation_df,
+     _, _, _) = model_simple()
+    # empty fields in the measurement table match any simulation
+    measurement_df[PREEQUILIBRATION_CONDITION_ID] = ''
+    simulation_df[PREEQUILIBRATION_CONDITION_ID] = 'preeq'
+    residual_df = petab_MS.calculate_residuals_for_table(
+        measurement_df, simulation_df, observable_df, parameter_df,
+        normalize=False)
+    assert list(residual_df[RESIDUAL]) == [2, 1, -1, -2]
+
+    # missing simulations are reported
+    with pytest.raises(ValueError):
+        petab_MS.calculate_residuals_for_table(
+            measurement_df, simulation_df.iloc[1:], observable_df,
+            parameter_df)
+
+
+def test_simulation_matcher():
+    """Test petab_MS.SimulationMatcher."""
+    measurement_df = pd.DataFrame(data={
+        OBSERVABLE_ID: ['obs_a', 'obs_a', 'obs_b', 'obs_b', 'obs_c'],
+        SIMULATION_CONDITION_ID: ['c0', 'c1', 'c0', '', 'c0'],
+        TIME: [0, 10, 0, 10, 0],
+        MEASUREMENT: [0, 1, 20, 22, 3]
+    }, index=['m0', 'm1', 'm2', 'm3', 'm4'])
+    simulation_df = pd.DataFrame(data={
+        OBSERVABLE_ID: ['obs_b', 'obs_b', 'obs_a', 'obs_a', 'obs_b', 'obs_a'],
+        SIMULATION_CONDITION_ID: ['c1', 'c0', 'c1', 'c0', 'c1', 'c1'],
+        TIME: [10.0, 0.0, 10.0, 0.0, 10.0, 10.0],
+        SIMULATION: [1, 2, 3, 4, 5, 3]
+    })
+    matcher = petab_MS.SimulationMatcher(simulation_df)
+    assert matcher.compared_cols == [OBSERVABLE_ID, SIMULATION_CONDITION_ID,
+                                     TIME]
+
+    # unmatched measurements are reported together
+    with pytest.raises(ValueError, match="m4"):
+        matcher.match(measurement_df)
+    simulation_indices = matcher.match(measurement_df, raise_unmatched=False)
+    assert list(simulation_indices) == [3, 2, 1, 0, -1]
+    assert list(matcher.get_unmatched(
+        measurement_df, simulation_indices)) == ['m4']
+
+    # repeated simulations with equal values are fine, the empty simulation
+    #  condition ID of m3 matches simulations with different values
+    assert list(matcher.get_ambiguous(measurement_df)) == ['m3']
+
+
+def test_evaluate_noise_formulas(models):  # pylint: disable=W0621
+    """Test petab_MS.evaluate_noise_formulas against per-row evaluation."""
+    for i_model, model in enumerate(models):
+        print(f"Model {i_model}")
+        (measurement_df, observable_df, parameter_df, simulation_df,
+         _, _, _) = model
+        simulations = simulation_df[SIMULATION].values
+        noise_formulas = petab_MS.get_compiled_noise_formulas(observable_df)
+        noise_values = petab_MS.evaluate_noise_formulas(
+            measurement_df, noise_formulas, parameter_df, simulations)
+
+        symbolic_noise_formulas = petab_MS.get_symbolic_noise_formulas(
+            observable_df)
+        expected = [
+            petab_MS.evaluate_noise_formula(
+                row, symbolic_noise_formulas, parameter_df, simulation)
+            for (_, row), simulation in zip(measurement_df.iterrows(),
+                                            simulations)]
+        assert noise_values == pytest.approx(expected)
+
+        # leading axes, e.g. particles, are broadcast
+        noise_values = petab_MS.evaluate_noise_formulas(
+            measurement_df, noise_formulas, parameter_df,
+            np.array([simulations, simulations]))
+        assert noise_values.shape == (2, len(measurement_df))
+        assert noise_values[1] == pytest.approx(expected)
+
+    # parameters that cannot be replaced are reported
+    observable_df[NOISE_FORMULA] = 'noiseParameter1_obs_a * unknown'
+    with pytest.raises(TypeError):
+        petab_MS.evaluate_noise_formulas(
+            measurement_df, petab_MS.get_compiled_noise_formulas(
+                observable_df), parameter_df, simulations)
+
+
+def test_calculate_llhs():
+    """Test petab_MS.calculate_llhs and petab_MS.calculate_llh_batch."""
+    measurements = np.array([5.3, 0.7, 2.1, 4.4, 1.2, 3.3])
+    simulations = np.array([4.5, 0.9, 2.0, 4.0, 1.5, 3.0])
+    noise_values = np.array([1.6, 0.3, 0.5, 1.1, 0.2, 0.8])
+    scales = [LIN, LOG, LOG10, LIN, LOG, LOG10]
+    noise_distributions = [NORMAL, NORMAL, NORMAL, LAPLACE, LAPLACE, LAPLACE]
+
+    llhs = petab_MS.calculate_llhs(measurements, simulations, scales,
+                                   noise_distributions, noise_values)
+    expected = [
+        petab_MS.calculate_single_llh(
+            measurement=m, simulation=s, scale=scale,
+            noise_distribution=noise_distribution, noise_value=sigma)
+        for m, s, scale, noise_distribution, sigma in zip(
+            measurements, simulations, scales, noise_distributions,
+            noise_values)]
+    assert llhs == pytest.approx(expected)
+
+    # one log likelihood per particle
+    batch = np.array([simulations, simulations * 1.1, simulations * 0.9])
+    llhs = petab_MS.calculate_llh_batch(measurements, batch, scales,
+                                        noise_distributions, noise_values)
+    assert llhs.shape == (3, )
+    assert llhs[0] == pytest.approx(sum(expected))
+    assert llhs[1] == pytest.approx(petab_MS.calculate_llhs(
+        measurements, batch[1], scales, noise_distributions,
+        noise_values).sum())
+
+    with pytest.raises(NotImplementedError):
+        petab_MS.calculate_llhs(measurements, simulations, scales,
+                                ['unknown'] * len(measurements),
+                                noise_values)
+
+
+def test_problem_evaluator(models):  # pylint: disable=W0621
+    """Test petab_MS.ProblemEvaluator against the table-based functions."""
+    for i_model, model in enumerate(models):
+        print(f"Model {i_model}")
+        (measurement_df, observable_df, parameter_df, simulation_df,
+         _, _, _) = model
+        petab_problem = petab_MS.Problem(
+            measurement_df=measurement_df, observable_df=observable_df,
+            parameter_df=parameter_df)
+        # template in reversed order to exercise the matching
+        template = simulation_df.iloc[::-1].reset_index(drop=True)
+        evaluator = petab_MS.ProblemEvaluator(petab_problem, template)
+        simulations = template[SIMULATION].values
+
+        for normalize in (True, False):
+            residual_df = petab_MS.calculate_residuals_for_table(
+                measurement_df, simulation_df, observable_df, parameter_df,
+                normalize=normalize)
+            assert evaluator.residuals(simulations, normalize=normalize) \
+                == pytest.approx(residual_df[RESIDUAL].values)
+        assert evaluator.chi2(simulations) == pytest.approx(
+            petab_MS.calculate_chi2(measurement_df, simulation_df,
+                                    observable_df, parameter_df))
+        llh = petab_MS.calculate_llh(measurement_df, simulation_df,
+                                     observable_df, parameter_df)
+        assert evaluator.llh(simulations) == pytest.approx(llh)
+
+        # one value per particle
+        batch = np.array([simulations, simulations * 1.1])
+        llhs = evaluator.llh(batch)
+        assert llhs.shape == (2, )
+        assert llhs[0] == pytest.approx(llh)
+        assert evaluator.llh(simulations * 1.1) == pytest.approx(llhs[1])
+        assert evaluator.chi2(batch).shape == (2, )
+
+        # returned noise values cannot corrupt later evaluations
+        noise_values = evaluator.get_noise_values(
+            evaluator.get_simulations(simulations))
+        if not noise_values.flags.writeable:
+            with pytest.raises(ValueError):
+                noise_values[:] = 0
+        assert evaluator.llh(simulations) == pytest.approx(llh)
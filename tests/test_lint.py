@@ -4,10 +4,12 @@ from math import nan
 from unittest.mock import patch
 
 import libsbml
+import numpy as np
 import pandas as pd
 import pytest
 
 import petab
+import petab_MS
 from petab import (lint, sbml)  # noqa: E402
 from petab.C import *
 
@@ -81,6 +83,19 @@ def test_measurement_table_has_timepoint_specific_mappings():
     assert lint.measurement_table_has_timepoint_specific_mappings(
         measurement_df, allow_scalar_numeric_noise_parameters=True) is False
 
+    # missing preequilibration conditions are a group of their own
+    measurement_df = pd.DataFrame(data={
+        OBSERVABLE_ID: ['obs1', 'obs1', 'obs1'],
+        SIMULATION_CONDITION_ID: ['condition1', 'condition1', 'condition1'],
+        PREEQUILIBRATION_CONDITION_ID: ['preeq', nan, nan],
+        TIME: [1.0, 2.0, 3.0],
+        OBSERVABLE_PARAMETERS: ['obsParOverride', 'obsParOverride', nan],
+    })
+    assert petab_MS.measurement_table_has_timepoint_specific_mappings(
+        measurement_df) is True
+    assert petab_MS.measurement_table_has_timepoint_specific_mappings(
+        measurement_df.iloc[:2]) is False
+
 
 def test_observable_table_has_nontrivial_noise_formula():
     # Ensure we fail if we have nontrivial noise formulas
@@ -494,3 +509,235 @@ def test_check_observable_df():
     bad_observable_df.index = ['obs1', 'obs1']
     with pytest.raises(AssertionError):
         lint.check_observable_df(bad_observable_df)
+
+
+def test_lint_measurement_df():
+    """Check that petab_MS.lint_measurement_df reports all problems."""
+    observable_df = pd.DataFrame(data={
+        OBSERVABLE_ID: ['obs1', 'obs2'],
+        OBSERVABLE_FORMULA: ['observableParameter1_obs1 * x', 'y'],
+        NOISE_FORMULA: ['noiseParameter1_obs1', '1'],
+        OBSERVABLE_TRANSFORMATION: [LIN, LOG],
+    }).set_index(OBSERVABLE_ID)
+    measurement_df = pd.DataFrame(data={
+        OBSERVABLE_ID: ['obs1', 'obs1', 'obs2', 'obs2', 'obs3'],
+        SIMULATION_CONDITION_ID: ['c1', 'c1 ', 'c1', 'c1', 'c1'],
+        TIME: [0, 1, 2, 3, 4],
+        MEASUREMENT: [-1.0, 1.0, -1.0, 0.0, 1.0],
+        OBSERVABLE_PARAMETERS: ['scale', 'scale;offset', nan, nan, nan],
+        NOISE_PARAMETERS: ['sigma', 1.0, nan, 'sigma', nan],
+    })
+
+    report = petab_MS.lint_measurement_df(measurement_df, observable_df)
+    assert [(issue.check, issue.rows) for issue in report] == [
+        ('whitespace', (1, )),
+        ('observables_defined', (4, )),
+        ('log_positivity', (2, 3)),
+        ('observable_parameter_count', (1, )),
+        ('noise_parameter_count', (3, )),
+    ]
+    assert len(report.to_df()) == 5
+
+    # the first problem is raised by check_measurement_df
+    with pytest.raises(AssertionError, match="Whitespace"):
+        petab_MS.check_measurement_df(measurement_df, observable_df)
+
+    valid_df = measurement_df.iloc[[0]]
+    assert not petab_MS.lint_measurement_df(valid_df, observable_df)
+    petab_MS.check_measurement_df(valid_df, observable_df)
+
+    report = petab_MS.lint_measurement_df(
+        measurement_df.drop(columns=TIME), observable_df)
+    assert [issue.check for issue in report] == ['required_columns']
+
+
+def test_run_lint_checks():
+    """Check that petab_MS.run_lint_checks gives the same, ordered report
+    sequentially and in parallel, and respects dependencies."""
+    document = libsbml.SBMLDocument(3, 1)
+    model = document.createModel()
+    model.setTimeUnits("second")
+    model.setExtentUnits("mole")
+    model.setSubstanceUnits('mole')
+    petab_MS.add_global_parameter(model, 'k1').setValue(1.0)
+    observable_df = pd.DataFrame(data={
+        OBSERVABLE_ID: ['obs1', 'k1'],
+        OBSERVABLE_FORMULA: ['k1', 'k1'],
+        NOISE_FORMULA: ['1', '1'],
+    }).set_index(OBSERVABLE_ID)
+    condition_df = pd.DataFrame(data={CONDITION_ID: ['c1']}) \
+        .set_index(CONDITION_ID)
+    measurement_df = pd.DataFrame(data={
+        OBSERVABLE_ID: ['obs1', 'obs1'],
+        SIMULATION_CONDITION_ID: ['c1', 'c2'],
+        TIME: [0.0, 1.0],
+        MEASUREMENT: [1.0, 2.0],
+    })
+    parameter_df = pd.DataFrame(data={
+        PARAMETER_ID: ['k1'],
+        PARAMETER_SCALE: [LIN],
+        LOWER_BOUND: [0.0],
+        UPPER_BOUND: [-1.0],
+        NOMINAL_VALUE: [1.0],
+        ESTIMATE: [1],
+    }).set_index(PARAMETER_ID)
+    problem = petab_MS.Problem(
+        sbml_model=model, sbml_document=document,
+        condition_df=condition_df, measurement_df=measurement_df,
+        observable_df=observable_df, parameter_df=parameter_df)
+
+    # parameter checks are skipped, because the measurement table is invalid
+    report = petab_MS.run_lint_checks(problem, num_threads=1)
+    assert [(issue.table, issue.check) for issue in report] == [
+        ('measurement', 'conditions_present'),
+        ('observable', 'observable_shadowing'),
+    ]
+    assert petab_MS.run_lint_checks(problem, num_threads=3).issues \
+        == report.issues
+    assert petab_MS.lint_problem(problem) is True
+
+    problem.measurement_df = measurement_df.iloc[[0]]
+    problem.observable_df = observable_df.loc[['obs1']]
+    report = petab_MS.run_lint_checks(problem, num_threads=3)
+    assert [(issue.table, issue.check) for issue in report] == [
+        ('parameter', 'parameter_df'),
+    ]
+
+    # the SBML model is checked in place, unless run in a separate process
+    reaction = model.createReaction()
+    reaction.setId('r1')
+    reaction.setReversible(False)
+    reaction.setFast(False)
+    problem.invalidate_model_index()
+    with patch('petab_MS.lint._lint_sbml_string') as lint_sbml_string:
+        report = petab_MS.run_lint_checks(problem, num_threads=1)
+    lint_sbml_string.assert_not_called()
+    assert [(issue.table, issue.check) for issue in report] == [
+        ('sbml', 'sbml_consistency'),
+        ('parameter', 'parameter_df'),
+    ]
+    assert petab_MS.run_lint_checks(problem, num_threads=3).issues \
+        == report.issues
+
+    # custom checks run after their dependencies
+    finished = []
+
+    def check(name):
+        def function(problem_):
+            finished.append(name)
+            return petab_MS.LintReport()
+        return function
+
+    checks = [petab_MS.LintCheck('a', check('a')),
+              petab_MS.LintCheck('b', check('b'), dependencies=('a', )),
+              petab_MS.LintCheck('c', check('c'), dependencies=('b', ))]
+    assert not petab_MS.run_lint_checks(problem, checks, num_threads=3)
+    assert finished == ['a', 'b', 'c']
+
+    with pytest.raises(ValueError, match="Unknown dependencies"):
+        petab_MS.run_lint_checks(
+            problem, [petab_MS.LintCheck('a', check('a'), ('x', ))])
+
+
+def test_run_lint_checks_cached(tmp_path):
+    """Check that petab_MS.run_lint_checks only reruns check groups whose
+    inputs changed."""
+    cache_dir = str(tmp_path)
+    condition_df = pd.DataFrame(data={CONDITION_ID: ['c1']}) \
+        .set_index(CONDITION_ID)
+    parameter_df = pd.DataFrame(data={
+        PARAMETER_ID: ['k1'],
+        PARAMETER_SCALE: [LIN],
+        LOWER_BOUND: [0.0],
+        UPPER_BOUND: [1.0],
+        NOMINAL_VALUE: [1.0],
+        ESTIMATE: [1],
+    }).set_index(PARAMETER_ID)
+    problem = petab_MS.Problem(condition_df=condition_df,
+                               parameter_df=parameter_df)
+    runs = []
+
+    def check(name, table):
+        def function(problem_):
+            runs.append(name)
+            report = petab_MS.LintReport()
+            df = getattr(problem_, f'{table}_df')
+            if df.isna().any(axis=None):
+                report.add(table, name, f"NaN in {table} table", (0, ))
+            return report
+        return function
+
+    checks = [
+        petab_MS.LintCheck('condition', check('condition', 'condition'),
+                           inputs=('condition', )),
+        petab_MS.LintCheck('parameter', check('parameter', 'parameter'),
+                           inputs=('parameter', )),
+        petab_MS.LintCheck('cross', check('cross', 'parameter'),
+                           dependencies=('condition', ),
+                           inputs=('parameter', )),
+    ]
+
+    report = petab_MS.run_lint_checks(problem, checks, cache_dir=cache_dir)
+    assert not report
+    assert runs == ['condition', 'parameter', 'cross']
+
+    # nothing changed
+    runs.clear()
+    assert not petab_MS.run_lint_checks(problem, checks, cache_dir=cache_dir)
+    assert runs == []
+
+    # changed inputs, cached issues
+    problem.parameter_df = parameter_df.assign(**{UPPER_BOUND: nan})
+    for _ in range(2):
+        runs.clear()
+        report = petab_MS.run_lint_checks(problem, checks,
+                                          cache_dir=cache_dir)
+        assert [(issue.check, issue.rows) for issue in report] \
+            == [('parameter', (0, )), ('cross', (0, ))]
+    assert runs == []
+
+    # changed dependency
+    runs.clear()
+    problem.condition_df = condition_df.assign(k1=nan)
+    report = petab_MS.run_lint_checks(problem, checks, cache_dir=cache_dir,
+                                      num_threads=2)
+    assert [issue.check for issue in report] == ['condition', 'parameter']
+    assert runs == ['condition']
+
+    # without cache
+    runs.clear()
+    petab_MS.run_lint_checks(problem, checks)
+    assert runs == ['condition', 'parameter']
+
+    # measurements given as dict
+    problem = petab_MS.Problem(
+        measurement_df={'obs1': np.array([0.1, 0.2]),
+                        'c1__obs2': pd.Series([1.0, 2.0])},
+        parameter_df=parameter_df)
+    for _ in range(2):
+        assert petab_MS.lint_problem(problem, cache_dir=cache_dir) is False
+
+
+def test_get_invalid_identifier_positions():
+    """Check that petab_MS.get_invalid_identifier_positions agrees with
+    petab_MS.is_valid_identifier."""
+    ids = ['a', '_b1', '1a', 'a b', nan, '', 'a-b', 'A_1', 'ä']
+    expected = [i for i, _id in enumerate(ids)
+                if not petab_MS.is_valid_identifier(_id)]
+    assert expected == [2, 3, 4, 5, 6, 8]
+    assert list(petab_MS.get_invalid_identifier_positions(ids)) == expected
+    assert list(petab_MS.get_invalid_identifier_positions(
+        pd.Index(ids))) == expected
+
+    # non-string values are invalid
+    assert list(petab_MS.get_invalid_identifier_positions(
+        ['a', 1, 2.0])) == [1, 2]
+    assert list(petab_MS.get_invalid_identifier_positions([1, 2])) == [0, 1]
+    assert len(petab_MS.get_invalid_identifier_positions([])) == 0
+
+    with pytest.raises(ValueError) as e:
+        petab_MS.check_ids(ids, kind='condition')
+    assert str(e.value) == ("Invalid condition ID(s):\nLine 4: 1a\n"
+                            "Line 5: a b\nLine 6: Missing ID\nLine 7: \n"
+                            "Line 8: a-b\nLine 10: ä")
+    petab_MS.check_ids(pd.Index(['a', 'b']))
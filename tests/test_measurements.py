@@ -1,9 +1,13 @@
 """Tests related to petab.measurements"""
+import os
+
 import numpy as np
 import pandas as pd
+import pytest
 import tempfile
 
 import petab
+import petab_MS
 from petab.C import *
 
 
@@ -114,3 +118,120 @@ def test_get_simulation_conditions():
                    ignore_index=True)
     actual = petab.get_simulation_conditions(measurement_df)
     assert actual.equals(expected)
+
+
+def test_get_condition_row_index():
+    """Test measurements.get_condition_row_index."""
+    measurement_df = pd.DataFrame(data={
+        SIMULATION_CONDITION_ID: ['c1', 'c2', 'c1', 'c1', 'c2'],
+        PREEQUILIBRATION_CONDITION_ID: ['', np.nan, 'c0', '', ''],
+        MEASUREMENT: [1, 2, 3, 4, 5],
+    }, index=[10, 11, 12, 13, 14])
+    condition_row_index = petab_MS.get_condition_row_index(measurement_df)
+    assert {key: list(rows) for key, rows in condition_row_index.items()} \
+        == {('c1', ''): [0, 3], ('c1', 'c0'): [2], ('c2', ''): [1, 4]}
+
+    # row selection must be the same as with a full scan
+    for condition in petab_MS.get_simulation_conditions(
+            measurement_df).to_dict('records'):
+        expected = petab_MS.get_rows_for_condition(measurement_df, condition)
+        actual = petab_MS.get_rows_for_condition(
+            measurement_df, condition, condition_row_index)
+        assert actual.equals(expected)
+
+    assert petab_MS.get_rows_for_condition(
+        measurement_df, {SIMULATION_CONDITION_ID: 'c3'},
+        condition_row_index).empty
+
+    # without preequilibration column
+    del measurement_df[PREEQUILIBRATION_CONDITION_ID]
+    assert list(petab_MS.get_condition_row_index(measurement_df)) \
+        == [('c1', ''), ('c2', '')]
+
+
+def test_lazy_measurement_df(tmp_path):
+    """Test lazy loading of measurements from external csv files."""
+    data = {
+        'c1': pd.DataFrame({'obs1': [0.1, 0.2, 0.3], 'obs2': [1., 2., 3.]}),
+        'c2': pd.DataFrame({'obs1': [0.4, 0.5], 'obs2': [4., 5.]}),
+    }
+    for condition, df in data.items():
+        df.to_csv(tmp_path / f'{condition}.csv', sep='\t', index=False)
+    measurement_df = pd.DataFrame(data={
+        OBSERVABLE_ID: ['obs1', 'obs2'],
+        SIMULATION_CONDITION_ID: ['c1', 'c2'],
+        MEASUREMENT: ['c1.csv', 'c2.csv'],
+    })
+    measurement_file = str(tmp_path / 'measurements.tsv')
+    measurement_df.to_csv(measurement_file, sep='\t', index=False)
+
+    eager = petab_MS.get_measurement_df(measurement_file)
+    assert set(eager) == {'c1__obs1__obs1', 'c1__obs1__obs2',
+                          'c2__obs2__obs1', 'c2__obs2__obs2'}
+
+    lazy = petab_MS.get_measurement_df(measurement_file, lazy=True)
+    assert isinstance(lazy, petab_MS.LazyMeasurementDict)
+    assert set(lazy) == set(eager)
+    assert not lazy._data
+    pd.testing.assert_series_equal(lazy['c2__obs2__obs1'],
+                                   eager['c2__obs2__obs1'])
+    # only the accessed file was read
+    assert set(lazy._data) == {'c2__obs2__obs1', 'c2__obs2__obs2'}
+    lazy.unload()
+    assert not lazy._data
+
+    # concurrent reading of all files, in order
+    lazy = petab_MS.get_measurement_df(
+        measurement_file, lazy=True, num_threads=2)
+    lazy.load()
+    assert list(lazy._data) == list(eager)
+    assert set(lazy.read_times) == {'c1__obs1__', 'c2__obs2__'}
+
+    # chunked reading, selected columns
+    lazy = petab_MS.get_measurement_df(
+        measurement_file, lazy=True, columns=['obs2'], chunksize=2)
+    assert set(lazy) == {'c1__obs1__obs2', 'c2__obs2__obs2'}
+    for key in lazy:
+        pd.testing.assert_series_equal(lazy[key], eager[key])
+
+
+def test_shared_measurement_dict(tmp_path):
+    """Test measurements.SharedMeasurementDict."""
+    import pickle
+
+    measurement_dict = {
+        'obs1': np.array([0.1, 0.2, 0.3]),
+        'obs2': pd.Series([1, 2], dtype=int),
+        'image': np.arange(12.).reshape(3, 4),
+        'empty': np.array([]),
+    }
+    problem = petab_MS.Problem(measurement_df=measurement_dict)
+    shared = problem.share_measurements(directory=str(tmp_path))
+    assert problem.get_measurement_dict() is shared
+    assert os.path.dirname(shared.file_name) == str(tmp_path)
+
+    # only the file name and layout are pickled
+    pickled = pickle.dumps(shared)
+    assert len(pickled) < 1000
+    unpickled = pickle.loads(pickled)
+    assert list(unpickled) == list(measurement_dict)
+    for key, value in measurement_dict.items():
+        np.testing.assert_array_equal(unpickled[key], value)
+        assert not unpickled[key].flags.writeable
+    assert unpickled['obs2'].dtype == int
+
+    shared.unlink()
+    assert not os.path.exists(shared.file_name)
+
+    with pytest.raises(ValueError):
+        petab_MS.SharedMeasurementDict.from_dict(
+            {'obs1': np.array(['a'], dtype=object)}, directory=str(tmp_path))
+
+    # only empty arrays, i.e. an empty file
+    shared = petab_MS.SharedMeasurementDict.from_dict(
+        {'obs1': np.array([]), 'obs2': np.zeros((0, 2))},
+        directory=str(tmp_path))
+    unpickled = pickle.loads(pickle.dumps(shared))
+    assert unpickled['obs1'].shape == (0, )
+    assert unpickled['obs2'].shape == (0, 2)
+    shared.unlink()
@@ -1,7 +1,9 @@
 import numpy as np
 import os
 import pandas as pd
+import pytest
 import petab
+import petab_MS
 from petab.sbml import add_global_parameter
 from petab.parameter_mapping import _apply_parameter_table
 from petab.C import *
@@ -266,6 +268,56 @@ class TestGetSimulationToOptimizationParameterMapping(object):
             sbml_model=sbml_model, parameter_df=parameter_df)
         assert actual == expected
 
+    @staticmethod
+    def test_process_backend(condition_df_2_conditions, minimal_sbml_model,
+                             monkeypatch):
+        """Mapping in worker processes must yield the sequential result"""
+        condition_df = condition_df_2_conditions
+        _, sbml_model = minimal_sbml_model
+        add_global_parameter(sbml_model, 'dynamicParameter1').setValue(1.0)
+        add_global_parameter(sbml_model, 'observableParameter1_obs1')
+        # species in the condition table must not show up in the mapping
+        sbml_model.createSpecies().setId('someSpecies')
+        condition_df['someSpecies'] = [0.0, 0.0]
+
+        measurement_df = pd.DataFrame(data={
+            OBSERVABLE_ID: ['obs1', 'obs1', 'obs1', 'obs1'],
+            SIMULATION_CONDITION_ID: ['condition1', 'condition1',
+                                      'condition2', 'condition2'],
+            PREEQUILIBRATION_CONDITION_ID: ['', '', 'condition1',
+                                            'condition1'],
+            OBSERVABLE_PARAMETERS: ['obs1par1override', 'obs1par1override',
+                                    '2.0', '2.0'],
+            TIME: [0.0, 1.0, 0.0, 1.0],
+        })
+        parameter_df = pd.DataFrame(data={
+            PARAMETER_ID: ['dynamicParameter1', 'obs1par1override'],
+            ESTIMATE: [0, 1],
+            NOMINAL_VALUE: [3.0, 1.0],
+            PARAMETER_SCALE: [LOG10, LOG],
+        }).set_index(PARAMETER_ID)
+
+        def get_mapping():
+            return petab_MS.get_optimization_to_simulation_parameter_mapping(
+                measurement_df=measurement_df, condition_df=condition_df,
+                sbml_model=sbml_model, parameter_df=parameter_df)
+
+        monkeypatch.setenv(petab_MS.ENV_NUM_THREADS, "1")
+        expected = get_mapping()
+        assert 'someSpecies' not in expected[0][1]
+        assert expected[1][0] == {'dynamicParameter1': 3.0,
+                                  'fixedParameter1': 1.0,
+                                  'observableParameter1_obs1': 2.0}
+
+        monkeypatch.setenv(petab_MS.ENV_NUM_THREADS, "2")
+        monkeypatch.setenv(petab_MS.ENV_PARALLEL_BACKEND,
+                           petab_MS.C.PARALLEL_BACKEND_PROCESS)
+        assert get_mapping() == expected
+
+        monkeypatch.setenv(petab_MS.ENV_PARALLEL_BACKEND, 'unknown')
+        with pytest.raises(ValueError):
+            get_mapping()
+
     @staticmethod
     def test_partial_override(condition_df_2_conditions,
                               minimal_sbml_model):
@@ -524,3 +576,95 @@ def test_fill_in_nominal_values():
 
     assert expected_par == par_mapping
     assert expected_scale == scale_mapping
+
+
+def test_parameter_mapping_arrays(condition_df_2_conditions,
+                                  minimal_sbml_model):
+    """Test the array representation of the parameter mapping."""
+    condition_df = condition_df_2_conditions
+    _, sbml_model = minimal_sbml_model
+    add_global_parameter(sbml_model, 'dynamicParameter1').setValue(1.0)
+    add_global_parameter(sbml_model, 'observableParameter1_obs1')
+
+    measurement_df = pd.DataFrame(data={
+        OBSERVABLE_ID: ['obs1', 'obs1'],
+        SIMULATION_CONDITION_ID: ['condition1', 'condition2'],
+        PREEQUILIBRATION_CONDITION_ID: ['', 'condition1'],
+        OBSERVABLE_PARAMETERS: ['obs1par1override', '2.0'],
+    })
+    parameter_df = pd.DataFrame(data={
+        PARAMETER_ID: ['dynamicParameter1', 'obs1par1override'],
+        ESTIMATE: [1, 1],
+        NOMINAL_VALUE: [3.0, 1.0],
+        PARAMETER_SCALE: [LOG10, LOG],
+    }).set_index(PARAMETER_ID)
+
+    kwargs = dict(measurement_df=measurement_df, condition_df=condition_df,
+                  sbml_model=sbml_model, parameter_df=parameter_df)
+    mapping = petab_MS.get_optimization_to_simulation_parameter_mapping(
+        **kwargs)
+    arrays = petab_MS.get_optimization_to_simulation_parameter_mapping(
+        **kwargs, as_arrays=True)
+    assert arrays.optimization_parameter_ids == list(parameter_df.index)
+    assert list(arrays.has_preequilibration) == [False, True]
+
+    x = np.array([0.5, 0.25])
+    preeq, sim = arrays.apply(x)
+    scale_codes = {LIN: 0, LOG: 1, LOG10: 2}
+    for i_condition, (par_map_preeq, par_map_sim, scale_map_preeq,
+                      scale_map_sim) in enumerate(mapping):
+        for values, scales, par_map, scale_map in [
+                (preeq, arrays.preeq_scales, par_map_preeq, scale_map_preeq),
+                (sim, arrays.sim_scales, par_map_sim, scale_map_sim)]:
+            for par_id, value in par_map.items():
+                ix = arrays.model_parameter_ids.index(par_id)
+                expected = x[list(parameter_df.index).index(value)] \
+                    if isinstance(value, str) else value
+                np.testing.assert_equal(values[i_condition, ix], expected)
+                assert scales[i_condition, ix] == scale_codes[
+                    scale_map[par_id]]
+
+    # one set of vectors per optimization parameter vector
+    preeq, sim = arrays.apply(np.array([x, 2 * x, 3 * x]))
+    assert sim.shape == (3, 2, len(arrays.model_parameter_ids))
+    np.testing.assert_equal(sim[2], arrays.apply(3 * x)[1])
+
+    # mapping to parameters that are not in the optimization vector
+    with pytest.raises(ValueError):
+        petab_MS.ParameterMappingArrays.from_mapping(mapping, ['foo'])
+
+
+def test_mapping_checks_per_condition(condition_df_2_conditions,
+                                      minimal_sbml_model, monkeypatch):
+    """Check that the measurement table is checked once per mapping, not
+    again for each condition."""
+    _, sbml_model = minimal_sbml_model
+    measurement_df = pd.DataFrame(data={
+        OBSERVABLE_ID: ['obs1', 'obs1', 'obs1'],
+        SIMULATION_CONDITION_ID: ['condition1', 'condition2', 'condition2'],
+        PREEQUILIBRATION_CONDITION_ID: ['', 'condition1', 'condition1'],
+        OBSERVABLE_PARAMETERS: ['p1', 'p2', 'p2'],
+    })
+    checked = []
+    check = petab_MS.lint.measurement_table_has_timepoint_specific_mappings
+    monkeypatch.setattr(
+        petab_MS.lint, 'measurement_table_has_timepoint_specific_mappings',
+        lambda df, *args, **kwargs: checked.append(len(df))
+        or check(df, *args, **kwargs))
+
+    kwargs = dict(measurement_df=measurement_df,
+                  condition_df=condition_df_2_conditions,
+                  sbml_model=sbml_model)
+    petab_MS.get_optimization_to_simulation_parameter_mapping(**kwargs)
+    assert checked == [3]
+
+    # subsets of the table are still checked when used directly
+    petab_MS.get_parameter_mapping_for_condition(
+        'condition2', False, measurement_df.iloc[1:], sbml_model,
+        condition_df_2_conditions)
+    assert checked == [3, 2]
+
+    # tables modified in place are checked again
+    measurement_df.loc[2, OBSERVABLE_PARAMETERS] = 'p3'
+    with pytest.raises(ValueError, match="Timepoint-specific"):
+        petab_MS.get_optimization_to_simulation_parameter_mapping(**kwargs)
@@ -5,6 +5,7 @@ import numpy as np
 import pandas as pd
 
 import petab
+import petab_MS
 from petab.C import *
 
 
@@ -197,3 +198,29 @@ def test_scale_unscale():
         list(np.log([par, 2*par]))
     assert list(petab.map_unscale([par, 2*par], LOG)) == \
         list(np.exp([par, 2*par]))
+
+
+def test_scale_array():
+    """Test parameters.scale_array and parameters.unscale_array"""
+    x = np.array([[1.0, 10.0, 100.0, 5.0],
+                  [2.0, 20.0, 200.0, 0.5]])
+    scales = [LIN, LOG, LOG10, LOG]
+    expected = np.array([list(petab_MS.map_scale(row, scales))
+                         for row in x])
+
+    scale_codes = petab_MS.get_scale_codes(scales)
+    for scale_spec in (scales, scale_codes):
+        scaled = petab_MS.scale_array(x, scale_spec)
+        np.testing.assert_allclose(scaled, expected)
+        np.testing.assert_allclose(
+            petab_MS.unscale_array(scaled, scale_spec), x)
+    # single vector, broadcast scale
+    np.testing.assert_allclose(petab_MS.scale_array(x[0], LOG10),
+                               np.log10(x[0]))
+    np.testing.assert_allclose(petab_MS.unscale_array(x[0], LOG10),
+                               10**x[0])
+    # input is not modified
+    assert x[0, 1] == 10.0
+
+    with pytest.raises(ValueError):
+        petab_MS.scale_array(x, ['foo'] * 4)
@@ -2,11 +2,13 @@ import pickle
 import tempfile
 from math import nan
 import copy
+from unittest.mock import patch
 
 import libsbml
 import numpy as np
 import pandas as pd
 import petab
+import petab_MS
 import pytest
 from petab.C import *
 
@@ -160,6 +162,95 @@ def test_serialization(petab_problem):
         == len(petab_problem.sbml_model.getListOfParameters())
 
 
+def test_slim_serialization(minimal_sbml_model):
+    """Test that unpickling a petab_MS.Problem does not parse the model."""
+    document, model = minimal_sbml_model
+    petab_MS.add_global_parameter(model, 'p1').setValue(2.0)
+    petab_MS.add_model_output(model, 'obs1', '2 * p1')
+    problem = petab_MS.Problem(sbml_model=model, sbml_document=document)
+    assert problem.model_index.get_model_parameters(with_values=True) \
+        == {'p1': 2.0}
+
+    problem_recreated = pickle.loads(pickle.dumps(problem))
+    assert problem_recreated._sbml_model is None
+    assert problem_recreated._sbml_string is not None
+    assert problem_recreated.model_index.parameters \
+        == problem.model_index.parameters
+    assert problem_recreated.model_index.assignment_rule_targets \
+        == {'observable_obs1'}
+    assert problem_recreated._sbml_model is None
+
+    # rebuilt on demand
+    assert problem_recreated.get_model_parameters() == ['p1']
+    assert problem_recreated._sbml_model is None
+    assert petab_MS.get_model_parameters(problem_recreated.sbml_model) \
+        == ['p1']
+    assert problem_recreated._sbml_string is None
+    assert problem_recreated.sbml_document.getModel() is not None
+
+    # pickling again without accessing the model
+    problem_recreated = pickle.loads(pickle.dumps(
+        pickle.loads(pickle.dumps(problem))))
+    assert problem_recreated.sbml_model.getParameter('p1').getValue() == 2.0
+
+    # index is renewed with the model
+    problem.sbml_model = None
+    assert problem.model_index is None
+
+
+def test_model_index(minimal_sbml_model, tmp_path):
+    """Test lazy SBML loading and the model index of petab_MS.Problem."""
+    document, model = minimal_sbml_model
+    petab_MS.add_global_parameter(model, 'p1').setValue(2.0)
+    compartment = model.createCompartment()
+    compartment.setId('c1')
+    compartment.setSize(3.0)
+    species = model.createSpecies()
+    species.setId('s1')
+    species.setInitialConcentration(4.0)
+    reaction = model.createReaction()
+    reaction.setId('r1')
+    model_file = str(tmp_path / 'model.xml')
+    petab_MS.write_sbml(document, model_file)
+
+    problem = petab_MS.Problem(model_file=model_file)
+    assert problem._sbml_model is None
+    model_index = problem.model_index
+    assert problem._sbml_model is not None
+    assert model_index.parameters == {'p1': 2.0}
+    assert model_index.species == {'s1': 4.0}
+    assert model_index.compartments == {'c1': 3.0}
+    assert model_index.element_ids == {'p1', 'c1', 's1', 'r1'}
+    assert problem.model_index is model_index
+    assert problem.get_model_parameters() == ['p1']
+
+    # assigning a model replaces a pending model file without parsing it
+    lazy_problem = petab_MS.Problem(model_file=model_file)
+    with patch('petab_MS.sbml.get_sbml_model') as get_sbml_model:
+        lazy_problem.sbml_model = problem.sbml_model
+        assert lazy_problem.sbml_model is problem.sbml_model
+    get_sbml_model.assert_not_called()
+
+    # helpers give the same results for models and model indices
+    observable_df = pd.DataFrame(data={
+        OBSERVABLE_ID: ['obs1'],
+        OBSERVABLE_FORMULA: ['p1 * s1 * r1 + scaling'],
+        NOISE_FORMULA: ['noiseParameter1_obs1'],
+    }).set_index(OBSERVABLE_ID)
+    for sbml_model in [problem.sbml_model, model_index]:
+        assert petab_MS.get_output_parameters(observable_df, sbml_model) \
+            == ['scaling', 'noiseParameter1_obs1']
+
+    condition_df = pd.DataFrame(data={
+        CONDITION_ID: ['condition1'],
+        'p1': [1.0], 's1': [2.0], 'c1': [3.0],
+    }).set_index(CONDITION_ID)
+    petab_MS.check_condition_df(condition_df, model_index)
+    condition_df['r1'] = 1.0
+    with pytest.raises(AssertionError):
+        petab_MS.check_condition_df(condition_df, model_index)
+
+
 def test_get_observable_id():
     assert petab.get_observable_id('observable_obs1') == 'obs1'
     assert petab.get_observable_id('sigma_obs1') == 'obs1'
@@ -213,6 +304,43 @@ def test_startpoint_sampling(fujita_model_scaling):
         assert -3 <= sp[1] <= 3
 
 
+def test_prior_sampler(fujita_model_scaling):
+    """Test petab_MS.PriorSampler."""
+    parameter_df = fujita_model_scaling.parameter_df.copy()
+    parameter_df[INITIALIZATION_PRIOR_TYPE] = ''
+    parameter_df.iloc[1:4, parameter_df.columns.get_loc(
+        INITIALIZATION_PRIOR_TYPE)] = [NORMAL, LOG_LAPLACE, UNIFORM]
+    parameter_df[INITIALIZATION_PRIOR_PARAMETERS] = ''
+    parameter_df.iloc[1:4, parameter_df.columns.get_loc(
+        INITIALIZATION_PRIOR_PARAMETERS)] = ['1;0.1', '0;1', '1;2']
+    sampler = petab_MS.PriorSampler(parameter_df)
+    assert sampler.n_parameters == 19
+
+    samples = sampler.sample(1000, rng=0)
+    assert samples.shape == (1000, 19)
+    assert (samples >= sampler.lb_scaled).all()
+    assert (samples <= sampler.ub_scaled).all()
+    np.testing.assert_equal(samples, sampler.sample(1000, rng=0))
+    np.testing.assert_equal(samples, petab_MS.sample_parameter_startpoints(
+        parameter_df, n_starts=1000, seed=0))
+    # normal prior on linear scale, sampled on parameter scale
+    assert np.median(petab_MS.unscale_array(
+        samples[:, 1], sampler.scale_codes[1])) == pytest.approx(1, rel=0.1)
+
+    # chunks from per-parameter streams are reproducible and distinct
+    chunks = [sampler.sample_streams(10, seed=1, chunk=chunk)
+              for chunk in range(2)]
+    np.testing.assert_equal(chunks[1],
+                            sampler.sample_streams(10, seed=1, chunk=1))
+    assert not np.isin(chunks[0], chunks[1]).any()
+    assert (chunks[0] >= sampler.lb_scaled).all()
+
+    parameter_df.iloc[1, parameter_df.columns.get_loc(
+        INITIALIZATION_PRIOR_TYPE)] = 'foo'
+    with pytest.raises(NotImplementedError):
+        petab_MS.PriorSampler(parameter_df)
+
+
 def test_create_parameter_df(
         minimal_sbml_model,  # pylint: disable=W0621
         condition_df_2_conditions):  # pylint: disable=W0621
@@ -488,6 +616,32 @@ def test_concat_measurements():
                                 petab.measurements.get_measurement_df))
 
 
+def test_concat_tables_petab_ms():
+    """Test petab_MS.concat_tables with generators and dicts."""
+    tables = (pd.DataFrame({MEASUREMENT: [float(i)]}) for i in range(3))
+    assert petab_MS.concat_tables(tables).equals(
+        pd.DataFrame({MEASUREMENT: [0.0, 1.0, 2.0]}))
+    assert petab_MS.concat_tables([]).empty
+
+    # dicts are merged, preserving key order
+    dicts = [{'c1__obs1': 1, 'c1__obs2': 2}, {'c2__obs1': 3}]
+    merged = petab_MS.concat_tables(iter(dicts))
+    assert merged == {'c1__obs1': 1, 'c1__obs2': 2, 'c2__obs1': 3}
+    assert list(merged) == ['c1__obs1', 'c1__obs2', 'c2__obs1']
+
+    # other mappings are chained
+    from types import MappingProxyType
+    merged = petab_MS.concat_tables(
+        [MappingProxyType(dicts[0]), dicts[1]])
+    assert list(merged) == ['c1__obs1', 'c1__obs2', 'c2__obs1']
+    assert merged['c2__obs1'] == 3
+
+    with pytest.raises(ValueError):
+        petab_MS.concat_tables([dicts[0], dicts[0]])
+    with pytest.raises(ValueError):
+        petab_MS.concat_tables([dicts[0], pd.DataFrame({MEASUREMENT: [1]})])
+
+
 def test_get_obervable_ids(petab_problem):  # pylint: disable=W0621
     """Test if observable ids functions returns correct value."""
     assert set(petab_problem.get_observable_ids()) == {'observable_1'}
@@ -523,6 +677,45 @@ def test_parameter_properties(petab_problem):  # pylint: disable=W0621
     assert petab_problem.x_nominal_fixed_scaled == [np.log10(9)]
 
 
+def test_parameter_view():
+    """Test the cached parameter vector view of petab_MS.Problem."""
+    parameter_df = pd.DataFrame(data={
+        PARAMETER_ID: ['par1', 'par2', 'par3'],
+        LOWER_BOUND: [0, 0.1, 0.1],
+        UPPER_BOUND: [100, 100, 200],
+        PARAMETER_SCALE: ['lin', 'log', 'log10'],
+        NOMINAL_VALUE: [7, 8, 9],
+        ESTIMATE: [1, 1, 0],
+    }).set_index(PARAMETER_ID)
+    petab_problem = petab_MS.Problem(parameter_df=parameter_df)
+
+    view = petab_problem.parameter_view
+    assert view is petab_problem.parameter_view
+    assert list(view.ids) == ['par1', 'par2', 'par3']
+    assert list(view.free_indices) == [0, 1]
+    assert list(view.fixed_indices) == [2]
+    assert list(view.scale_codes) == [0, 1, 2]
+    np.testing.assert_allclose(view.get_values(LOWER_BOUND, scaled=True),
+                               [0, np.log(0.1), np.log10(0.1)])
+    np.testing.assert_allclose(
+        view.apply_mask(view.get_values(NOMINAL_VALUE), fixed=False), [7, 8])
+    with pytest.raises(ValueError):
+        view.get_values(NOMINAL_VALUE)[0] = 1
+    assert petab_problem.x_free_ids == ['par1', 'par2']
+    assert petab_problem.x_nominal_fixed_scaled == [np.log10(9)]
+
+    # in-place modification requires explicit invalidation
+    parameter_df.loc['par3', ESTIMATE] = 1
+    assert petab_problem.x_free_indices == [0, 1]
+    petab_problem.invalidate_parameter_view()
+    assert petab_problem.x_free_indices == [0, 1, 2]
+
+    # reassignment invalidates
+    petab_problem.parameter_df = parameter_df.iloc[:1]
+    assert petab_problem.x_ids == ['par1']
+    assert petab_problem.ub_scaled == [100]
+
+
 def test_to_float_if_float():
     to_float_if_float = petab.core.to_float_if_float
 
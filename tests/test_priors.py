@@ -0,0 +1,58 @@
+"""Tests for petab_MS/priors.py"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import petab_MS
+from petab_MS.C import *
+
+
+@pytest.mark.parametrize("prior_type, prior_parameters", [
+    (UNIFORM, '0.1;7'), (PARAMETER_SCALE_UNIFORM, '-3;7'),
+    (NORMAL, '2;1'), (LOG_NORMAL, '0.5;0.7'),
+    (PARAMETER_SCALE_NORMAL, '0.2;0.5'), (LAPLACE, '2;1'),
+    (LOG_LAPLACE, '0.5;0.7'), (PARAMETER_SCALE_LAPLACE, '0.2;0.5')])
+@pytest.mark.parametrize("scale", [LIN, LOG, LOG10])
+def test_prior_density(prior_type, prior_parameters, scale):
+    """Test petab_MS.PriorDensity for all prior types and scales."""
+    parameter_df = pd.DataFrame(data={
+        PARAMETER_ID: ['fixed', 'p1', 'p2'],
+        PARAMETER_SCALE: [LIN, scale, LIN],
+        LOWER_BOUND: [0, 0.3, 0],
+        UPPER_BOUND: [1, 6, 10],
+        NOMINAL_VALUE: [1, 1, 1],
+        ESTIMATE: [0, 1, 0],
+        OBJECTIVE_PRIOR_TYPE: ['', prior_type, NORMAL],
+        OBJECTIVE_PRIOR_PARAMETERS: ['', prior_parameters, '5;2'],
+    }).set_index(PARAMETER_ID)
+    prior = petab_MS.PriorDensity(parameter_df)
+    assert prior.parameter_ids == ['p1']
+
+    # truncated to the bounds, normalized on parameter scale
+    xs = np.linspace(prior.lb_scaled[0], prior.ub_scaled[0], 20001)
+    logpdfs = prior.logpdf(xs[:, np.newaxis])
+    assert logpdfs.shape == (len(xs), )
+    assert np.trapz(np.exp(logpdfs), xs) == pytest.approx(1, rel=1e-3)
+
+    # gradient
+    samples = xs[1000:-1000:3000, np.newaxis]
+    h = 1e-6
+    np.testing.assert_allclose(
+        prior.gradient(samples),
+        (prior.logpdf(samples + h) - prior.logpdf(samples - h))[:, np.newaxis]
+        / (2 * h), atol=1e-4)
+
+    # outside the bounds
+    assert prior.logpdf([prior.ub_scaled[0] + 1]) == -np.inf
+    assert np.isnan(prior.gradient([prior.ub_scaled[0] + 1])[0])
+
+    # joint density of independent parameters
+    parameter_df.loc['p2', ESTIMATE] = 1
+    joint_prior = petab_MS.PriorDensity(parameter_df)
+    parameter_df.loc['p1', ESTIMATE] = 0
+    p2_prior = petab_MS.PriorDensity(parameter_df)
+    samples = np.stack([xs[::1000], np.linspace(0, 10, len(xs[::1000]))],
+                       axis=1)
+    np.testing.assert_allclose(
+        joint_prior.logpdf(samples),
+        prior.logpdf(samples[:, :1]) + p2_prior.logpdf(samples[:, 1:]))
@@ -8,6 +8,7 @@ import scipy.stats
 from typing import Callable
 
 import petab
+import petab_MS
 from petab.C import MEASUREMENT
 
 
@@ -225,3 +226,44 @@ def _test_add_noise(petab_problem) -> None:
 
     simulator.remove_working_dir()
     assert not pathlib.Path(simulator.working_dir).is_dir()
+
+
+def test_sample_noise_for_table():
+    """Test `petab_MS.simulate.sample_noise_for_table`."""
+    n = 20000
+    observable_df = pd.DataFrame(data={
+        petab.C.OBSERVABLE_ID: ['obs_a', 'obs_b'],
+        petab.C.OBSERVABLE_FORMULA: ['a', 'b'],
+        petab.C.NOISE_FORMULA: ['noiseParameter1_obs_a', '0.1 * obs_b'],
+        petab.C.NOISE_DISTRIBUTION: [petab.C.NORMAL, petab.C.LAPLACE],
+    }).set_index(petab.C.OBSERVABLE_ID)
+    parameter_df = pd.DataFrame(data={
+        petab.C.PARAMETER_ID: ['sigma_a'],
+        petab.C.NOMINAL_VALUE: [2.0],
+    }).set_index(petab.C.PARAMETER_ID)
+    simulation_df = pd.DataFrame(data={
+        petab.C.OBSERVABLE_ID: ['obs_a', 'obs_b'] * n,
+        MEASUREMENT: [1.0, 10.0] * n,
+        petab.C.NOISE_PARAMETERS: ['sigma_a', ''] * n,
+    })
+    problem = petab_MS.Problem(observable_df=observable_df,
+                               parameter_df=parameter_df)
+    rng = np.random.default_rng(seed=0)
+
+    samples = petab_MS.simulate.sample_noise_for_table(
+        problem, simulation_df, rng=rng, noise_scaling_factor=0.5)
+    samples_a, samples_b = samples[::2], samples[1::2]
+    assert np.mean(samples_a) == pytest.approx(1.0, abs=0.05)
+    assert np.std(samples_a) == pytest.approx(1.0, rel=0.05)
+    assert np.mean(samples_b) == pytest.approx(10.0, abs=0.05)
+    # laplace with scale 0.5 * 0.1 * 10
+    assert np.std(samples_b) == pytest.approx(np.sqrt(2) * 0.5, rel=0.05)
+
+    # per-row scaling factors, zero bounded
+    noise_scaling_factor = np.tile([10.0, 0.0], n)
+    samples = petab_MS.simulate.sample_noise_for_table(
+        problem, simulation_df, rng=rng,
+        noise_scaling_factor=noise_scaling_factor, zero_bounded=True)
+    assert (samples[1::2] == 10.0).all()
+    assert (samples[::2] >= 0).all()
+    assert (samples[::2] == 0).any()